@@ -117,6 +117,8 @@ from dxlclient.message import *
 
 from dxlclient.exceptions import *
 from dxlclient.callbacks import *
+from dxlclient.executor import *
+from dxlclient.future import *
 from dxlclient._callback_manager import *
 
 from dxlclient.client_config import *
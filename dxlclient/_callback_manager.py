@@ -14,24 +14,55 @@ import threading
 
 from dxlclient import _BaseObject
 from dxlclient.callbacks import MessageCallback, RequestCallback, ResponseCallback, EventCallback
-from dxlclient._dxl_utils import WildcardCallback, DxlUtils
+from dxlclient._lru_cache import LruCache
+from dxlclient._topic_trie import TopicTrie
 
-from ._compat import is_string
+from . import _compat
+from ._compat import is_string, iscoroutinefunction
+
+
+# The maximum number of channels for which dispatch tables are cached
+_DISPATCH_TABLE_CACHE_SIZE = 1000
 
 
 def _has_wildcard(channel_name):
     """
-    Return whether the channel has a wildcard
+    Return whether the channel has a wildcard (a trailing ``#`` or a ``+``
+    segment)
 
     :param channel_name: The channel name
     :return: Whether the channel has a wildcard
     """
     if not is_string(channel_name):
         raise ValueError("Channel name should be str class")
-    return channel_name and channel_name[-1] == '#'
+    return channel_name and (channel_name[-1] == '#' or '+' in channel_name)
+
+
+def _resolve_function(func):
+    """
+    Returns the function which fires a message to the specified plain
+    callable. Coroutine functions are run to completion on an event loop owned
+    by the thread which fires the message.
+
+    :param func: The function (or coroutine function) which accepts a message
+    :return: The function which accepts the message to fire
+    """
+    if iscoroutinefunction(func):
+        def fire_coroutine(message):
+            """Runs the coroutine for the message to completion"""
+            _compat.run_coroutine(func(message))
+        return fire_coroutine
+    return func
 
 
 class _CallbackManager(_BaseObject):
+    # The name of the callback method which receives messages (defined by
+    # derived classes)
+    handler_name = None
+    # The type of the callbacks which are registered as classes or
+    # MessageCallback instances (refined by derived classes)
+    callback_type = MessageCallback
+
     def __init__(self):
         super(_CallbackManager, self).__init__()
 
@@ -39,76 +70,196 @@ class _CallbackManager(_BaseObject):
         self.lock = threading.RLock()
         # Map containing registered listeners by channel name (empty indicates all channels)
         self.callbacks_by_channel = {}
+        # Map containing the names of the executors that callbacks were
+        # registered with, by channel name and then callback identity. Callbacks
+        # which use the default executor are not included.
+        self.executors_by_channel = {}
+        # Map containing the functions which fire messages to the callbacks
+        # (see resolve_callback()), by channel name and then callback identity
+        self.dispatchers_by_channel = {}
+        # How callbacks which are registered as classes are instantiated
+        self.class_callback_instances = MessageCallback.INSTANCE_PER_MESSAGE
+        # Index of the wildcard channels which have registered listeners
+        self.wildcard_trie = TopicTrie()
         # Is wildcarding enabled
         self.wildcarding_enabled = False
+        # Cache of the dispatch tables of recently used channels (see
+        # _get_dispatch_table())
+        self.dispatch_tables = LruCache(_DISPATCH_TABLE_CACHE_SIZE)
+        # The watchdog to notify of each callback being invoked (if any)
+        self.watchdog = None
 
-    def validate_callback(self, callback):  # pylint: disable=no-self-use
+    def validate_callback(self, callback):
         """
-        Validates if `callback` is a valid MessageCallback.
+        Validates if `callback` is a valid callback: a subclass or an instance
+        of :attr:`callback_type`, or a plain function (or coroutine function)
+        which accepts the message.
 
         :param callback: Callback to validate.
         """
         if callback is None:
             raise ValueError("Missing callback argument")
-        # Check if the provided eventCallback is a class
+        # Check if the provided callback is a class
         if inspect.isclass(callback):
-            if not issubclass(callback, MessageCallback):
+            if not issubclass(callback, self.callback_type):
                 raise ValueError("Type mismatch on callback argument")
-        # Not a class, but an instance
-        else:
-            if not issubclass(callback.__class__, MessageCallback):
+        # A MessageCallback instance
+        elif isinstance(callback, MessageCallback):
+            if not isinstance(callback, self.callback_type):
                 raise ValueError("Type mismatch on callback argument")
+        # Otherwise, a plain function
+        elif not callable(callback):
+            raise ValueError("Type mismatch on callback argument")
 
-    def _get_callbacks_by_channel_copy(self):
+    def resolve_callback(self, callback):
+        """
+        Returns the function which fires a message to the specified callback.
+        This is determined once, when the callback is registered, so that
+        firing a message is a direct function call.
+
+        Plain functions are invoked directly (coroutine functions are run to
+        completion on an event loop owned by the firing thread). Callbacks
+        which are registered as classes are instantiated according to
+        :attr:`class_callback_instances`:
+
+        - :attr:`dxlclient.callbacks.MessageCallback.INSTANCE_PER_MESSAGE`: a new
+          instance for each message
+        - :attr:`dxlclient.callbacks.MessageCallback.INSTANCE_SHARED`: a single
+          instance for all messages
+        - :attr:`dxlclient.callbacks.MessageCallback.INSTANCE_PER_THREAD`: an
+          instance for each thread which fires messages
+
+        :param callback: The callback
+        :return: The function which accepts the message to fire
+        """
+        handler_name = self.handler_name
+        if not inspect.isclass(callback):
+            if isinstance(callback, MessageCallback):
+                return getattr(callback, handler_name)
+            return _resolve_function(callback)
+
+        strategy = self.class_callback_instances
+        if strategy == MessageCallback.INSTANCE_PER_MESSAGE:
+            def fire_new_instance(message):
+                """Fires the message to a new instance of the callback class"""
+                getattr(callback(), handler_name)(message)
+            return fire_new_instance
+        if strategy == MessageCallback.INSTANCE_SHARED:
+            return getattr(callback(), handler_name)
+        if strategy == MessageCallback.INSTANCE_PER_THREAD:
+            instances = threading.local()
+
+            def fire_thread_instance(message):
+                """Fires the message to the current thread's callback instance"""
+                handler = getattr(instances, "handler", None)
+                if handler is None:
+                    handler = getattr(callback(), handler_name)
+                    instances.handler = handler
+                handler(message)
+            return fire_thread_instance
+        raise ValueError("Unknown class callback instance strategy: " +
+                         str(strategy))
+
+    @staticmethod
+    def _copy_with_entry(entries_by_channel, channel, callback, value=None):
         """
-        Get a copy of the contents of self.callbacks_by_channel. This is used
-        when methods are about to make changes to the content of
-        self.callbacks_by_channel. The use of this method allows other methods
-        to access the content within the self.callbacks_by_channel object
-        without needing to hold a lock.
-
-        :return: Copy of the self.callbacks_by_channel dictionary. The memory
-            for the keys is copied. The memory for the arrays in the values for
-            each key is copied as well. The individual members of each array,
-            however, will be the same references as in the arrays in the
-            current self.callbacks_by_channel dictionary.
+        Returns a copy of a map of per-callback values by channel name and
+        then callback identity, with the value for the specified callback set
+        (or removed, if ``value`` is ``None``).
+
+        :param entries_by_channel: The map to copy
+        :param channel: The channel name
+        :param callback: The callback
+        :param value: The value for the callback
+        :return: The updated copy of the map
         """
-        callbacks_by_channel = self.callbacks_by_channel.copy()
-        for channel in callbacks_by_channel:
-            callbacks_by_channel[channel] = list(callbacks_by_channel[channel])
-        return callbacks_by_channel
+        entries_by_channel = entries_by_channel.copy()
+        entries = entries_by_channel.get(channel, {}).copy()
+        if value is None:
+            entries.pop(id(callback), None)
+        else:
+            entries[id(callback)] = value
+        if entries:
+            entries_by_channel[channel] = entries
+        else:
+            entries_by_channel.pop(channel, None)
+        return entries_by_channel
 
-    def add_callback(self, channel="", callback=None):
+    def add_callback(self, channel="", callback=None, executor=None):
         """
         Adds the specified callback. The callback will receive messages that were received
         via the specified channel
 
         :param channel: Limits messages sent to the callback that were received via this channel
         :param callback: The callback to add
+        :param executor: The name of the executor that the callback should be invoked
+            by (``None`` for the default executor)
         :return: True if the callback was added successfully; False otherwise
         """
-        if channel is None:
-            raise ValueError("Missing channel argument")
+        return self.add_callbacks(((channel, callback),), executor) > 0
 
-        self.validate_callback(callback)
-
-        rc = False  # pylint: disable=invalid-name
+    def add_callbacks(self, callbacks, executor=None):
+        """
+        Adds the specified callbacks. The registrations are copied and
+        published once for the whole batch, so adding many callbacks at once is
+        much cheaper than adding them one at a time. Either all of the
+        callbacks are added or (if one of them is invalid) none of them.
+
+        :param callbacks: An iterable of ``(channel, callback)`` pairs
+        :param executor: The name of the executor that the callbacks should be
+            invoked by (``None`` for the default executor)
+        :return: The number of callbacks which were added (callbacks which were
+            already registered for their channel are not added again)
+        """
+        callbacks = list(callbacks)
+        for channel, callback in callbacks:
+            if channel is None:
+                raise ValueError("Missing channel argument")
+            self.validate_callback(callback)
+            TopicTrie.validate(channel)
+
+        added = 0
         with self.lock:
-            if _has_wildcard(channel):
-                self.wildcarding_enabled = True
-            # Add the new callback into a copy of the contents of
-            # self.callbacks_by_channel. This avoids causing issues with any
-            # readers using the current value of the object.
-            callbacks_by_channel = self._get_callbacks_by_channel_copy()
-            callbacks = callbacks_by_channel.get(channel)
-            if callbacks is None:
-                callbacks = []
-            if not callback in callbacks:
-                callbacks.append(callback)
-                callbacks_by_channel[channel] = callbacks
-                rc = True  # pylint: disable=invalid-name
-            self.callbacks_by_channel = callbacks_by_channel
-        return rc
+            # Add the new callbacks into copies of the registrations (and of
+            # the per-channel entries which change). This avoids causing issues
+            # with any readers using the current values of the objects.
+            callbacks_by_channel = self.callbacks_by_channel.copy()
+            dispatchers_by_channel = self.dispatchers_by_channel.copy()
+            executors_by_channel = self.executors_by_channel.copy()
+            wildcard_trie = self.wildcard_trie
+            copied_channels = set()
+            for channel, callback in callbacks:
+                channel_callbacks = callbacks_by_channel.get(channel, ())
+                if callback in channel_callbacks:
+                    continue
+                if channel not in copied_channels:
+                    copied_channels.add(channel)
+                    if not channel_callbacks and _has_wildcard(channel) and \
+                            TopicTrie.is_wildcard(channel):
+                        wildcard_trie = wildcard_trie.add(channel)
+                    channel_callbacks = list(channel_callbacks)
+                    callbacks_by_channel[channel] = channel_callbacks
+                    dispatchers_by_channel[channel] = \
+                        dispatchers_by_channel.get(channel, {}).copy()
+                    if executor is not None:
+                        executors_by_channel[channel] = \
+                            executors_by_channel.get(channel, {}).copy()
+                channel_callbacks.append(callback)
+                dispatchers_by_channel[channel][id(callback)] = \
+                    self.resolve_callback(callback)
+                if executor is not None:
+                    executors_by_channel[channel][id(callback)] = executor
+                added += 1
+            if added:
+                # The dispatchers are published before the callbacks
+                # themselves (see _build_dispatch_table())
+                self.dispatchers_by_channel = dispatchers_by_channel
+                self.executors_by_channel = executors_by_channel
+                self.wildcard_trie = wildcard_trie
+                self.wildcarding_enabled = not wildcard_trie.is_empty()
+                self.callbacks_by_channel = callbacks_by_channel
+                self.dispatch_tables = LruCache(_DISPATCH_TABLE_CACHE_SIZE)
+        return added
 
     def remove_callback(self, channel="", callback=None):
         """
@@ -125,202 +276,216 @@ class _CallbackManager(_BaseObject):
 
         rc = False  # pylint: disable=invalid-name
         with self.lock:
-            # Remove the callback from a copy of the contents of
-            # self.callbacks_by_channel. This avoids causing issues with any
-            # readers using the current value of the object.
-            callbacks_by_channel = self._get_callbacks_by_channel_copy()
+            # Remove the callback from a copy of self.callbacks_by_channel
+            # (and of the list of callbacks for the channel). This avoids
+            # causing issues with any readers using the current value of the
+            # object.
+            callbacks_by_channel = self.callbacks_by_channel.copy()
             callbacks = callbacks_by_channel.get(channel)
             if callbacks is not None:
+                callbacks = list(callbacks)
                 if callback in callbacks:
-                    callbacks.remove(callback)
+                    # Use the registered object (equal callbacks, such as
+                    # bound methods, may be distinct objects)
+                    callback = callbacks.pop(callbacks.index(callback))
+                    self.executors_by_channel = self._copy_with_entry(
+                        self.executors_by_channel, channel, callback)
+                    self.dispatchers_by_channel = self._copy_with_entry(
+                        self.dispatchers_by_channel, channel, callback)
                 if callbacks:
                     callbacks_by_channel[channel] = callbacks
                 else:
                     del callbacks_by_channel[channel]
+                    if _has_wildcard(channel):
+                        self.wildcard_trie = self.wildcard_trie.remove(channel)
+                        self.wildcarding_enabled = \
+                            not self.wildcard_trie.is_empty()
                 rc = True  # pylint: disable=invalid-name
-            #Determine if any wildcard exist
-            if self.wildcarding_enabled:
-                self.wildcarding_enabled = False
-                for current_channel_name in callbacks_by_channel.keys():
-                    if _has_wildcard(current_channel_name):
-                        self.wildcarding_enabled = True
-                        break
             self.callbacks_by_channel = callbacks_by_channel
+            self.dispatch_tables = LruCache(_DISPATCH_TABLE_CACHE_SIZE)
         return rc
 
-    def fire_message(self, message):
+    def _get_channels(self, channel):
         """
-        Fires the specified message to the appropriate (taking into consideration
-        channel) registered listeners.
+        Returns the names of the registration channels which match the
+        specified channel (the global channel, the channel itself, and its
+        matching wildcards, from the most to the least specific).
 
-        :param message: The message to fire
-        :return: None
+        :param channel: The channel that the message was received via
+        :return: The list of registration channel names
+        """
+        channels = ["", channel]
+        if self.wildcarding_enabled and channel is not None:
+            channels.extend(self.wildcard_trie.get_wildcards(channel))
+        return channels
+
+    def _get_dispatch_table(self, channel):
+        """
+        Returns the dispatch table for the specified channel: the callbacks
+        which would receive a message that was received via the channel,
+        grouped by the name of the executor that they were registered with.
+        Each group is ordered the way the callbacks are fired (global
+        listeners, channel listeners and then the listeners for each of the
+        channel's wildcards).
+
+        Dispatch tables are cached for recently used channels. The cache is
+        replaced whenever a callback is added or removed.
+
+        :param channel: The channel that the message was received via
+        :return: A ``dict`` by executor name, containing tuples of
+            ``(callback, dispatcher)`` pairs (see :func:`resolve_callback`)
+        """
+        # Retrieve the cache before the registrations. If a registration
+        # changes after this point, the table computed below is only stored
+        # in the (discarded) previous cache.
+        dispatch_tables = self.dispatch_tables
+        table = dispatch_tables.get(channel)
+        if table is None:
+            table = self._build_dispatch_table(channel)
+            dispatch_tables.put(channel, table)
+        return table
+
+    def _build_dispatch_table(self, channel):
+        """
+        Builds the dispatch table for the specified channel (see
+        :func:`_get_dispatch_table`).
+
+        :param channel: The channel that the message was received via
+        :return: A ``dict`` of ``(callback, dispatcher)`` tuples by executor
+            name
         """
         # Store the current value of self.callbacks_by_channel in a local
         # variable before accessing its contents. This should ensure that if
         # self.callbacks_by_channel is reassigned while iterating over its
         # contents that no concurrent modification errors are encountered.
         callbacks_by_channel = self.callbacks_by_channel
+        executors_by_channel = self.executors_by_channel
+        dispatchers_by_channel = self.dispatchers_by_channel
+
+        table = {}
+        for current_channel in self._get_channels(channel):
+            callbacks = callbacks_by_channel.get(current_channel)
+            if callbacks:
+                executors = executors_by_channel.get(current_channel)
+                dispatchers = dispatchers_by_channel.get(current_channel, {})
+                for callback in callbacks:
+                    dispatcher = dispatchers.get(id(callback))
+                    if dispatcher is None:
+                        # The callback is being removed
+                        continue
+                    executor = executors.get(id(callback)) \
+                        if executors else None
+                    table.setdefault(executor, []).append(
+                        (callback, dispatcher))
+        return dict((executor, tuple(entries))
+                    for executor, entries in table.items())
+
+    def get_executors(self, channel, ignored_callback=None):
+        """
+        Returns the names of the executors that the callbacks which would
+        receive a message received via the specified channel were registered
+        with. ``None`` represents the default executor.
+
+        :param channel: The channel that the message was received via
+        :param ignored_callback: An optional callback which should not be
+            taken into consideration
+        :return: The set of executor names (empty if no callback would receive
+            the message)
+        """
+        table = self._get_dispatch_table(channel)
+        if ignored_callback is None:
+            return set(table)
+        return set(executor for executor, entries in table.items()
+                   if any(callback is not ignored_callback
+                          for callback, _ in entries))
+
+    def has_callbacks(self, channel, ignored_callback=None):
+        """
+        Returns whether any registered callback would receive a message that
+        was received via the specified channel.
+
+        :param channel: The channel that the message was received via
+        :param ignored_callback: An optional callback which should not be
+            taken into consideration
+        :return: True if at least one callback would receive the message;
+            False otherwise
+        """
+        for entries in self._get_dispatch_table(channel).values():
+            for callback, _ in entries:
+                if callback is not ignored_callback:
+                    return True
+        return False
 
-        # Fire for global listeners (channel="")
-        self._fire_message(callbacks_by_channel.get(""), message)
-
-        # Fire for channel listeners
-        self._fire_message(callbacks_by_channel.get(message.destination_topic),
-                           message)
-
-        # Fire for all wildcarded channels
-        # If wildcarding is enabled the message will be fired to each of the message's destination
-        # wildcards, if such wildcard exists.
-        if self.wildcarding_enabled:
-
-            def on_next_wildcard(wildcard):
-                """
-                Invoked for the next wildcard pattern found
-
-                :param wildcard: The wildcard pattern
-                """
-                #if wildcarded channel does not exist no message is fired
-                self._fire_message(callbacks_by_channel.get(wildcard), message)
-
-            wildcard_callback = WildcardCallback()
-            wildcard_callback.on_next_wildcard = on_next_wildcard
-
-            #Iterate over all channel wildcards sending messages via callback
-            DxlUtils.iterate_wildcards(wildcard_callback, message.destination_topic)
+    def get_dispatchers(self, channel, executor=None):
+        """
+        Returns the registered callbacks which would receive a message that
+        was received via the specified channel, in the order in which they
+        are fired (global listeners, channel listeners and then the listeners
+        for each of the channel's wildcards).
+
+        :param channel: The channel that the message was received via
+        :param executor: The name of the executor that the callbacks were
+            registered with (``None`` for the default executor)
+        :return: The tuple of ``(callback, dispatcher)`` pairs (see
+            :func:`resolve_callback`)
+        """
+        return self._get_dispatch_table(channel).get(executor, ())
 
-    def _fire_message(self, callbacks, message):
+    def fire_message(self, message, executor=None, ignored_callback=None):
         """
-        Fires the message to the specified set of callbacks.
+        Fires the specified message to the appropriate (taking into consideration
+        channel) registered listeners.
 
-        :param callbacks: The callbacks to fire the message to
         :param message: The message to fire
-        :return:
+        :param executor: The name of the executor that is firing the message. Only
+            the listeners which were registered with this executor are notified
+            (``None`` for the default executor).
+        :param ignored_callback: An optional callback which should not be
+            notified (for example, because it has already received the message)
+        :return: None
         """
-        if callbacks:
-            for callback in callbacks:
-                self.handle_fire(callback, message)
-
-    def handle_fire(self, callback, message):
+        watchdog = self.watchdog
+        for callback, dispatcher in self.get_dispatchers(
+                message.destination_topic, executor):
+            if callback is ignored_callback:
+                continue
+            if watchdog:
+                watchdog.callback_started(callback)
+            dispatcher(message)
+
+    def fire_callback(self, callback, dispatcher, message):
         """
-        Method that is to be overridden by derived classes to fire the message to the
-        specified callback.
+        Fires the message to the specified callback.
 
-        :param callback: The target of the message
-        :param message: The message
+        :param callback: The callback to fire the message to
+        :param dispatcher: The function which fires messages to the callback
+        :param message: The message to fire
         """
-        pass
+        watchdog = self.watchdog
+        if watchdog:
+            watchdog.callback_started(callback)
+        dispatcher(message)
 
 
 class _RequestCallbackManager(_CallbackManager):
     """
     Manager for {@link RequestCallback} message callbacks.
     """
-
-    def validate_callback(self, callback):
-        """
-        Validates if `callback` is a valid RequestCallback.
-
-        :param callback: Callback to validate.
-        """
-        super(_RequestCallbackManager, self).validate_callback(callback)
-        # Check if the provided callback is a class
-        if inspect.isclass(callback):
-            if not issubclass(callback, RequestCallback):
-                raise ValueError("Type mismatch on callback argument")
-        # Not a class, but an instance
-        else:
-            if not issubclass(callback.__class__, RequestCallback):
-                raise ValueError("Type mismatch on callback argument")
-
-    def handle_fire(self, request_callback, request):
-        # pylint: disable=arguments-differ
-        """
-        Runs `request_callback` for `request`.
-
-        :param request_callback: {@link dxlclient.callbacks.RequestCallback} object that will handle the event.
-        :param request: {@link dxlclient.request.Request} object.
-        """
-        # Check if the provided eventCallback is a class
-        if inspect.isclass(request_callback):
-            callback = request_callback()
-            callback.on_request(request)
-        # Not a class, but an instance
-        else:
-            request_callback.on_request(request)
+    handler_name = "on_request"
+    callback_type = RequestCallback
 
 
 class _ResponseCallbackManager(_CallbackManager):
     """
     Manager for {@link ResponseCallback} message callbacks.
     """
-
-    def validate_callback(self, callback):
-        """
-        Validates if `callback` is a valid ResponseCallback.
-
-        :param callback: Callback to validate.
-        """
-        super(_ResponseCallbackManager, self).validate_callback(callback)
-        # Check if the provided callback is a class
-        if inspect.isclass(callback):
-            if not issubclass(callback, ResponseCallback):
-                raise ValueError("Type mismatch on callback argument")
-        # Not a class, but an instance
-        else:
-            if not issubclass(callback.__class__, ResponseCallback):
-                raise ValueError("Type mismatch on callback argument")
-
-    def handle_fire(self, response_callback, response):
-        # pylint: disable=arguments-differ
-        """
-        Runs `response_callback` for `response`.
-
-        :param response_callback: {@link dxlclient.callbacks.ResponseCallback} object that will handle the event.
-        :param response: {@link dxlclient.response.Response} object.
-        """
-        # Check if the provided eventCallback is a class
-        if inspect.isclass(response_callback):
-            callback = response_callback()
-            callback.on_response(response)
-        # Not a class, but an instance
-        else:
-            response_callback.on_response(response)
+    handler_name = "on_response"
+    callback_type = ResponseCallback
 
 
 class _EventCallbackManager(_CallbackManager):
     """
     Manager for {@link EventCallback} message callbacks.
     """
-
-    def validate_callback(self, callback):
-        """
-        Validates if `callback` is a valid EventCallback.
-
-        :param callback: Callback to validate.
-        """
-        super(_EventCallbackManager, self).validate_callback(callback)
-        # Check if the provided callback is a class
-        if inspect.isclass(callback):
-            if not issubclass(callback, EventCallback):
-                raise ValueError("Type mismatch on callback argument")
-        # Not a class, but an instance
-        else:
-            if not issubclass(callback.__class__, EventCallback):
-                raise ValueError("Type mismatch on callback argument")
-
-    def handle_fire(self, event_callback, event):
-        # pylint: disable=arguments-differ
-        """
-        Runs `event_callback` for `event`.
-
-        :param event_callback: {@link dxlclient.callbacks.EventCallback} object that will handle the event.
-        :param event: {@link dxlclient.event.Event} object.
-        """
-        # Check if the provided eventCallback is a class
-        if inspect.isclass(event_callback):
-            callback = event_callback()
-            callback.on_event(event)
-        # Not a class, but an instance
-        else:
-            event_callback.on_event(event)
+    handler_name = "on_event"
+    callback_type = EventCallback
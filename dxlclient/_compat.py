@@ -6,13 +6,20 @@
 """ Abstraction layer for Python 2 / 3 compatibility. """
 
 import sys
+import time
 
 # pylint: disable=invalid-name, unused-import, undefined-variable
 
 try:
-    from queue import Queue
+    from queue import Queue, Full
 except ImportError:
-    from Queue import Queue
+    from Queue import Queue, Full
+
+try:
+    monotonic = time.monotonic
+except AttributeError:
+    # Python 2: there is no monotonic clock in the standard library
+    monotonic = time.time
 
 if sys.version_info[0] > 2:
     def iter_dict_items(d):
@@ -51,3 +58,58 @@ else:
         :rtype: bool
         """
         return isinstance(obj, basestring)
+
+if sys.version_info >= (3, 5):
+    import asyncio
+    import inspect
+    import threading
+
+    class _ThreadEventLoop(object):
+        """
+        The event loop which runs the coroutines of a thread. The loop is
+        closed when the thread exits (and its thread-local data is released).
+        """
+        def __init__(self):
+            self.loop = asyncio.new_event_loop()
+
+        def __del__(self):
+            self.loop.close()
+
+    _coroutine_loops = threading.local()
+
+    def iscoroutinefunction(func):
+        """
+        Python 3.5+ wrapper for determining if a function is a coroutine
+        function (``async def``).
+
+        :param func: The function
+        :return: True if the function is a coroutine function, False if not.
+        :rtype: bool
+        """
+        return inspect.iscoroutinefunction(func)
+    def run_coroutine(coroutine):
+        """
+        Python 3.5+ wrapper for running a coroutine to completion on an event
+        loop which is owned by the current thread (and closed when the thread
+        exits).
+
+        :param coroutine: The coroutine
+        :return: The result of the coroutine.
+        """
+        thread_loop = getattr(_coroutine_loops, "thread_loop", None)
+        if thread_loop is None:
+            thread_loop = _ThreadEventLoop()
+            _coroutine_loops.thread_loop = thread_loop
+        return thread_loop.loop.run_until_complete(coroutine)
+else:
+    def iscoroutinefunction(_func):
+        """
+        Python 2 / 3.4 wrapper for determining if a function is a coroutine
+        function (``async def`` is not supported, so coroutines are never run
+        via :func:`run_coroutine`).
+
+        :param _func: The function
+        :return: False
+        :rtype: bool
+        """
+        return False
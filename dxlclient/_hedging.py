@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2018 McAfee LLC - All Rights Reserved.
+################################################################################
+
+"""
+Contains the :class:`HedgingPolicy` class, which determines when a duplicate
+(hedge) of a slow request is sent, and the :class:`HedgedRequest` class, which
+tracks the copies of a request until the first response is received.
+"""
+
+from __future__ import absolute_import
+from collections import deque
+import math
+import threading
+
+from dxlclient._compat import monotonic
+from dxlclient.message import Request
+
+
+class HedgingPolicy(object):
+    """
+    The hedging policy for a request topic. The delay after which a hedge is
+    sent is the configured percentile of the latencies of the recent responses
+    on the topic (``initial_delay`` until enough responses have been received).
+    """
+
+    # The number of latencies used to compute the percentile
+    WINDOW_SIZE = 100
+    # The number of latencies required before the percentile is used
+    MIN_SAMPLES = 10
+
+    def __init__(self, settings):
+        """
+        Constructor parameters:
+
+        :param settings: A ``dict`` containing the settings of the policy (see
+            :func:`dxlclient.client_config.DxlClientConfig.add_request_hedging`):
+            ``percentile``, ``initial_delay``, ``min_delay``, ``max_hedges``
+            and ``service_ids``
+        """
+        self._percentile = settings["percentile"]
+        self._initial_delay = settings["initial_delay"]
+        self._min_delay = settings["min_delay"]
+        self._max_hedges = settings["max_hedges"]
+        self._service_ids = list(settings["service_ids"] or [])
+        self._latencies = deque(maxlen=self.WINDOW_SIZE)
+        self._lock = threading.Lock()
+
+    @property
+    def max_hedges(self):
+        """
+        The maximum number of hedges sent for a request
+        """
+        return self._max_hedges
+
+    def record_latency(self, latency):
+        """
+        Records the time (in seconds) taken to receive a response.
+
+        :param latency: The latency
+        """
+        with self._lock:
+            self._latencies.append(latency)
+
+    def get_delay(self):
+        """
+        Returns the time (in seconds) after which a hedge is sent for a request
+        which has not received a response.
+        """
+        with self._lock:
+            if len(self._latencies) < self.MIN_SAMPLES:
+                return self._initial_delay
+            latencies = sorted(self._latencies)
+        index = int(math.ceil(self._percentile / 100.0 * len(latencies))) - 1
+        return max(self._min_delay, latencies[max(0, index)])
+
+    def create_hedge(self, request, used_service_ids):
+        """
+        Returns a copy of the specified request (with a new message identifier)
+        to send as a hedge. If the policy has service identifiers, the hedge is
+        sent to a service which has not received a copy of the request yet.
+
+        :param request: The request
+        :param used_service_ids: The service identifiers of the copies of the
+            request which have been sent
+        :return: The hedge
+        """
+        hedge = Request(request.destination_topic)
+        hedge.payload = request.payload
+        hedge.broker_ids = list(request.broker_ids)
+        hedge.client_ids = list(request.client_ids)
+        hedge.other_fields = dict(request.other_fields)
+        hedge.destination_tenant_guids = list(request.destination_tenant_guids)
+        hedge.service_id = request.service_id
+        for service_id in self._service_ids:
+            if service_id not in used_service_ids:
+                hedge.service_id = service_id
+                break
+        return hedge
+
+
+class HedgedRequest(object):
+    """
+    Tracks the copies (the original request and its hedges) of a hedged
+    request. The first response to any of the copies completes the request.
+    """
+
+    def __init__(self, policy, request, response_function):
+        """
+        Constructor parameters:
+
+        :param policy: The :class:`HedgingPolicy`
+        :param request: The original request
+        :param response_function: The function which receives the response
+            (``None`` if the response is not needed)
+        """
+        self.policy = policy
+        self.request = request
+        self.response_function = response_function
+        # The send times of the copies, by message identifier
+        self.send_times = {request.message_id: monotonic()}
+        self.service_ids = set([request.service_id])
+        # The timeout (see the timing wheel of the client) for the next hedge
+        self.timer = None
+        # The function which receives the responses to all of the copies
+        self.on_response = None
+        self._done = False
+        self._lock = threading.Lock()
+
+    @property
+    def done(self):
+        """
+        Whether a response has been received (or the request was abandoned)
+        """
+        return self._done
+
+    @property
+    def hedge_count(self):
+        """
+        The number of hedges which have been sent
+        """
+        return len(self.send_times) - 1
+
+    def add_hedge(self, hedge):
+        """
+        Records a hedge which is about to be sent.
+
+        :param hedge: The hedge
+        """
+        with self._lock:
+            self.send_times[hedge.message_id] = monotonic()
+            self.service_ids.add(hedge.service_id)
+
+    def complete(self):
+        """
+        Marks the request as complete.
+
+        :return: True if the request was completed by this call; False if it
+            had already been completed
+        """
+        with self._lock:
+            if self._done:
+                return False
+            self._done = True
+            return True
+
+    def get_message_ids(self):
+        """
+        Returns the message identifiers of the copies of the request.
+        """
+        with self._lock:
+            return list(self.send_times)
@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2018 McAfee LLC - All Rights Reserved.
+################################################################################
+
+"""
+Contains the :class:`SendLimiter` class, which limits the number of requests in
+flight and the rate at which messages are sent to a family of topics, and the
+:class:`SendLimiters` class, which finds the limiter for a topic.
+"""
+
+from __future__ import absolute_import
+from collections import deque
+import logging
+import threading
+
+from dxlclient._compat import monotonic
+from dxlclient._topic_trie import TopicTrie
+from dxlclient.exceptions import SendLimitExceededException
+
+logger = logging.getLogger(__name__)
+
+# Wait (up to the maximum wait time) for capacity on the sending thread
+POLICY_BLOCK = "block"
+# Reject messages immediately when there is no capacity
+POLICY_FAIL = "fail"
+# Queue messages, which are sent (by another thread) once there is capacity
+POLICY_QUEUE = "queue"
+
+
+class SendLimiter(object):
+    """
+    Limits the number of requests which are awaiting a response (in flight)
+    and the rate at which messages are sent (a token bucket which holds up to
+    ``burst`` tokens, and is refilled at ``rate`` tokens per second).
+
+    A permit is acquired before a message is sent. The permits for requests
+    also occupy an in-flight slot, which is given back via :func:`release` when
+    the request completes. When no permit is available, the message is delayed
+    or rejected according to the policy of the limiter.
+    """
+
+    def __init__(self, settings, schedule=None, execute=None):
+        """
+        Constructor parameters:
+
+        :param settings: A ``dict`` containing the settings of the limit (see
+            :func:`dxlclient.client_config.DxlClientConfig.add_send_limit`):
+
+            - ``max_in_flight``: The maximum number of requests in flight
+              (``None`` for no limit)
+            - ``rate``: The maximum number of messages sent per second
+              (``None`` for no limit)
+            - ``burst``: The number of messages which can be sent at once after
+              a quiet period (defaults to ``rate``, and at least 1)
+            - ``policy``: :data:`POLICY_BLOCK` (the default),
+              :data:`POLICY_FAIL` or :data:`POLICY_QUEUE`
+            - ``max_wait``: The maximum time (in seconds) that the sending
+              thread waits for a permit (``None`` to wait indefinitely)
+            - ``max_queued``: The maximum number of queued messages (``None``
+              for no limit)
+        :param schedule: The function which schedules a function to be invoked
+            after a delay (see :func:`dxlclient._timing_wheel.TimingWheel.schedule`),
+            used to send queued messages when tokens become available
+        :param execute: The function which runs a function on another thread
+            (see :func:`dxlclient.client.DxlClient._add_local_task`), used to
+            send queued messages when capacity is released. Queued messages are
+            sent on the releasing thread if not specified.
+        """
+        policy = settings.get("policy", POLICY_BLOCK)
+        if policy not in (POLICY_BLOCK, POLICY_FAIL, POLICY_QUEUE):
+            raise ValueError("Unknown send limit policy: " + str(policy))
+        rate = settings.get("rate")
+        burst = settings.get("burst")
+        self._max_in_flight = settings.get("max_in_flight")
+        self._rate = rate
+        self._burst = max(1, burst if burst is not None else (rate or 1))
+        self._policy = policy
+        self._max_wait = settings.get("max_wait")
+        self._max_queued = settings.get("max_queued")
+        self._schedule = schedule
+        self._execute = execute
+        self._condition = threading.Condition(threading.Lock())
+        self._in_flight = 0
+        self._tokens = float(self._burst)
+        self._last_refill = monotonic()
+        # Tuples of (whether an in-flight slot is needed, function, arguments,
+        # time queued) for the queued messages
+        self._queue = deque()
+        self._drain_scheduled = False
+        # Metrics
+        self._wait_count = 0
+        self._wait_time = 0.0
+        self._rejected_count = 0
+
+    @property
+    def policy(self):
+        """
+        The policy of the limiter
+        """
+        return self._policy
+
+    @property
+    def in_flight(self):
+        """
+        The number of requests in flight
+        """
+        return self._in_flight
+
+    def get_statistics(self):
+        """
+        Returns a ``dict`` containing the current number of requests in flight
+        (``in_flight``) and of queued messages (``queued``), the number of
+        messages which were delayed for lack of a permit (``wait_count``), the
+        total time (in seconds) that they were delayed (``wait_time``) and the
+        number of messages which were rejected (``rejected_count``).
+        """
+        with self._condition:
+            return {
+                "in_flight": self._in_flight,
+                "queued": len(self._queue),
+                "wait_count": self._wait_count,
+                "wait_time": self._wait_time,
+                "rejected_count": self._rejected_count
+            }
+
+    def _try_acquire(self, in_flight, now):
+        """
+        Attempts to acquire a permit (the lock must be held).
+
+        :param in_flight: Whether the permit occupies an in-flight slot
+        :param now: The current (monotonic) time
+        :return: ``0`` if the permit was acquired, the time (in seconds) until
+            a token is available, or ``None`` if an in-flight slot is needed
+        """
+        if in_flight and self._max_in_flight is not None and \
+                self._in_flight >= self._max_in_flight:
+            return None
+        if self._rate:
+            self._tokens = min(self._burst, self._tokens +
+                               (now - self._last_refill) * self._rate)
+            self._last_refill = now
+            if self._tokens < 1:
+                return (1 - self._tokens) / self._rate
+            self._tokens -= 1
+        if in_flight:
+            self._in_flight += 1
+        return 0
+
+    def _reject(self, reason):
+        """
+        Counts a rejected message (the lock must be held), and returns the
+        exception to raise.
+        """
+        self._rejected_count += 1
+        return SendLimitExceededException(reason)
+
+    def acquire(self, in_flight=True, timeout=None):
+        """
+        Acquires a permit, waiting (unless the policy is :data:`POLICY_FAIL`)
+        until one is available.
+
+        :param in_flight: Whether the permit occupies an in-flight slot (which
+            must be given back via :func:`release`)
+        :param timeout: The maximum time (in seconds) to wait (``None`` for no
+            limit). The smaller of this and the maximum wait time of the
+            limiter applies.
+        :raise SendLimitExceededException: If no permit was acquired
+        """
+        if timeout is None or \
+                (self._max_wait is not None and self._max_wait < timeout):
+            timeout = self._max_wait
+        start = monotonic()
+        with self._condition:
+            delay = self._try_acquire(in_flight, start)
+            if delay == 0:
+                return
+            if self._policy == POLICY_FAIL:
+                raise self._reject("Send limit exceeded")
+            deadline = None if timeout is None else start + timeout
+            while delay != 0:
+                now = monotonic()
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        raise self._reject("Timeout waiting for send limit")
+                    delay = remaining if delay is None else min(delay, remaining)
+                self._condition.wait(delay)
+                delay = self._try_acquire(in_flight, monotonic())
+            self._wait_count += 1
+            self._wait_time += monotonic() - start
+
+    def release(self):
+        """
+        Gives back the in-flight slot of a permit (when a request completes),
+        and sends the queued messages which can now be sent. Responses may be
+        delivered on the network thread of the client, so the queued messages
+        are sent via the ``execute`` function of the limiter.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+        if self._queue:
+            self._run_drain()
+
+    def _run_drain(self):
+        """
+        Sends the queued messages on another thread (if the limiter has an
+        ``execute`` function), or on the current thread.
+        """
+        if self._execute is not None:
+            self._execute(self._drain)
+        else:
+            self._drain()
+
+    def submit(self, in_flight, func, *args):
+        """
+        Invokes the function which sends a message once a permit has been
+        acquired. With the :data:`POLICY_QUEUE` policy, a message which cannot be
+        sent immediately is queued and the function is invoked later, once
+        capacity is released or a token becomes available (see
+        :func:`release`).
+
+        :param in_flight: Whether the permit occupies an in-flight slot (which
+            must be given back via :func:`release`)
+        :param func: The function which sends the message
+        :param args: The arguments to invoke the function with
+        :raise SendLimitExceededException: If the message was rejected
+        """
+        if self._policy != POLICY_QUEUE:
+            self.acquire(in_flight)
+            func(*args)
+            return
+        now = monotonic()
+        with self._condition:
+            if not self._queue and self._try_acquire(in_flight, now) == 0:
+                queued = False
+            elif self._max_queued is not None and \
+                    len(self._queue) >= self._max_queued:
+                raise self._reject("Send limit queue is full")
+            else:
+                self._queue.append((in_flight, func, args, now))
+                queued = True
+        if queued:
+            self._drain()
+        else:
+            func(*args)
+
+    def _drain(self):
+        """
+        Sends the queued messages for which permits are available, and
+        schedules another attempt when the next token becomes available.
+        """
+        while True:
+            with self._condition:
+                if not self._queue:
+                    return
+                in_flight, func, args, queued_time = self._queue[0]
+                now = monotonic()
+                delay = self._try_acquire(in_flight, now)
+                if delay != 0:
+                    if delay is not None and not self._drain_scheduled and \
+                            self._schedule is not None:
+                        self._drain_scheduled = True
+                        self._schedule(delay, self._on_drain_timer)
+                    return
+                self._queue.popleft()
+                self._wait_count += 1
+                self._wait_time += now - queued_time
+            try:
+                func(*args)
+            except Exception as ex:  # pylint: disable=broad-except
+                logger.error("Error sending queued message: %s", str(ex))
+
+    def _on_drain_timer(self):
+        """
+        Invoked (on the timer thread of the client) when a token is expected
+        to be available for the queued messages.
+        """
+        with self._condition:
+            self._drain_scheduled = False
+        self._run_drain()
+
+
+class SendLimiters(object):
+    """
+    The send limiters of a client, by topic. A limiter may be registered for a
+    specific topic or for a wildcard (see :class:`dxlclient._topic_trie.TopicTrie`).
+    The limiter for a specific topic takes precedence, followed by the most
+    specific matching wildcard.
+
+    Limiters are only added while the client is being constructed, so lookups
+    do not acquire any locks.
+    """
+
+    def __init__(self):
+        self._limiters = {}
+        self._wildcards = TopicTrie()
+
+    def __len__(self):
+        return len(self._limiters)
+
+    def add(self, topic, limiter):
+        """
+        Adds the limiter for the specified topic (which may be a wildcard).
+
+        :param topic: The topic
+        :param limiter: The :class:`SendLimiter`
+        """
+        TopicTrie.validate(topic)
+        self._limiters[topic] = limiter
+        if TopicTrie.is_wildcard(topic):
+            self._wildcards = self._wildcards.add(topic)
+
+    def get(self, topic):
+        """
+        Returns the limiter for the specified topic.
+
+        :param topic: The topic
+        :return: The :class:`SendLimiter`, or ``None`` if the topic is not limited
+        """
+        if not self._limiters:
+            return None
+        limiter = self._limiters.get(topic)
+        if limiter is None and not self._wildcards.is_empty():
+            wildcards = self._wildcards.get_wildcards(topic)
+            if wildcards:
+                limiter = self._limiters[wildcards[0]]
+        return limiter
+
+    def get_statistics(self):
+        """
+        Returns the statistics (see :func:`SendLimiter.get_statistics`) of the
+        limiters, by topic.
+        """
+        return dict((topic, limiter.get_statistics())
+                    for topic, limiter in self._limiters.items())
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2018 McAfee LLC - All Rights Reserved.
+################################################################################
+
+"""
+Contains the :class:`LruCache` class, a thread-safe bounded cache.
+"""
+
+from __future__ import absolute_import
+from collections import OrderedDict
+import threading
+
+
+class LruCache(object):
+    """
+    Thread-safe cache which holds up to a maximum number of entries. When the
+    cache is full, the least recently used entry is evicted.
+    """
+
+    def __init__(self, max_size):
+        """
+        Constructor parameters:
+
+        :param max_size: The maximum number of entries
+        """
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        """
+        Returns the value for the specified key (marking the entry as the most
+        recently used).
+
+        :param key: The key
+        :param default: The value to return if the cache does not contain the key
+        :return: The value
+        """
+        with self._lock:
+            try:
+                value = self._entries.pop(key)
+            except KeyError:
+                return default
+            self._entries[key] = value
+            return value
+
+    def put(self, key, value):
+        """
+        Sets the value for the specified key, evicting the least recently used
+        entry if the cache is full.
+
+        :param key: The key
+        :param value: The value
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = value
+            if len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def remove(self, key):
+        """
+        Removes the entry for the specified key (if any).
+
+        :param key: The key
+        :return: The value of the removed entry, or ``None``
+        """
+        with self._lock:
+            return self._entries.pop(key, None)
+
+    def clear(self):
+        """
+        Removes all of the entries.
+        """
+        with self._lock:
+            self._entries.clear()
@@ -9,16 +9,34 @@ the DXL fabric.
 """
 
 from __future__ import absolute_import
-import threading
-import time
+from concurrent import futures
+import hashlib
 import logging
+import threading
 
+from dxlclient._compat import monotonic
 from dxlclient.exceptions import WaitTimeoutException
+from dxlclient.message import ErrorResponse
 from dxlclient.callbacks import ResponseCallback
+from dxlclient.future import DxlFuture
+from dxlclient._hedging import HedgedRequest
+from dxlclient.deadline import _stamp_deadline
+from dxlclient._callback_manager import _resolve_function
 
 logger = logging.getLogger(__name__)
 
 
+def _is_timeout_response(response):
+    """
+    Returns whether the specified response is the error response which is delivered by the
+    request manager when an asynchronous request expires.
+    :param response: The response
+    :return: True if the response indicates a timeout; False otherwise
+    """
+    return isinstance(response, ErrorResponse) and \
+        response.error_code == ErrorResponse.TIMEOUT_ERROR_CODE
+
+
 class RequestManager(ResponseCallback):
     """
     Manager that tracks outstanding requests and notifies the appropriate parties
@@ -28,32 +46,62 @@ class RequestManager(ResponseCallback):
     This purpose of this object is to collaborate with an {@link DxlClient}
     instance.
     """
-    # TODO: Add TTL to removed callbacks if response is never received.
-    # TODO: Remove current message identifiers if response is never received.
-
     def __init__(self, client):
         """Constructor"""
         super(RequestManager, self).__init__()
 
-        # Map containing {@link ResponseCallback} instances associated with the
-        # identifier of the request message that they are waiting for a response
-        # to. This map is used for asynchronous requests.
+        # The state of the outstanding requests is kept in built-in sets and
+        # dicts, and is only ever updated with single operations (add, discard,
+        # pop, item assignment) which are atomic. Requests and responses for
+        # different messages therefore never contend for a lock.
+
+        # Map containing the functions which receive the responses (see
+        # register_async_callback()) associated with the identifier of the
+        # request message that they are waiting for a response to. This map
+        # is used for asynchronous requests.
         self.callback_map = {}
-        # Lock for request threads waiting for a response (for synchronous request)
-        self.sync_wait_message_lock = threading.RLock()
-        # The condition associated with the request threads waiting for a response
-        # (for synchronous request).
-        self.sync_wait_message_condition = threading.Condition(self.sync_wait_message_lock)
-        # Set of identifiers of request messages that are waiting for a response
-        # (for synchronous request).
-        self.sync_wait_message_ids = set()
-        # Messages that have been received mapped by the corresponding request
-        # message identifier (for synchronous request).
-        self.sync_wait_message_responses = {}
-        # Lock for the current request message identifiers (requests that are in process)
-        self.current_request_message_lock = threading.RLock()
+        # Map containing the futures that request threads are waiting on for
+        # a response (for synchronous request), by request message identifier.
+        # Each future is completed directly by on_response(), so a response
+        # only wakes the thread which is waiting for it.
+        self.sync_waiters = {}
         # Current request message identifiers (requests that are in process)
         self.current_request_message_ids = set()
+        # Map containing the timeouts (see the timing wheel of the client) of
+        # the asynchronous requests which were sent with a timeout, by request
+        # message identifier
+        self.request_timeouts = {}
+        # The caches of the responses to requests, by destination topic (see
+        # dxlclient.client_config.DxlClientConfig.add_response_cache)
+        self.response_caches = {}
+        # The send limiters (see dxlclient._limiter.SendLimiters) of the
+        # client (None if no limits are configured)
+        self.limiters = None
+        # Map containing the send limiters whose in-flight slots are occupied
+        # by requests, by request message identifier
+        self.limited_requests = {}
+        # The hedging policies (see dxlclient._hedging.HedgingPolicy), by
+        # destination topic
+        self.hedging_policies = {}
+        # The number of hedges sent, and the number of hedged requests whose
+        # first response was received for a hedge
+        self._hedge_count = 0
+        self._hedge_win_count = 0
+        self._hedge_count_lock = threading.Lock()
+        # Whether concurrent identical synchronous requests share a single
+        # request (see sync_request())
+        self.single_flight = False
+        # The futures for the responses to the synchronous requests which are
+        # shared by concurrent callers, by single-flight key
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+        # The number of synchronous requests which were served by the response
+        # to another caller's request
+        self._coalesced_request_count = 0
+        # The number of asynchronous requests which have expired without
+        # receiving a response
+        self._expired_request_count = 0
+        self._expired_request_count_lock = threading.Lock()
         # The client that the request manager is associated with
         self.client = client
         # Register self as ResponseCallback for all channels
@@ -70,9 +118,7 @@ class RequestManager(ResponseCallback):
         :param message_id: The request message identifier
         :return: None
         """
-        with self.current_request_message_lock:
-            if not message_id in self.current_request_message_ids:
-                self.current_request_message_ids.add(message_id)
+        self.current_request_message_ids.add(message_id)
 
     def remove_current_request(self, message_id):
         """
@@ -81,26 +127,167 @@ class RequestManager(ResponseCallback):
         :param message_id: The request message identifier
         :return: None
         """
-        with self.current_request_message_lock:
-            if message_id in self.current_request_message_ids:
-                self.current_request_message_ids.remove(message_id)
+        self.current_request_message_ids.discard(message_id)
 
     def get_current_request_queue_size(self):
         """
         Returns the size of the current request queue
         :return: The size of the current request queue
         """
-        with self.current_request_message_lock:
-            return len(self.current_request_message_ids)
+        return len(self.current_request_message_ids)
+
+    def is_pending(self, message_id):
+        """
+        Returns whether a response to the specified request is still expected
+        (a synchronous waiter, an asynchronous callback, or an in-process
+        request exists for it).
+
+        This method is invoked for every incoming response and does not
+        acquire any locks (see the notes in the constructor).
+
+        :param message_id: The request message identifier
+        :return: True if a response to the request is still expected; False
+            otherwise
+        """
+        return message_id in self.current_request_message_ids or \
+            self.is_sync_waiting(message_id) or \
+            message_id in self.callback_map
 
-    def sync_request(self, request, wait):
+    def is_sync_waiting(self, message_id):
+        """
+        Returns whether a thread is waiting synchronously for the response to
+        the specified request. Like :func:`is_pending`, this does not acquire
+        any locks.
+
+        :param message_id: The request message identifier
+        :return: True if a synchronous waiter is registered for the request
+            (and has not received its response yet); False otherwise
+        """
+        future = self.sync_waiters.get(message_id)
+        return future is not None and not future.done()
+
+    def sync_request(self, request, wait, single_flight_key=None):
         """
         Performs a synchronous request with the default timeout via the DXL fabric
+
+        If a response cache is configured for the destination topic of the request (see
+        :attr:`response_caches`), an unexpired cached response is returned without sending the
+        request, and the response (unless it is an error response) is cached otherwise.
+
+        If a single-flight key is specified (or :attr:`single_flight` is enabled, in which case
+        the key is derived from the request), a caller whose request has the same key as a
+        request which is in flight does not send its request. It waits for the in-flight
+        request's response instead, which is returned to all of the callers.
+
+        :param request: The request
+        :param wait: The maximum time to wait for the request
+        :param single_flight_key: An optional key identifying the requests which can share a
+            response
+        :return: The Response object
+
+        The deadline of the request (see :mod:`dxlclient.deadline`) is stamped into the request
+        before it is sent.
+        """
+        _stamp_deadline(request, wait)
+        cache = self.response_caches.get(request.destination_topic)
+        key = generation = None
+        if cache is not None:
+            key = cache.get_key(request)
+            response = cache.get(key)
+            if response is not None:
+                return response
+            generation = cache.generation
+
+        if single_flight_key is None and self.single_flight:
+            single_flight_key = self.get_single_flight_key(request)
+        if single_flight_key is not None:
+            response = self._sync_request_single_flight(request, wait, single_flight_key)
+        else:
+            response = self._sync_request(request, wait)
+
+        if cache is not None and not isinstance(response, ErrorResponse):
+            cache.put(key, response, generation)
+        return response
+
+    @staticmethod
+    def get_single_flight_key(request):
+        """
+        Returns the default single-flight key of a request: its destination topic, service
+        identifier and a digest of its payload. Other properties of the request (such as
+        ``other_fields``) are not taken into consideration.
+        :param request: The request
+        :return: The key
+        """
+        payload = request.payload or b""
+        if not isinstance(payload, bytes):
+            payload = payload.encode("utf-8")
+        return (request.destination_topic, request.service_id,
+                hashlib.sha256(payload).digest())
+
+    @property
+    def coalesced_request_count(self):
+        """
+        The number of synchronous requests which were served by the response to another
+        caller's in-flight request
+        """
+        return self._coalesced_request_count
+
+    def _sync_request_single_flight(self, request, wait, key):
+        """
+        Performs a synchronous request, sharing the request with concurrent callers which
+        use the same single-flight key
+        :param request: The request
+        :param wait: The maximum time to wait for the request
+        :param key: The single-flight key
+        :return: The Response object
+        """
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = DxlFuture()
+                self._flights[key] = flight
+                leader = True
+            else:
+                self._coalesced_request_count += 1
+                leader = False
+
+        if not leader:
+            try:
+                return flight.result(wait)
+            except (WaitTimeoutException, futures.TimeoutError):
+                raise WaitTimeoutException("Timeout waiting for response to message: " +
+                                           request.message_id)
+
+        try:
+            response = self._sync_request(request, wait)
+            flight.set_result(response)
+            return response
+        except Exception as ex:
+            flight.set_exception(ex)
+            raise
+        finally:
+            with self._flights_lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+
+    def _sync_request(self, request, wait):
+        """
+        Performs a synchronous request via the DXL fabric
         :param request: The request
-        :param wait_ms: The maximum time to wait for the request
+        :param wait: The maximum time to wait for the request
         :return: The Response object
         """
+        policy = self.hedging_policies.get(request.destination_topic)
+        if policy is not None:
+            return self._sync_request_hedged(policy, request, wait)
         response = None
+        limiter = self._get_limiter(request)
+        if limiter is not None:
+            # The time spent waiting for the limiter is part of the wait
+            start = monotonic()
+            limiter.acquire(timeout=wait)
+            self.limited_requests[request.message_id] = limiter
+            wait = max(0, wait - (monotonic() - start))
         self.register_wait_for_response(request)
         try:
             try:
@@ -113,31 +300,426 @@ class RequestManager(ResponseCallback):
                 self.remove_current_request(request.message_id)
         finally:
             self.unregister_wait_for_response(request)
+            self._release_limit(request.message_id)
 
         return response
 
-    def async_request(self, request, response_callback):
+    def _get_limiter(self, request):
+        """
+        Returns the send limiter for the destination topic of the specified request
+        :param request: The request
+        :return: The :class:`dxlclient._limiter.SendLimiter`, or ``None`` if the topic is
+            not limited
+        """
+        limiters = self.limiters
+        return None if limiters is None else limiters.get(request.destination_topic)
+
+    def _release_limit(self, message_id):
+        """
+        Gives back the in-flight slot of the send limiter which is occupied by the specified
+        request (if any).
+        :param message_id: The request message identifier
+        :return: None
+        """
+        limiter = self.limited_requests.pop(message_id, None)
+        if limiter is not None:
+            limiter.release()
+
+    def async_request(self, request, response_callback, timeout=None):
         """
         Performs an asynchronous request via the DXL fabric
         :param request: The request
         :param response_callback: The callback to be invoked when the response is received
+            (a :class:`dxlclient.callbacks.ResponseCallback` or a plain function)
+        :param timeout: The time (in seconds) after which the request expires if no response
+            has been received (``None`` for no timeout). The callback of an expired request
+            receives an :class:`dxlclient.message.ErrorResponse` with the
+            :attr:`dxlclient.message.ErrorResponse.TIMEOUT_ERROR_CODE` error code.
+        :return: None
+
+        If a response cache is configured for the destination topic of the request (see
+        :attr:`response_caches`), an unexpired cached response is delivered to the callback (via
+        the default executor of the client) without sending the request.
+
+        If a hedging policy is configured for the destination topic of the request (see
+        :attr:`hedging_policies`), copies of a request which is slow to receive a response are
+        sent (see :func:`_async_request_hedged`).
+
+        If a send limiter is configured for the destination topic (see :attr:`limiters`), the
+        request is sent once the limiter grants a permit. A request which is queued by the
+        limiter may expire (see ``timeout``) before it is sent, in which case it is not sent.
+
+        The deadline of the request (see :mod:`dxlclient.deadline`) is stamped into the request
+        before it is sent.
+        """
+        _stamp_deadline(request, timeout)
+        cache = self.response_caches.get(request.destination_topic)
+        if cache is not None:
+            response_callback = self._get_cached_response_callback(
+                cache, request, response_callback)
+            if response_callback is None:
+                return
+        policy = self.hedging_policies.get(request.destination_topic)
+        if policy is not None:
+            self._async_request_hedged(policy, request, response_callback, timeout)
+        else:
+            self._async_request(request, response_callback, timeout)
+
+    def _async_request(self, request, response_callback, timeout):
+        """
+        Registers the callback for an asynchronous request, and sends the request (see
+        :func:`async_request`)
+        :param request: The request
+        :param response_callback: The callback to be invoked when the response is received
+            (``None`` if the response is not needed)
+        :param timeout: The time (in seconds) after which the request expires if no response
+            has been received (``None`` for no timeout)
         :return: None
         """
-        destination = request.destination_topic
         if not response_callback is None:
             self.register_async_callback(request, response_callback)
         try:
             # Add to set of current requests
             self.add_current_request(request.message_id)
+            if timeout is not None:
+                self.request_timeouts[request.message_id] = \
+                    self.client._timing_wheel.schedule(
+                        timeout, self._on_request_timeout, request)
+            limiter = self._get_limiter(request)
+            if limiter is None:
+                self.client._send_request(request)
+            else:
+                limiter.submit(True, self._send_limited_request, request, limiter)
+        except Exception:
+            self._abandon_async_request(request.message_id)
+            raise
+
+    def _send_limited_request(self, request, limiter):
+        """
+        Sends an asynchronous request once a permit has been acquired from the send limiter
+        for its destination topic (possibly on another thread, if the request was queued).
+        :param request: The request
+        :param limiter: The :class:`dxlclient._limiter.SendLimiter`
+        :return: None
+        """
+        message_id = request.message_id
+        # The limiter is recorded before checking whether the request is still current, so
+        # that a request which completes (or expires) concurrently always releases the limit
+        self.limited_requests[message_id] = limiter
+        if message_id not in self.current_request_message_ids:
+            # The request expired while it was queued
+            self._release_limit(message_id)
+            return
+        try:
             self.client._send_request(request)
         except Exception:
-            try:
-                if not response_callback is None:
-                    self.unregister_async_callback(destination)
-            finally:
-                self.remove_current_request(request.message_id)
+            self._abandon_async_request(message_id)
             raise
 
+    def _abandon_async_request(self, message_id):
+        """
+        Removes the state of an asynchronous request which could not be sent (or whose
+        response is no longer needed).
+        :param message_id: The request message identifier
+        :return: None
+        """
+        try:
+            self.unregister_async_callback(message_id)
+        finally:
+            self.remove_current_request(message_id)
+            self._cancel_request_timeout(message_id)
+            self._release_limit(message_id)
+
+    def _async_request_hedged(self, policy, request, response_callback, timeout):
+        """
+        Sends an asynchronous request, and schedules the hedges (copies) of the request which
+        are sent if no response has been received after the delay of the hedging policy. The
+        first response to any of the copies is delivered to the callback, and the other copies
+        are abandoned (their responses are dropped). The timeout applies to the original
+        request, and expires all of the copies.
+        :param policy: The :class:`dxlclient._hedging.HedgingPolicy`
+        :param request: The request
+        :param response_callback: The callback to be invoked when the response is received
+            (``None`` if the response is not needed)
+        :param timeout: The time (in seconds) after which the request expires if no response
+            has been received (``None`` for no timeout)
+        :return: The :class:`dxlclient._hedging.HedgedRequest`
+        """
+        response_function = None if response_callback is None \
+            else self._get_response_function(response_callback)
+        hedged_request = HedgedRequest(policy, request, response_function)
+
+        def on_response(response):
+            """Delivers the first response to any of the copies of the request"""
+            self._on_hedged_response(hedged_request, response)
+
+        hedged_request.on_response = on_response
+        self._async_request(request, on_response, timeout)
+        self._schedule_hedge(hedged_request)
+        return hedged_request
+
+    def _schedule_hedge(self, hedged_request):
+        """
+        Schedules the next hedge of a hedged request (if the maximum number of hedges has not
+        been sent yet).
+        :param hedged_request: The :class:`dxlclient._hedging.HedgedRequest`
+        :return: None
+        """
+        if hedged_request.done or \
+                hedged_request.hedge_count >= hedged_request.policy.max_hedges:
+            return
+        client = self.client
+        hedged_request.timer = client._timing_wheel.schedule(
+            hedged_request.policy.get_delay(),
+            client._add_local_task, self._send_hedge, hedged_request)
+
+    def _send_hedge(self, hedged_request):
+        """
+        Sends a hedge of a request which has not received a response (invoked via the default
+        executor of the client, so that a send limit can not block the timer thread).
+        :param hedged_request: The :class:`dxlclient._hedging.HedgedRequest`
+        :return: None
+        """
+        if hedged_request.done:
+            return
+        hedge = hedged_request.policy.create_hedge(
+            hedged_request.request, hedged_request.service_ids)
+        hedged_request.add_hedge(hedge)
+        try:
+            self._async_request(hedge, hedged_request.on_response, None)
+        except Exception as ex:  # pylint: disable=broad-except
+            logger.error("Error sending hedge of request %s: %s",
+                         hedged_request.request.message_id, str(ex))
+            return
+        with self._hedge_count_lock:
+            self._hedge_count += 1
+        if hedged_request.done:
+            # The response was received while the hedge was being sent
+            self._abandon_async_request(hedge.message_id)
+        else:
+            self._schedule_hedge(hedged_request)
+
+    def _on_hedged_response(self, hedged_request, response):
+        """
+        Invoked when a response to one of the copies of a hedged request is received. The first
+        response is delivered to the callback of the request, and the other copies are
+        abandoned.
+        :param hedged_request: The :class:`dxlclient._hedging.HedgedRequest`
+        :param response: The response
+        :return: None
+        """
+        if not hedged_request.complete():
+            return
+        if hedged_request.timer is not None:
+            hedged_request.timer.cancel()
+        message_id = response.request_message_id
+        for other_message_id in hedged_request.get_message_ids():
+            if other_message_id != message_id:
+                self._abandon_async_request(other_message_id)
+        if not isinstance(response, ErrorResponse):
+            send_time = hedged_request.send_times.get(message_id)
+            if send_time is not None:
+                hedged_request.policy.record_latency(monotonic() - send_time)
+            if message_id != hedged_request.request.message_id:
+                with self._hedge_count_lock:
+                    self._hedge_win_count += 1
+        if hedged_request.response_function is not None:
+            hedged_request.response_function(response)
+
+    def _sync_request_hedged(self, policy, request, wait):
+        """
+        Performs a synchronous request which is hedged (see :func:`_async_request_hedged`)
+        :param policy: The :class:`dxlclient._hedging.HedgingPolicy`
+        :param request: The request
+        :param wait: The maximum time to wait for the request
+        :return: The Response object
+        """
+        future = DxlFuture()
+        hedged_request = self._async_request_hedged(policy, request, future.set_result, None)
+        try:
+            return future.result(wait)
+        except (WaitTimeoutException, futures.TimeoutError):
+            if hedged_request.complete():
+                if hedged_request.timer is not None:
+                    hedged_request.timer.cancel()
+                for message_id in hedged_request.get_message_ids():
+                    self._abandon_async_request(message_id)
+            raise WaitTimeoutException("Timeout waiting for response to message: " +
+                                       request.message_id)
+
+    @property
+    def hedge_count(self):
+        """
+        The number of hedges (copies of slow requests) which have been sent
+        """
+        return self._hedge_count
+
+    @property
+    def hedge_win_count(self):
+        """
+        The number of hedged requests whose first response was received for a hedge rather than
+        for the original request
+        """
+        return self._hedge_win_count
+
+    def _get_cached_response_callback(self, cache, request, response_callback):
+        """
+        Delivers the cached response to an asynchronous request (if any), or returns the callback
+        which caches the response to the request.
+        :param cache: The response cache for the destination topic of the request
+        :param request: The request
+        :param response_callback: The callback to be invoked when the response is received
+        :return: The callback to register for the request, or ``None`` if the cached response
+            was delivered
+        """
+        key = cache.get_key(request)
+        response_function = None if response_callback is None \
+            else self._get_response_function(response_callback)
+        response = cache.get(key)
+        if response is not None:
+            if response_function is not None:
+                self.client._add_local_task(response_function, response)
+            return None
+        generation = cache.generation
+
+        def on_response(response):
+            """Caches the response, and invokes the callback"""
+            if not isinstance(response, ErrorResponse):
+                cache.put(key, response, generation)
+            if response_function is not None:
+                response_function(response)
+        return on_response
+
+    def request_future(self, request, timeout=None):
+        """
+        Performs an asynchronous request via the DXL fabric, returning a future for its response
+        :param request: The request
+        :param timeout: The time (in seconds) after which the request expires if no response
+            has been received (``None`` for no timeout)
+        :return: The :class:`dxlclient.future.DxlFuture` which is completed with the response.
+            The future fails with a :class:`dxlclient.exceptions.WaitTimeoutException` if the
+            request expires.
+        """
+        future = DxlFuture()
+
+        def on_response(response):
+            """Completes the future with the response"""
+            if _is_timeout_response(response):
+                future.set_exception(WaitTimeoutException(
+                    "Timeout waiting for response to message: " + request.message_id))
+            else:
+                future.set_result(response)
+
+        self.async_request(request, on_response, timeout)
+        return future
+
+    def gather(self, requests, required, timeout=None):
+        """
+        Performs asynchronous requests via the DXL fabric, and waits (on the current thread)
+        until the specified number of responses have been received
+        :param requests: The requests
+        :param required: The number of responses to wait for
+        :param timeout: The maximum time to wait (in seconds), which is also used as the timeout
+            of each of the requests (``None`` to wait indefinitely)
+        :return: The list of the responses which have been received (``None`` for the requests
+            which have not received a response yet), in the order of the requests
+        """
+        requests = list(requests)
+        responses = [None] * len(requests)
+        if not required:
+            return responses
+        completed = DxlFuture()
+        lock = threading.Lock()
+        received = [0]
+
+        def response_receiver(index):
+            """Returns the function which receives the response to a request"""
+            def on_response(response):
+                """Records the response, and completes the wait if enough have been received"""
+                if _is_timeout_response(response):
+                    return
+                with lock:
+                    responses[index] = response
+                    received[0] += 1
+                    if received[0] >= required:
+                        completed.set_result(None)
+            return on_response
+
+        for index, request in enumerate(requests):
+            self.async_request(request, response_receiver(index), timeout)
+        try:
+            completed.result(timeout)
+        except (WaitTimeoutException, futures.TimeoutError):
+            raise WaitTimeoutException(
+                "Timeout waiting for " + str(required) + " of the responses to " +
+                str(len(requests)) + " requests")
+        finally:
+            with lock:
+                gathered = list(responses)
+            # The responses to the other requests are no longer needed
+            for request, response in zip(requests, gathered):
+                if response is None:
+                    self._abandon_async_request(request.message_id)
+        return gathered
+
+    def _cancel_request_timeout(self, message_id):
+        """
+        Cancels the timeout of the specified request (if any).
+        :param message_id: The request message identifier
+        :return: None
+        """
+        timeout = self.request_timeouts.pop(message_id, None)
+        if timeout is not None:
+            timeout.cancel()
+
+    def _on_request_timeout(self, request):
+        """
+        Invoked (on the timer thread of the client) when the timeout of an
+        asynchronous request has elapsed. If the request is still pending, a
+        timeout error response is delivered to it via the default executor of
+        the client, as if it had been received.
+        :param request: The request
+        :return: None
+        """
+        message_id = request.message_id
+        if self.request_timeouts.pop(message_id, None) is None:
+            # The response has been received
+            return
+        client = self.client
+        if client:
+            client._add_local_task(
+                self._on_request_expired,
+                ErrorResponse(request, ErrorResponse.TIMEOUT_ERROR_CODE,
+                              "Timeout waiting for response to request"))
+
+    def _on_request_expired(self, response):
+        """
+        Delivers the timeout error response of an expired asynchronous request (invoked via
+        the default executor of the client). The request only counts as expired if the error
+        response is delivered to its callback, since the actual response may have been
+        received after the timeout elapsed.
+        :param response: The timeout error response
+        :return: None
+        """
+        message_id = response.request_message_id
+        try:
+            callback = self.unregister_async_callback(message_id)
+            if callback is not None:
+                with self._expired_request_count_lock:
+                    self._expired_request_count += 1
+                logger.debug("Request %s expired without receiving a response", message_id)
+                callback(response)
+        finally:
+            self.remove_current_request(message_id)
+            self._release_limit(message_id)
+
+    @property
+    def expired_request_count(self):
+        """
+        The number of asynchronous requests which have expired without receiving a response
+        """
+        return self._expired_request_count
+
     def register_wait_for_response(self, request):
         """
         Indicates to the request manager that you are about to wait for the specified
@@ -147,8 +729,7 @@ class RequestManager(ResponseCallback):
         :param request: The request that is about to be waited for.
         :return: None
         """
-        with self.sync_wait_message_lock:
-            self.sync_wait_message_ids.add(request.message_id)
+        self.sync_waiters[request.message_id] = DxlFuture()
 
 
     def unregister_wait_for_response(self, request):
@@ -159,33 +740,43 @@ class RequestManager(ResponseCallback):
         :param request: The request that should no longer be waited for
         :return: None
         """
-        with self.sync_wait_message_lock:
-            if request.message_id in self.sync_wait_message_ids:
-                self.sync_wait_message_ids.remove(request.message_id)
-            if request.message_id in self.sync_wait_message_responses:
-                del self.sync_wait_message_responses[request.message_id]
+        self.sync_waiters.pop(request.message_id, None)
 
     def register_async_callback(self, request, response_callback):
         """
         Registers an asynchronous callback for the specified request
         :param request: The request
-        :param response_callback: The callback to invoke when the response to request is received.
+        :param response_callback: The callback to invoke when the response to request is received
+            (a :class:`dxlclient.callbacks.ResponseCallback` or a plain function). It is stored as the
+            function which receives the response.
         :return: None
         """
-        self.callback_map[request.message_id] = response_callback
+        self.callback_map[request.message_id] = \
+            self._get_response_function(response_callback)
+
+    @staticmethod
+    def _get_response_function(response_callback):
+        """
+        Returns the function which delivers responses to the specified callback
+        :param response_callback: A :class:`dxlclient.callbacks.ResponseCallback` or a plain function
+        :return: The function which accepts the response
+        """
+        if isinstance(response_callback, ResponseCallback):
+            return response_callback.on_response
+        if callable(response_callback):
+            return _resolve_function(response_callback)
+        raise ValueError("Type mismatch on callback argument")
 
     def unregister_async_callback(self, message_id):
         """
         Removes an asynchronous callback for the specified request
         :param message_id: The identifier for the request
-        :return: The response callback or None, if not available
+        :return: The function which receives the response or None, if not available
         """
-        if message_id in self.callback_map:
-            response_callback = self.callback_map[message_id]
-            del self.callback_map[message_id]
-        else:
-            response_callback = None
-        return response_callback
+        # A single atomic operation, so that concurrent attempts (for example,
+        # a response racing with a send failure) hand the callback to only one
+        # of the callers
+        return self.callback_map.pop(message_id, None)
 
     def _get_async_callback_count(self):
         """
@@ -197,44 +788,37 @@ class RequestManager(ResponseCallback):
     def wait_for_response(self, request, wait):
         """
         Waits for a response to the specified request up to the specified wait time
-        in milliseconds.
+        (in seconds).
         :param request: The request for which to wait for the response
         :param wait: The maximum time to wait for the request
         :return: The Response object
         """
         message_id = request.message_id
-
-        with self.sync_wait_message_lock:
-            wait_seconds = wait
-            wait_start = time.time()
-
-            while not message_id in self.sync_wait_message_responses:
-                self.sync_wait_message_condition.wait(wait_seconds)
-                if (time.time() - wait_start) >= wait_seconds:
-                    raise WaitTimeoutException("Timeout waiting for response to message: " + message_id)
-
-            response = self.sync_wait_message_responses[message_id]
-            del self.sync_wait_message_responses[message_id]
-
-        return response
+        # A request which was not registered (see register_wait_for_response())
+        # can only time out
+        future = self.sync_waiters.get(message_id) or DxlFuture()
+        try:
+            return future.result(wait)
+        except (WaitTimeoutException, futures.TimeoutError):
+            raise WaitTimeoutException("Timeout waiting for response to message: " + message_id)
 
     def on_response(self, response):
         """
         Invoked when an Response has been received.
         """
         request_message_id = response.request_message_id
+        self._cancel_request_timeout(request_message_id)
         try:
             # Check for synchronous waits
-            with self.sync_wait_message_lock:
-                if request_message_id in self.sync_wait_message_ids:
-                    self.sync_wait_message_ids.remove(request_message_id)
-                    self.sync_wait_message_responses[request_message_id] = response
-                    self.sync_wait_message_condition.notifyAll()
+            future = self.sync_waiters.get(request_message_id)
+            if future is not None:
+                future.set_result(response)
 
             # Check for asynchronous callbacks
             callback = self.unregister_async_callback(request_message_id)
             if not callback is None:
-                callback.on_response(response)
+                callback(response)
         finally:
             # Remove from set of current requests
             self.remove_current_request(request_message_id)
+            self._release_limit(request_message_id)
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2018 McAfee LLC - All Rights Reserved.
+################################################################################
+
+"""
+Contains the :class:`ResponseCache` class, a thread-safe cache of the responses
+to requests sent to a service topic.
+"""
+
+from __future__ import absolute_import
+from collections import OrderedDict
+import threading
+
+from dxlclient._compat import monotonic
+
+
+class ResponseCache(object):
+    """
+    Thread-safe cache of responses which expire after a time-to-live. When the
+    cache exceeds its maximum number of entries (or total payload size), the
+    least recently used entries are evicted.
+    """
+
+    def __init__(self, ttl, max_entries, key_function, max_bytes=None):
+        """
+        Constructor parameters:
+
+        :param ttl: The time (in seconds) that a response remains in the cache
+        :param max_entries: The maximum number of responses
+        :param key_function: The function which returns the cache key for a
+            request
+        :param max_bytes: The maximum total size (in bytes) of the payloads of
+            the responses (``None`` for no limit)
+        """
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._key_function = key_function
+        # Tuples of (response, expiry time, size), by key
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._hit_count = 0
+        self._miss_count = 0
+        # Incremented each time the cache is invalidated, so that responses to
+        # requests which were sent before an invalidation are not stored
+        self._generation = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_count(self):
+        """
+        The number of lookups which were served from the cache
+        """
+        return self._hit_count
+
+    @property
+    def miss_count(self):
+        """
+        The number of lookups which were not served from the cache
+        """
+        return self._miss_count
+
+    @property
+    def generation(self):
+        """
+        The number of times that the cache has been invalidated (see
+        :func:`put`)
+        """
+        return self._generation
+
+    def get_key(self, request):
+        """
+        Returns the cache key for the specified request.
+
+        :param request: The request
+        :return: The key
+        """
+        return self._key_function(request)
+
+    def get(self, key):
+        """
+        Returns the response for the specified key (marking the entry as the
+        most recently used), or ``None`` if the cache does not contain an
+        unexpired response for the key.
+
+        :param key: The key
+        :return: The response
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None or entry[1] <= monotonic():
+                if entry is not None:
+                    self._size -= entry[2]
+                self._miss_count += 1
+                return None
+            self._entries[key] = entry
+            self._hit_count += 1
+            return entry[0]
+
+    def put(self, key, response, generation=None):
+        """
+        Stores the response for the specified key, evicting the least recently
+        used entries if the cache is full.
+
+        :param key: The key
+        :param response: The response
+        :param generation: The :attr:`generation` of the cache when the
+            request was sent. The response is not stored if the cache has been
+            invalidated since.
+        """
+        size = len(response.payload or b"")
+        if self._max_bytes is not None and size > self._max_bytes:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[2]
+            self._entries[key] = (response, monotonic() + self._ttl, size)
+            self._size += size
+            while len(self._entries) > self._max_entries or \
+                    (self._max_bytes is not None and self._size > self._max_bytes):
+                self._size -= self._entries.popitem(last=False)[1][2]
+
+    def clear(self):
+        """
+        Removes all of the responses.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self._generation += 1
+
+    def invalidate(self, event):
+        """
+        Removes all of the responses when a change notification event is
+        received (registered as an event callback with the client).
+
+        :param event: The event
+        """
+        del event  # unused
+        self.clear()
@@ -9,13 +9,14 @@ concurrent processing of incoming DXL messages by registered callbacks.
 """
 
 from __future__ import absolute_import
-from threading import Thread
+from threading import Condition, Thread
 import logging
 
-from dxlclient import _BaseObject, _ObjectTracker
+from dxlclient import _ObjectTracker
 from dxlclient._uuid_generator import UuidGenerator
+from dxlclient.executor import MessageExecutor
 
-from ._compat import Queue
+from ._compat import Queue, Full
 
 logger = logging.getLogger(__name__)
 
@@ -25,15 +26,23 @@ class ThreadPoolWorker(Thread):
     Thread executing tasks from a given tasks queue.
     """
 
-    def __init__(self, tasks, thread_prefix):
+    def __init__(self, tasks, thread_prefix, release_bytes=None):
         """
         Constructs a ThreadPoolWorker.
+
+        :param tasks: The queue of tasks
+        :param thread_prefix: The prefix for the name of the thread
+        :param release_bytes: Optional function to invoke with the size (in
+            bytes) of each task which is removed from the queue
         """
         Thread.__init__(self)
 
         _ObjectTracker.get_instance().obj_constructed(self)
 
         self.tasks = tasks
+        self.release_bytes = release_bytes
+        # Whether the worker is currently running a task
+        self.busy = False
         self.daemon = True
         self.name = thread_prefix + "-" + UuidGenerator.generate_id_as_string()
         self.start()
@@ -46,37 +55,168 @@ class ThreadPoolWorker(Thread):
         Runs the worker.
         """
         while True:
-            func, args, kargs = self.tasks.get()
+            func, args, kargs, size = self.tasks.get()
+            if size and self.release_bytes:
+                self.release_bytes(size)
             try:
                 if func is None:
                     # Exit the thread
                     return
+                self.busy = True
                 func(*args, **kargs)
             except Exception:  # pylint: disable=broad-except
                 logger.exception("Error in worker thread")
+            finally:
+                self.busy = False
             del func
             self.tasks.task_done()
 
 
-class ThreadPool(_BaseObject):
+class ThreadPool(MessageExecutor):
     """
-    Pool of threads consuming tasks from a queue.
+    Pool of threads consuming tasks from a queue (the default
+    :class:`dxlclient.executor.MessageExecutor` used by the client).
     """
 
-    def __init__(self, queue_size, num_threads, thread_prefix):
+    def __init__(self, queue_size, num_threads, thread_prefix,
+                 discard_when_full=False, max_queued_bytes=None):
         """
         Creates a ThreadPool.
+
+        :param queue_size: The maximum number of queued tasks
+        :param num_threads: The number of worker threads
+        :param thread_prefix: The prefix for the names of the worker threads
+        :param discard_when_full: Whether tasks should be discarded (rather
+            than blocking the caller) when the queue is full
+        :param max_queued_bytes: The maximum total size (in bytes) of the
+            queued tasks (see :func:`add_sized_task`), or ``None`` for no limit
         """
         super(ThreadPool, self).__init__()
+        self._discard_when_full = discard_when_full
+        # The number of tasks which were discarded due to the queue being full
+        self._discarded_task_count = 0
+        self._max_queued_bytes = max_queued_bytes
+        # The total size of the queued tasks, and its highest value
+        self._queued_bytes = 0
+        self._peak_queued_bytes = 0
+        self._queued_bytes_condition = Condition()
         self._tasks = Queue(queue_size)
         self._threads = []
         for _ in range(num_threads):
-            t = ThreadPoolWorker(self._tasks, thread_prefix)
+            t = ThreadPoolWorker(self._tasks, thread_prefix,
+                                 self._release_bytes)
             self._threads.append(t)
 
+    @property
+    def thread_count(self):
+        """
+        The number of worker threads
+        """
+        return len(self._threads)
+
+    @property
+    def busy_thread_count(self):
+        """
+        The number of worker threads which are currently running a task
+        """
+        return sum(1 for t in self._threads if t.busy)
+
+    @property
+    def queued_task_count(self):
+        """
+        The (approximate) number of tasks waiting in the queue
+        """
+        return self._tasks.qsize()
+
+    @property
+    def queued_bytes(self):
+        """
+        The total size (in bytes) of the tasks waiting in the queue
+        """
+        return self._queued_bytes
+
+    @property
+    def peak_queued_bytes(self):
+        """
+        The highest total size (in bytes) of the tasks waiting in the queue
+        """
+        return self._peak_queued_bytes
+
+    @property
+    def discarded_task_count(self):
+        """
+        The number of tasks which were discarded due to the queue being full
+        (only applicable when ``discard_when_full`` is set)
+        """
+        return self._discarded_task_count
+
     def add_task(self, func, *args, **kargs):
         """Add a task to the queue"""
-        self._tasks.put((func, args, kargs))
+        self.add_sized_task(0, func, *args, **kargs)
+
+    def add_sized_task(self, size, func, *args, **kargs):
+        """
+        Add a task of the specified size (in bytes) to the queue. When the
+        queued tasks would exceed the maximum total size, the caller is blocked
+        until enough space is available (or the task is discarded, if
+        ``discard_when_full`` is set). A task which by itself exceeds the
+        maximum is queued once the queue is empty.
+        """
+        if func is None:
+            size = 0
+        if size and not self._reserve_bytes(size):
+            self._discarded_task_count += 1
+            logger.debug("Thread pool queued bytes limit reached, discarding task")
+            return
+        if self._discard_when_full and func is not None:
+            try:
+                self._tasks.put_nowait((func, args, kargs, size))
+            except Full:
+                self._release_bytes(size)
+                self._discarded_task_count += 1
+                logger.debug("Thread pool queue is full, discarding task")
+        else:
+            self._tasks.put((func, args, kargs, size))
+
+    def try_add_task(self, func, *args, **kargs):
+        """Add a task to the queue if the queue is not full"""
+        try:
+            self._tasks.put_nowait((func, args, kargs, 0))
+        except Full:
+            return False
+        return True
+
+    def _reserve_bytes(self, size):
+        """
+        Reserves the specified number of bytes of the queued bytes budget.
+
+        :param size: The number of bytes
+        :return: True if the bytes were reserved; False if the task should be
+            discarded
+        """
+        with self._queued_bytes_condition:
+            max_queued_bytes = self._max_queued_bytes
+            if max_queued_bytes is not None:
+                while self._queued_bytes and \
+                        self._queued_bytes + size > max_queued_bytes:
+                    if self._discard_when_full:
+                        return False
+                    self._queued_bytes_condition.wait()
+            self._queued_bytes += size
+            if self._queued_bytes > self._peak_queued_bytes:
+                self._peak_queued_bytes = self._queued_bytes
+            return True
+
+    def _release_bytes(self, size):
+        """
+        Releases the specified number of bytes of the queued bytes budget
+        (invoked when a task is removed from the queue).
+
+        :param size: The number of bytes
+        """
+        with self._queued_bytes_condition:
+            self._queued_bytes -= size
+            self._queued_bytes_condition.notify_all()
 
     def wait_completion(self):
         """Wait for completion of all the tasks in the queue"""
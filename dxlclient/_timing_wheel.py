@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2018 McAfee LLC - All Rights Reserved.
+################################################################################
+
+"""
+Contains the :class:`TimingWheel` class, a shared timer which runs large
+numbers of timeouts with constant cost per timeout.
+"""
+
+from __future__ import absolute_import
+import logging
+import math
+import threading
+
+from dxlclient import _BaseObject
+from dxlclient._compat import monotonic
+
+logger = logging.getLogger(__name__)
+
+
+class _Timeout(object):
+    """
+    A timeout which has been scheduled with a :class:`TimingWheel`.
+    """
+    __slots__ = ["wheel", "bucket", "rounds", "func", "args"]
+
+    def __init__(self, wheel, bucket, rounds, func, args):
+        self.wheel = wheel
+        # The index of the bucket which contains the timeout
+        self.bucket = bucket
+        # The number of revolutions of the wheel before the timeout expires
+        self.rounds = rounds
+        self.func = func
+        self.args = args
+
+    def cancel(self):
+        """
+        Cancels the timeout (if it has not expired yet).
+        """
+        self.wheel._cancel(self)  # pylint: disable=protected-access
+
+
+class TimingWheel(_BaseObject):
+    """
+    Hashed timing wheel. Timeouts are placed in the bucket for the tick at which
+    they expire (modulo the number of buckets), so scheduling and cancelling a
+    timeout are constant time operations. A single thread advances the wheel
+    one bucket per tick and runs the expired timeouts, so the functions of the
+    timeouts should be short.
+
+    Timeouts never expire early, and expire up to one tick late. The thread is
+    started when the first timeout is scheduled.
+    """
+
+    def __init__(self, tick=0.1, bucket_count=512, name="DxlTimingWheel"):
+        """
+        Constructor parameters:
+
+        :param tick: The duration of a tick (in seconds)
+        :param bucket_count: The number of buckets
+        :param name: The name of the thread
+        """
+        super(TimingWheel, self).__init__()
+        self._tick = tick
+        self._buckets = [set() for _ in range(bucket_count)]
+        # The index of the bucket which is processed at the next tick
+        self._cursor = 0
+        # The (monotonic) time of the next tick (None until the thread starts)
+        self._next_tick = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._name = name
+
+    @property
+    def tick(self):
+        """
+        The duration of a tick (in seconds)
+        """
+        return self._tick
+
+    @property
+    def pending_count(self):
+        """
+        The number of timeouts which have been scheduled and have neither
+        expired nor been cancelled
+        """
+        with self._lock:
+            return sum(len(bucket) for bucket in self._buckets)
+
+    def schedule(self, delay, func, *args):
+        """
+        Schedules the specified function to be invoked once the specified
+        delay has elapsed.
+
+        :param delay: The delay (in seconds)
+        :param func: The function to invoke
+        :param args: The arguments to invoke the function with
+        :return: The timeout (which provides a ``cancel()`` method)
+        """
+        bucket_count = len(self._buckets)
+        with self._lock:
+            if self._stop_event.is_set():
+                raise RuntimeError("Timing wheel has been stopped")
+            now = monotonic()
+            start_thread = self._thread is None
+            if start_thread:
+                self._next_tick = now + self._tick
+            # The time until the bucket at the cursor is processed (a full
+            # tick if the wheel is advanced manually)
+            until_cursor = self._tick if self._next_tick is None \
+                else self._next_tick - now
+            # The number of ticks after the next one at which the timeout
+            # expires, so that it never expires before its delay
+            ticks = max(0, int(math.ceil(
+                (delay - until_cursor) / float(self._tick))))
+            bucket = (self._cursor + ticks) % bucket_count
+            timeout = _Timeout(self, bucket, ticks // bucket_count, func, args)
+            self._buckets[bucket].add(timeout)
+            if start_thread:
+                self._thread = threading.Thread(target=self._run,
+                                                name=self._name)
+                self._thread.daemon = True
+                self._thread.start()
+        return timeout
+
+    def _cancel(self, timeout):
+        """
+        Cancels the specified timeout.
+
+        :param timeout: The timeout
+        """
+        with self._lock:
+            self._buckets[timeout.bucket].discard(timeout)
+
+    def stop(self):
+        """
+        Stops the thread. Timeouts which have not expired yet are discarded.
+        """
+        with self._lock:
+            self._stop_event.set()
+            thread = self._thread
+            for bucket in self._buckets:
+                bucket.clear()
+        if thread and thread.is_alive() and \
+                thread is not threading.current_thread():
+            thread.join()
+
+    def _run(self):
+        """
+        Runs the thread which advances the wheel.
+        """
+        while not self._stop_event.is_set():
+            delay = self._next_tick - monotonic()
+            if delay > 0:
+                self._stop_event.wait(delay)
+                continue
+            for timeout in self._advance():
+                try:
+                    timeout.func(*timeout.args)
+                except Exception:  # pylint: disable=broad-except
+                    logger.exception("Error in timing wheel timeout")
+
+    def _advance(self):
+        """
+        Advances the wheel by one tick.
+
+        :return: The list of timeouts which expired
+        """
+        with self._lock:
+            bucket = self._buckets[self._cursor]
+            self._cursor = (self._cursor + 1) % len(self._buckets)
+            if self._next_tick is not None:
+                self._next_tick += self._tick
+            expired = []
+            for timeout in bucket:
+                if timeout.rounds:
+                    timeout.rounds -= 1
+                else:
+                    expired.append(timeout)
+            for timeout in expired:
+                bucket.discard(timeout)
+            return expired
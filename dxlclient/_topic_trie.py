@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2018 McAfee LLC - All Rights Reserved.
+################################################################################
+
+"""
+Contains the :class:`TopicTrie` class, an index of wildcard topics used to
+determine the wildcards which match a topic.
+
+Two kinds of wildcards are supported:
+
+- Multi-level wildcards end with ``#`` (``/a/b/#``), and match any topic which
+  begins with the segments that precede it.
+- Single-level wildcards contain one or more ``+`` segments (``/a/+/c``). Each
+  ``+`` matches exactly one segment of a topic. A wildcard may contain both
+  kinds (``/a/+/#``).
+"""
+
+from __future__ import absolute_import
+
+from dxlclient._dxl_utils import DxlUtils
+
+
+class _TopicTrieNode(object):
+    """
+    A node of a :class:`TopicTrie`. Nodes are never modified once they are
+    reachable from a published trie.
+    """
+    __slots__ = ["children", "wildcard", "pattern"]
+
+    def __init__(self, children=None, wildcard=None, pattern=None):
+        # The child nodes by topic segment ("+" for single-level wildcards)
+        self.children = children if children is not None else {}
+        # The multi-level wildcard which ends at this node (if any)
+        self.wildcard = wildcard
+        # The single-level wildcard which ends at this node (if any)
+        self.pattern = pattern
+
+    def copy(self):
+        """
+        Returns a shallow copy of the node.
+        """
+        return _TopicTrieNode(self.children.copy(), self.wildcard, self.pattern)
+
+    def is_empty(self):
+        """
+        Returns whether the node has neither children nor wildcards.
+        """
+        return not self.children and self.wildcard is None and \
+            self.pattern is None
+
+
+class TopicTrie(object):
+    """
+    Immutable index of wildcard topics (topics ending with ``/#``, ``#``, or
+    containing ``+`` segments), organized by topic segment. The wildcards which
+    match a topic are determined with a single walk over the segments of the
+    topic (following both the matching segment and the ``+`` segment at each
+    level), without enumerating candidate wildcard strings. For multi-level
+    wildcards this produces the same wildcards, in the same order, as
+    :func:`dxlclient._dxl_utils.DxlUtils._get_wildcards`.
+
+    The :func:`add` and :func:`remove` methods return a new trie (sharing the
+    unchanged nodes with the original one), so a trie may be read by any
+    number of threads without locking.
+    """
+
+    def __init__(self, root=None):
+        self._root = root if root is not None else _TopicTrieNode()
+
+    @staticmethod
+    def _get_path(wildcard):
+        """
+        Returns the segments which lead to the node for the specified wildcard.
+
+        :param wildcard: The wildcard
+        :return: A tuple containing the list of segments and whether the
+            wildcard is a multi-level wildcard, or ``None`` if the specified
+            topic is not a wildcard
+        """
+        if wildcard == "#":
+            return [], True
+        if wildcard.endswith("/#"):
+            return wildcard[:-2].split("/"), True
+        segments = wildcard.split("/")
+        if "+" in segments:
+            return segments, False
+        return None
+
+    @staticmethod
+    def is_wildcard(topic):
+        """
+        Returns whether the specified topic is a wildcard which can be added to
+        a trie.
+
+        :param topic: The topic
+        :return: True if the topic is a wildcard; False otherwise
+        """
+        return TopicTrie._get_path(topic) is not None
+
+    @staticmethod
+    def validate(topic):
+        """
+        Validates the placement of the ``+`` wildcards in the specified topic
+        (each must occupy an entire segment).
+
+        :param topic: The topic
+        :raise ValueError: If the topic contains an invalid ``+`` wildcard
+        """
+        if "+" in topic:
+            for segment in topic.split("/"):
+                if "+" in segment and segment != "+":
+                    raise ValueError(
+                        "Invalid '+' wildcard in topic (must occupy an entire "
+                        "topic level): " + topic)
+
+    def is_empty(self):
+        """
+        Returns whether the trie does not contain any wildcards.
+        """
+        return self._root.is_empty()
+
+    def add(self, wildcard):
+        """
+        Returns a trie which contains the specified wildcard in addition to the
+        wildcards of this trie.
+
+        :param wildcard: The wildcard to add
+        :return: The new trie
+        """
+        path_info = self._get_path(wildcard)
+        if path_info is None:
+            raise ValueError("Not a wildcard topic: " + wildcard)
+        path, multi_level = path_info
+        root = self._root.copy()
+        node = root
+        for segment in path:
+            child = node.children.get(segment)
+            child = child.copy() if child else _TopicTrieNode()
+            node.children[segment] = child
+            node = child
+        if multi_level:
+            node.wildcard = wildcard
+        else:
+            node.pattern = wildcard
+        return TopicTrie(root)
+
+    def remove(self, wildcard):
+        """
+        Returns a trie which contains the wildcards of this trie except for the
+        specified wildcard.
+
+        :param wildcard: The wildcard to remove
+        :return: The new trie
+        """
+        path_info = self._get_path(wildcard)
+        if path_info is None:
+            return self
+        path, multi_level = path_info
+        # Find the nodes along the path
+        nodes = [self._root]
+        for segment in path:
+            child = nodes[-1].children.get(segment)
+            if child is None:
+                return self
+            nodes.append(child)
+        if (nodes[-1].wildcard if multi_level else nodes[-1].pattern) is None:
+            return self
+        # Copy the nodes along the path (in reverse), pruning empty nodes
+        node = nodes[-1].copy()
+        if multi_level:
+            node.wildcard = None
+        else:
+            node.pattern = None
+        for index in range(len(path) - 1, -1, -1):
+            parent = nodes[index].copy()
+            if not node.is_empty():
+                parent.children[path[index]] = node
+            else:
+                del parent.children[path[index]]
+            node = parent
+        return TopicTrie(node)
+
+    def get_wildcards(self, topic):
+        """
+        Returns the wildcards in the trie which match the specified topic,
+        ordered from the most specific to the least specific: single-level
+        wildcards which match the entire topic, followed by the multi-level
+        wildcards from the longest to the shortest. Wildcards with the same
+        number of segments are ordered by the position of their first ``+``
+        (later first).
+
+        :param topic: The topic
+        :return: The list of matching wildcards
+        """
+        root = self._root
+        if topic.endswith("#"):
+            # A wildcard topic, which does not match itself (rare)
+            return [wildcard for wildcard in DxlUtils._get_wildcards(topic)
+                    if self._contains(wildcard)]
+
+        segments = topic.split("/")
+        last_index = len(segments) - 1
+        # The multi-level wildcards which match, by number of segments
+        wildcards_by_level = []
+        nodes = [root]
+        for index, segment in enumerate(segments):
+            next_nodes = []
+            for node in nodes:
+                child = node.children.get(segment)
+                if child is not None:
+                    next_nodes.append(child)
+                child = node.children.get("+")
+                if child is not None:
+                    next_nodes.append(child)
+            nodes = next_nodes
+            if not nodes:
+                break
+            # A multi-level wildcard only matches topics which have additional
+            # segments
+            if index < last_index:
+                level_wildcards = [node.wildcard for node in nodes
+                                   if node.wildcard is not None]
+                if level_wildcards:
+                    wildcards_by_level.append(level_wildcards)
+
+        # Single-level wildcards which match the entire topic
+        wildcards = [node.pattern for node in nodes if node.pattern is not None]
+        for level_wildcards in reversed(wildcards_by_level):
+            wildcards.extend(level_wildcards)
+        # The "/#" wildcard also matches topics which do not begin with "/"
+        if segments[0]:
+            node = root.children.get("")
+            if node is not None and node.wildcard is not None:
+                wildcards.append(node.wildcard)
+        if root.wildcard is not None:
+            wildcards.append(root.wildcard)
+        return wildcards
+
+    def _contains(self, wildcard):
+        """
+        Returns whether the trie contains the specified wildcard.
+
+        :param wildcard: The wildcard
+        :return: True if the trie contains the wildcard; False otherwise
+        """
+        path_info = self._get_path(wildcard)
+        if path_info is None:
+            return False
+        path, multi_level = path_info
+        node = self._root
+        for segment in path:
+            node = node.children.get(segment)
+            if node is None:
+                return False
+        return (node.wildcard if multi_level else node.pattern) is not None
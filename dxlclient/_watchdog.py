@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2018 McAfee LLC - All Rights Reserved.
+################################################################################
+
+"""
+Contains the :class:`_Watchdog` class, which reports incoming message callbacks
+that exceed their time budget, thread pools which are stalled, and a network
+thread which is blocked while queueing incoming messages.
+"""
+
+from __future__ import absolute_import
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from dxlclient import _BaseObject
+
+logger = logging.getLogger(__name__)
+
+
+class _Activity(object):
+    """
+    A unit of work (the processing of an incoming message, or the queueing of
+    one) which is being performed by a thread and monitored by the watchdog.
+    """
+    __slots__ = ["thread", "description", "topic", "callback", "start",
+                 "reported"]
+
+    def __init__(self, thread, description, topic):
+        self.thread = thread
+        self.description = description
+        self.topic = topic
+        self.callback = None
+        self.start = time.time()
+        self.reported = False
+
+
+class _Watchdog(_BaseObject):
+    """
+    Monitors the threads which process (and queue) incoming messages.
+
+    Activities are registered by the threads which perform them (see
+    :func:`activity_started`). A background thread periodically checks the
+    registered activities and logs a warning, including a snapshot of the
+    stack of the offending thread, for each activity which has exceeded the
+    threshold. It also logs a warning when all of the threads of a monitored
+    thread pool are busy and its queue is growing.
+    """
+
+    def __init__(self, threshold, name="DxlWatchdog"):
+        """
+        Constructor parameters:
+
+        :param threshold: The time (in seconds) after which an activity is
+            reported
+        :param name: The name of the watchdog thread
+        """
+        super(_Watchdog, self).__init__()
+        self._threshold = threshold
+        # The current activity of each monitored thread, by thread identifier.
+        # Only the thread itself adds or removes its entry.
+        self._activities = {}
+        # The monitored thread pools, by name
+        self._pools = {}
+        # The queue size of each pool when it was last checked, by name
+        self._last_queue_sizes = {}
+        # The names of the pools which are currently reported as stalled
+        self._stalled_pools = set()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name)
+        self._thread.daemon = True
+
+    @property
+    def threshold(self):
+        """
+        The time (in seconds) after which an activity is reported
+        """
+        return self._threshold
+
+    def start(self):
+        """
+        Starts the watchdog thread.
+        """
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the watchdog thread.
+        """
+        self._stop_event.set()
+        if self._thread.is_alive() and \
+                self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def add_pool(self, name, pool):
+        """
+        Adds a thread pool to check for stalls. The pool must provide the
+        ``thread_count``, ``busy_thread_count`` and ``queued_task_count``
+        properties (see :class:`dxlclient._thread_pool.ThreadPool`).
+
+        :param name: The name of the pool (used when reporting)
+        :param pool: The pool
+        """
+        pools = self._pools.copy()
+        pools[name] = pool
+        self._pools = pools
+
+    def activity_started(self, description, topic=None):
+        """
+        Registers the start of an activity by the current thread.
+
+        :param description: A description of the activity
+        :param topic: The topic of the message associated with the activity
+        :return: The previous activity of the current thread (to be passed to
+            :func:`activity_finished`)
+        """
+        thread = threading.current_thread()
+        previous = self._activities.get(thread.ident)
+        self._activities[thread.ident] = _Activity(thread, description, topic)
+        return previous
+
+    def callback_started(self, callback):
+        """
+        Registers that the current activity of the current thread is invoking
+        the specified callback.
+
+        :param callback: The callback
+        """
+        activity = self._activities.get(threading.current_thread().ident)
+        if activity:
+            activity.callback = callback
+
+    def activity_finished(self, previous=None):
+        """
+        Registers the end of the current activity of the current thread.
+
+        :param previous: The activity returned by :func:`activity_started`
+        """
+        ident = threading.current_thread().ident
+        activity = self._activities.pop(ident, None)
+        if previous:
+            self._activities[ident] = previous
+        if activity and activity.reported:
+            logger.warning("%s completed after %.3f seconds%s",
+                           activity.description, time.time() - activity.start,
+                           self._describe_target(activity))
+
+    def _run(self):
+        """
+        Runs the watchdog thread.
+        """
+        interval = self._threshold / 2.0
+        while not self._stop_event.is_set():
+            self._stop_event.wait(interval)
+            try:
+                self.check()
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Error in watchdog thread")
+
+    def check(self):
+        """
+        Checks the monitored activities and thread pools (invoked periodically
+        by the watchdog thread).
+        """
+        now = time.time()
+        frames = None
+        for ident, activity in list(self._activities.items()):
+            if activity.reported or now - activity.start < self._threshold:
+                continue
+            activity.reported = True
+            if frames is None:
+                frames = sys._current_frames()  # pylint: disable=protected-access
+            frame = frames.get(ident)
+            stack = "".join(traceback.format_stack(frame)) if frame else ""
+            logger.warning(
+                "%s has been running for %.3f seconds on thread %s%s\n%s",
+                activity.description, now - activity.start,
+                activity.thread.name, self._describe_target(activity), stack)
+
+        for name, pool in self._pools.items():
+            queued = pool.queued_task_count
+            last_queued = self._last_queue_sizes.get(name, 0)
+            self._last_queue_sizes[name] = queued
+            stalled = pool.busy_thread_count >= pool.thread_count and \
+                queued > last_queued
+            if stalled and name not in self._stalled_pools:
+                self._stalled_pools.add(name)
+                logger.warning(
+                    "Thread pool %s is stalled: all %d threads are busy and "
+                    "%d tasks are queued", name, pool.thread_count, queued)
+            elif name in self._stalled_pools and \
+                    pool.busy_thread_count < pool.thread_count:
+                self._stalled_pools.discard(name)
+                logger.warning("Thread pool %s is no longer stalled", name)
+
+    @staticmethod
+    def _describe_target(activity):
+        """
+        Returns a description of the topic and callback of the activity.
+
+        :param activity: The activity
+        :return: The description
+        """
+        description = ""
+        if activity.topic is not None:
+            description += " (topic: " + activity.topic
+            if activity.callback is not None:
+                description += ", callback: " + repr(activity.callback)
+            description += ")"
+        return description
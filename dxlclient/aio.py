@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2018 McAfee LLC - All Rights Reserved.
+################################################################################
+
+"""
+An ``asyncio`` facade for :class:`dxlclient.client.DxlClient` (requires Python 3.5 or later).
+
+:class:`AsyncDxlClient` wraps a client and binds it to an event loop. Responses and events
+are handed from the client's threads to the loop without dedicating a thread to each pending
+request, so a single loop can drive any number of concurrent requests:
+
+.. code-block:: python
+
+    import asyncio
+
+    from dxlclient.aio import AsyncDxlClient
+    from dxlclient.client import DxlClient
+    from dxlclient.message import Request, Response
+    from dxlclient.service import ServiceRegistrationInfo
+
+    async def main(client):
+        aio_client = AsyncDxlClient(client)
+
+        response = await aio_client.request(Request("/mycompany/myservice"), timeout=10)
+
+        async def on_request(request):
+            ...
+            client.send_response(Response(request))
+
+        info = ServiceRegistrationInfo(client, "/mycompany/myservice")
+        info.add_topic("/mycompany/myservice", aio_client.coroutine_callback(on_request))
+
+        with aio_client.events("/mycompany/events") as events:
+            async for event in events:
+                print(event.payload)
+
+    with DxlClient(config) as client:
+        client.connect()
+        asyncio.get_event_loop().run_until_complete(main(client))
+"""
+
+from __future__ import absolute_import
+import asyncio
+import collections
+import threading
+
+from dxlclient._request_manager import _is_timeout_response
+from dxlclient.exceptions import WaitTimeoutException
+
+__all__ = ["AsyncDxlClient"]
+
+
+class _LoopBridge(object):
+    """
+    Hands calls from other threads to an event loop. Calls which are handed over before the
+    loop gets around to running them are batched into a single ``call_soon_threadsafe``
+    (which wakes up the loop).
+    """
+
+    def __init__(self, loop):
+        self._loop = loop
+        self._lock = threading.Lock()
+        self._pending = collections.deque()
+        self._scheduled = False
+
+    def call(self, func, *args):
+        """
+        Schedules the specified function to be invoked on the event loop (may be invoked from
+        any thread).
+
+        :param func: The function to invoke
+        :param args: The arguments to invoke the function with
+        """
+        with self._lock:
+            self._pending.append((func, args))
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._loop.call_soon_threadsafe(self._run_pending)
+
+    def _run_pending(self):
+        """
+        Runs the calls which have been handed over (on the event loop).
+        """
+        with self._lock:
+            pending = self._pending
+            self._pending = collections.deque()
+            self._scheduled = False
+        for func, args in pending:
+            func(*args)
+
+
+def _set_future_result(future, result):
+    """
+    Completes an ``asyncio`` future with the specified result (unless it has been cancelled).
+    """
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_future_exception(future, exception):
+    """
+    Completes an ``asyncio`` future with the specified exception (unless it has been
+    cancelled).
+    """
+    if not future.done():
+        future.set_exception(exception)
+
+
+class _EventStream(object):
+    """
+    Asynchronous iterator over the :class:`dxlclient.message.Event` messages received on a
+    topic (see :func:`AsyncDxlClient.events`). Events which have not been consumed yet are
+    buffered, up to the size of the queue. Events which are received while the queue is full
+    are discarded (see :attr:`discarded_count`).
+    """
+
+    def __init__(self, aio_client, topic, subscribe_to_topic, queue_size):
+        self._aio_client = aio_client
+        self._topic = topic
+        self._subscribe_to_topic = subscribe_to_topic
+        self._loop = aio_client.loop
+        # The events which have been received but not consumed
+        self._events = asyncio.Queue(queue_size)
+        # The number of events which were discarded because the queue was full
+        self._discarded_count = 0
+        # The futures of the consumers which are waiting for an event
+        self._waiters = collections.deque()
+        self._closed = False
+        # The callback registered with the client (the same bound method object must be used
+        # to remove it)
+        self._callback = self._on_event
+        aio_client.client.add_event_callback(topic, self._callback, subscribe_to_topic)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __aiter__(self):
+        return self
+
+    @property
+    def discarded_count(self):
+        """
+        The number of events which were discarded because the queue was full
+        """
+        return self._discarded_count
+
+    def __anext__(self):
+        future = self._loop.create_future()
+        if not self._events.empty():
+            future.set_result(self._events.get_nowait())
+        elif self._closed:
+            future.set_exception(StopAsyncIteration())
+        else:
+            self._waiters.append(future)
+        return future
+
+    def _on_event(self, event):
+        """
+        Receives an event (on a thread of the client).
+        """
+        self._aio_client._bridge.call(self._deliver, event)  # pylint: disable=protected-access
+
+    def _deliver(self, event):
+        """
+        Hands an event to a waiting consumer, or buffers it (on the event loop).
+        """
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(event)
+                return
+        if self._closed:
+            return
+        try:
+            self._events.put_nowait(event)
+        except asyncio.QueueFull:
+            self._discarded_count += 1
+
+    def close(self):
+        """
+        Stops receiving events. Pending and subsequent iterations end once the buffered events
+        have been consumed. Must be invoked on the event loop.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._aio_client.client.remove_event_callback(
+            self._topic, self._callback, self._subscribe_to_topic)
+        while self._waiters:
+            _set_future_exception(self._waiters.popleft(), StopAsyncIteration())
+
+
+class AsyncDxlClient(object):
+    """
+    ``asyncio`` facade for a :class:`dxlclient.client.DxlClient`, bound to an event loop. The
+    lifecycle of the client (connecting, disconnecting and destroying it) remains the
+    responsibility of the application.
+    """
+
+    def __init__(self, client, loop=None):
+        """
+        Constructor parameters:
+
+        :param client: The :class:`dxlclient.client.DxlClient`
+        :param loop: The event loop (defaults to the current event loop)
+        """
+        self._client = client
+        self._loop = loop or asyncio.get_event_loop()
+        self._bridge = _LoopBridge(self._loop)
+
+    @property
+    def client(self):
+        """
+        The underlying :class:`dxlclient.client.DxlClient`
+        """
+        return self._client
+
+    @property
+    def loop(self):
+        """
+        The event loop
+        """
+        return self._loop
+
+    def request(self, request, timeout=None):
+        """
+        Sends a :class:`dxlclient.message.Request` message to a remote DXL service. The returned
+        future is awaited for the :class:`dxlclient.message.Response` (or
+        :class:`dxlclient.message.ErrorResponse`). No thread is blocked while waiting.
+
+        :param request: The :class:`dxlclient.message.Request` message
+        :param timeout: An optional amount of time (in seconds) after which the request expires
+            if no response has been received, failing the future with a
+            :class:`dxlclient.exceptions.WaitTimeoutException`
+        :return: The ``asyncio`` future for the response. Cancelling the future abandons the
+            request.
+        """
+        future = self._loop.create_future()
+        bridge = self._bridge
+        client = self._client
+
+        def on_response(response):
+            """Hands the response to the event loop"""
+            if _is_timeout_response(response):
+                bridge.call(_set_future_exception, future, WaitTimeoutException(
+                    "Timeout waiting for response to message: " + request.message_id))
+            else:
+                bridge.call(_set_future_result, future, response)
+
+        def on_done(_):
+            """Abandons the request if the future was cancelled (on the event loop)"""
+            if future.cancelled():
+                client._cancel_async_request(request.message_id)  # pylint: disable=protected-access
+
+        self._client.async_request(request, on_response, timeout)
+        future.add_done_callback(on_done)
+        return future
+
+    def send_event(self, event):
+        """
+        Sends a :class:`dxlclient.message.Event` message. Events are not acknowledged, so the
+        returned future has already completed once the event has been handed to the fabric
+        connection.
+
+        :param event: The :class:`dxlclient.message.Event` message
+        :return: A completed ``asyncio`` future
+        """
+        future = self._loop.create_future()
+        try:
+            self._client.send_event(event)
+            future.set_result(None)
+        except Exception as ex:  # pylint: disable=broad-except
+            future.set_exception(ex)
+        return future
+
+    def events(self, topic, subscribe_to_topic=True, queue_size=1000):
+        """
+        Returns an asynchronous iterator over the :class:`dxlclient.message.Event` messages that
+        are received on the specified topic (which may contain wildcards). The iterator is also a
+        context manager; it should be closed when no more events are needed.
+
+        :param topic: The topic
+        :param subscribe_to_topic: Whether the client should subscribe to the topic (and
+            unsubscribe from it when the iterator is closed)
+        :param queue_size: The maximum number of events which are buffered until they are
+            consumed. Events which are received while the queue is full are discarded (and
+            counted by the ``discarded_count`` property of the iterator).
+        :return: The asynchronous iterator
+        """
+        return _EventStream(self, topic, subscribe_to_topic, queue_size)
+
+    def coroutine_callback(self, coroutine_function):
+        """
+        Returns a callback (for example, for
+        :func:`dxlclient.service.ServiceRegistrationInfo.add_topic` or
+        :func:`dxlclient.client.DxlClient.add_event_callback`) which runs the specified coroutine
+        function on the event loop for each message. The client's thread is released as soon as
+        the coroutine has been scheduled.
+
+        :param coroutine_function: The coroutine function, which accepts the message
+        :return: The callback
+        """
+        loop = self._loop
+
+        def schedule(message):
+            """Schedules the coroutine for the message on the event loop"""
+            asyncio.run_coroutine_threadsafe(coroutine_function(message), loop)
+        return schedule
@@ -13,7 +13,13 @@ class MessageCallback(_BaseObject):
     """
     Base class for the different callbacks
     """
-    pass
+
+    #: Callbacks registered as classes are instantiated for each message (default)
+    INSTANCE_PER_MESSAGE = "per_message"
+    #: A single instance is created for each callback registered as a class
+    INSTANCE_SHARED = "shared"
+    #: An instance is created per thread for each callback registered as a class
+    INSTANCE_PER_THREAD = "per_thread"
 
 class EventCallback(MessageCallback):
     """
@@ -9,25 +9,34 @@ communication with the Data Exchange Layer (DXL) fabric.
 """
 
 from __future__ import absolute_import
+from concurrent import futures
 import threading
 import logging
 import ssl
 import traceback
 import random
-import time
 
 import pahoproxy.client as mqtt
 from dxlclient import _BaseObject
 from dxlclient.client_config import DxlClientConfig
 import dxlclient._callback_manager as callback_manager
+from dxlclient._hedging import HedgingPolicy
+from dxlclient._limiter import SendLimiter, SendLimiters
 from dxlclient._request_manager import RequestManager
+from dxlclient._response_cache import ResponseCache
 from dxlclient.exceptions import DxlException
 from dxlclient.message import Message, Event, Request, Response, ErrorResponse
 from dxlclient._thread_pool import ThreadPool
+from dxlclient._topic_trie import TopicTrie
+from dxlclient._watchdog import _Watchdog
+from dxlclient.executor import MessageExecutor, FuturesMessageExecutor
+from dxlclient.future import DxlFuture
+from dxlclient._timing_wheel import TimingWheel
 from dxlclient.exceptions import WaitTimeoutException, NoBrokerSpecifiedError
 from dxlclient.service import _ServiceManager
 from dxlclient._uuid_generator import UuidGenerator
 from ._dxl_utils import DxlUtils
+from ._compat import iter_dict_items
 
 __all__ = [
     # Callbacks
@@ -47,6 +56,17 @@ DXL_ERR_SUCCESS = 0
 DXL_ERR_INVALID = 1
 DXL_ERR_INTERRUPT = 2
 
+
+def _completed_future():
+    """
+    Returns a :class:`dxlclient.future.DxlFuture` which has already completed
+    (with a result of ``None``).
+    """
+    future = DxlFuture()
+    future.set_result(None)
+    return future
+
+
 ################################################################################
 #
 # Callbacks
@@ -89,15 +109,14 @@ def _on_connect_run(client, userdata, rc): # pylint: disable=invalid-name
         logger.debug("Connected with result code %s", str(rc))
 
         # Subscribing in on_connect() means that if we lose the connection and
-        # reconnect then subscriptions will be renewed.
+        # reconnect then subscriptions will be renewed. The subscriptions are
+        # sent in multi-topic packets, and their acks awaited concurrently.
         with self._subscriptions_lock:
-            for subscription in self._subscriptions:
+            if self._subscriptions:
                 try:
-                    logger.debug("Subscribing to %s", subscription)
-                    result, mid = client.subscribe(subscription)
-                    self._wait_for_packet_ack(result, mid,
-                                              "subscription to " +
-                                              subscription)
+                    logger.debug("Subscribing to %d topics",
+                                 len(self._subscriptions))
+                    self._send_subscriptions(client, list(self._subscriptions))
                 except Exception as ex: # pylint: disable=broad-except
                     logger.error("Error during subscribe: %s", str(ex))
                     logger.debug(traceback.format_exc())
@@ -177,7 +196,7 @@ def _on_message(client, userdata, msg): # pylint: disable=invalid-name
     # TODO: execution.
 
     try:
-        self._thread_pool.add_task(self._handle_message, channel=msg.topic, payload=msg.payload)
+        self._dispatch_message(msg.topic, msg.payload)
     except Exception:  # pylint: disable=broad-except
         logger.exception("Error handling message")
 
@@ -314,6 +333,15 @@ class DxlClient(_BaseObject):
     # Maximum time to wait for a subscription / unsubscription packet to be
     # acked (in seconds)
     _MAX_PACKET_ACK_WAIT = 2 * 60
+    # Maximum number of topics to include in a single subscription packet
+    _MAX_TOPICS_PER_SUBSCRIBE = 100
+
+    # Wait for the responses to all of the requests (see gather())
+    GATHER_ALL = "all"
+    # Wait for the first response (see gather())
+    GATHER_FIRST = "first"
+    # Wait for a quorum of the responses (see gather())
+    GATHER_QUORUM = "quorum"
 
     def __init__(self, config):
         """
@@ -331,6 +359,12 @@ class DxlClient(_BaseObject):
         self._service_manager = None
         self._request_manager = None
         self._thread_pool = None
+        self._owns_thread_pool = False
+        self._named_executors = {}
+        # The names of the named executors which are owned by the client
+        self._owned_named_executors = set()
+        self._watchdog = None
+        self._timing_wheel = None
         self._client = None
 
         # The flag for the connection state
@@ -380,6 +414,9 @@ class DxlClient(_BaseObject):
         self._response_callbacks = callback_manager._ResponseCallbackManager()
         # The event callbacks manager
         self._event_callbacks = callback_manager._EventCallbackManager()
+        for callbacks in (self._request_callbacks, self._response_callbacks,
+                          self._event_callbacks):
+            callbacks.class_callback_instances = config.callback_class_instances
 
         # The current list of subscriptions
         self._subscriptions = set()
@@ -405,18 +442,25 @@ class DxlClient(_BaseObject):
         # Generate a message pool prefix
         self._message_pool_prefix = "DxlMessagePool-" + UuidGenerator.generate_id_as_string()
 
-        # The thread pool for message handling
-        self._thread_pool = ThreadPool(
-            num_threads=config.incoming_message_thread_pool_size,
-            queue_size=config.incoming_message_queue_size,
-            thread_prefix=self._message_pool_prefix)
+        # Per-thread state used to detect whether the current thread is
+        # handling an incoming message (independent of the executor in use)
+        self._message_thread_state = threading.local()
+
+        # The executors for message handling
+        self._init_executors(config)
+
+        # Whether the callbacks for a message are invoked concurrently
+        self._parallel_callback_fan_out = config.parallel_callback_fan_out
+
+        # The watchdog which reports slow callbacks and stalled thread pools
+        self._init_watchdog(config)
 
         # Subscribe to the client reply channel
         self.subscribe(self._reply_to_topic)
 
         # The request manager (manages synchronous and asynchronous request callbacks,
         # notifications, etc.).
-        self._request_manager = RequestManager(client=self)
+        self._init_request_manager(config)
 
         # The service manager (manages services request callbacks, notifications, etc.).
         self._service_manager = _ServiceManager(client=self)
@@ -431,8 +475,138 @@ class DxlClient(_BaseObject):
         # The condition associated with the client configuration
         self._connect_wait_condition = threading.Condition(self._connect_wait_lock)
 
-        self._acked_packets = set()
-        self._wait_packet_ack_condition = threading.Condition()
+        # The futures which are completed when ack packets are received, by
+        # message id of the corresponding MQTT packet
+        self._packet_acks = {}
+        self._packet_acks_lock = threading.Lock()
+        # Shared timer for the client's timeouts
+        self._timing_wheel = TimingWheel()
+
+        # The limits on the requests and events sent by the client, by topic
+        self._send_limiters = SendLimiters()
+        self._init_send_limiters(config)
+
+        # Counts of incoming messages (by message type) which were discarded
+        # before being queued because no callback or pending request could
+        # receive them. Only updated from the MQTT network thread.
+        self._dropped_message_counts = {
+            Message.MESSAGE_TYPE_REQUEST: 0,
+            Message.MESSAGE_TYPE_RESPONSE: 0,
+            Message.MESSAGE_TYPE_EVENT: 0,
+            Message.MESSAGE_TYPE_ERROR: 0
+        }
+
+    def _init_executors(self, config):
+        """
+        Creates (or wraps) the executor and the named executors (see
+        :func:`dxlclient.client_config.DxlClientConfig.add_incoming_message_executor`)
+        which handle incoming messages.
+
+        :param config: The client configuration
+        """
+        executor = config.incoming_message_executor
+        # Whether the executor was created by (and is owned by) the client
+        self._owns_thread_pool = executor is None
+        if executor is None:
+            self._thread_pool = ThreadPool(
+                num_threads=config.incoming_message_thread_pool_size,
+                queue_size=config.incoming_message_queue_size,
+                thread_prefix=self._message_pool_prefix,
+                max_queued_bytes=config.incoming_message_queue_max_bytes)
+        elif isinstance(executor, MessageExecutor):
+            self._thread_pool = executor
+        else:
+            self._thread_pool = FuturesMessageExecutor(executor)
+
+        # The named executors (bulkheads) for message handling, by name
+        for name, settings in \
+                config.named_incoming_message_executors.items():
+            executor = settings["executor"]
+            if executor is None:
+                self._named_executors[name] = ThreadPool(
+                    num_threads=settings["thread_pool_size"],
+                    queue_size=settings["queue_size"],
+                    thread_prefix=self._message_pool_prefix + "-" + name,
+                    discard_when_full=settings["discard_when_full"],
+                    max_queued_bytes=settings["queue_max_bytes"])
+                self._owned_named_executors.add(name)
+            elif isinstance(executor, MessageExecutor):
+                self._named_executors[name] = executor
+            else:
+                self._named_executors[name] = FuturesMessageExecutor(executor)
+
+    def _init_watchdog(self, config):
+        """
+        Creates and starts the watchdog which reports slow callbacks and
+        stalled thread pools (if enabled in the configuration).
+
+        :param config: The client configuration
+        """
+        if not config.slow_callback_threshold:
+            return
+        self._watchdog = _Watchdog(
+            config.slow_callback_threshold,
+            name=self._message_pool_prefix + "-Watchdog")
+        if self._owns_thread_pool:
+            self._watchdog.add_pool("(default)", self._thread_pool)
+        for name in self._owned_named_executors:
+            self._watchdog.add_pool(name, self._named_executors[name])
+        for callbacks in (self._request_callbacks,
+                          self._response_callbacks, self._event_callbacks):
+            callbacks.watchdog = self._watchdog
+        self._watchdog.start()
+
+    def _init_request_manager(self, config):
+        """
+        Creates the request manager, along with its response caches and hedging
+        policies.
+
+        :param config: The client configuration
+        """
+        self._request_manager = RequestManager(client=self)
+        self._request_manager.single_flight = config.single_flight_requests
+        self._init_response_caches(config)
+        self._init_request_hedging(config)
+
+    def _init_response_caches(self, config):
+        """
+        Creates the response caches (see
+        :func:`dxlclient.client_config.DxlClientConfig.add_response_cache`) for the client,
+        and subscribes to the topics of the events which invalidate them.
+
+        :param config: The client configuration
+        """
+        for topic, settings in iter_dict_items(config.response_caches):
+            cache = ResponseCache(
+                settings["ttl"], settings["max_entries"],
+                settings["key_function"] or RequestManager.get_single_flight_key,
+                settings["max_bytes"])
+            self._request_manager.response_caches[topic] = cache
+            for invalidation_topic in settings["invalidation_topics"]:
+                self.add_event_callback(invalidation_topic, cache.invalidate)
+
+    def _init_request_hedging(self, config):
+        """
+        Creates the hedging policies (see
+        :func:`dxlclient.client_config.DxlClientConfig.add_request_hedging`) for the client.
+
+        :param config: The client configuration
+        """
+        for topic, settings in iter_dict_items(config.request_hedging):
+            self._request_manager.hedging_policies[topic] = HedgingPolicy(settings)
+
+    def _init_send_limiters(self, config):
+        """
+        Creates the send limiters (see
+        :func:`dxlclient.client_config.DxlClientConfig.add_send_limit`) for the client.
+
+        :param config: The client configuration
+        """
+        for topic, settings in iter_dict_items(config.send_limits):
+            self._send_limiters.add(topic, SendLimiter(
+                settings, self._timing_wheel.schedule, self._add_local_task))
+        if self._send_limiters:
+            self._request_manager.limiters = self._send_limiters
 
     def __del__(self):
         """destructor"""
@@ -554,7 +728,22 @@ class DxlClient(_BaseObject):
                 self.disconnect()
 
                 if self._thread_pool:
-                    self._thread_pool.shutdown(wait_complete)
+                    if self._owns_thread_pool:
+                        self._thread_pool.shutdown(wait_complete)
+                    elif wait_complete:
+                        self._thread_pool.wait_completion()
+
+                for name, executor in self._named_executors.items():
+                    if name in self._owned_named_executors:
+                        executor.shutdown(wait_complete)
+                    elif wait_complete:
+                        executor.wait_completion()
+
+                if self._watchdog:
+                    self._watchdog.stop()
+
+                if self._timing_wheel:
+                    self._timing_wheel.stop()
 
                 self._config = None
 
@@ -579,15 +768,19 @@ class DxlClient(_BaseObject):
 
         logger.debug("Waiting for thread pool completion...")
         self._thread_pool.wait_completion()
+        for executor in self._named_executors.values():
+            executor.wait_completion()
 
         for subscription in self._subscriptions:
             if self.connected:
                 try:
                     logger.debug("Unsubscribing from %s", subscription)
-                    result, mid = self._client.unsubscribe(subscription)
-                    self._wait_for_packet_ack(result, mid,
-                                              "unsubscription to " +
-                                              subscription)
+                    description = "unsubscription to " + subscription
+                    self._wait_for_packet_ack(
+                        self._send_tracked_packet(description,
+                                                  self._client.unsubscribe,
+                                                  subscription),
+                        description)
                 except Exception as ex:  # pylint: disable=broad-except
                     logger.error("Error during unsubscribe: %s", str(ex))
                     logger.debug(traceback.format_exc())
@@ -833,21 +1026,112 @@ class DxlClient(_BaseObject):
         In this example the :func:`dxlclient.client.DxlClient.add_event_callback` method is invoked with the
         ``subscribe_to_topic`` parameter set to ``False`` preventing the automatic subscription.
 
+        Topics may contain wildcards. A ``#`` at the end of a topic matches any number of
+        trailing topic levels (``/a/#``), and a ``+`` matches exactly one topic level
+        (``/a/+/c``). Callbacks which are registered with the same wildcard topic receive the
+        corresponding messages.
+
         :param topic: The topic to subscribe to
         """
+        TopicTrie.validate(topic)
         logger.debug("%s(): Waiting for Subscriptions lock...", DxlUtils.func_name())
         self._subscriptions_lock.acquire()
         try:
             if topic not in self._subscriptions:
                 self._subscriptions.add(topic)
                 if self.connected:
-                    result, mid = self._client.subscribe(topic)
-                    self._wait_for_packet_ack(result, mid,
-                                              "subscription to " + topic)
+                    description = "subscription to " + topic
+                    self._wait_for_packet_ack(
+                        self._send_tracked_packet(description,
+                                                  self._client.subscribe, topic),
+                        description)
+        finally:
+            logger.debug("%s(): Releasing Subscriptions lock.", DxlUtils.func_name())
+            self._subscriptions_lock.release()
+
+    def subscribe_async(self, topic):
+        """
+        Subscribes to the specified topic on the DXL fabric without waiting for the broker to acknowledge
+        the subscription. See the :func:`subscribe` method for more information on subscriptions.
+
+        The returned :class:`dxlclient.future.DxlFuture` is completed when the acknowledgement is received.
+        It fails with a :class:`dxlclient.exceptions.WaitTimeoutException` if the acknowledgement is not
+        received in time. If the client is not connected (the subscription will be sent when it connects),
+        or is already subscribed to the topic, the returned future is already complete.
+
+        :param topic: The topic to subscribe to
+        :return: The :class:`dxlclient.future.DxlFuture` for the acknowledgement
+        """
+        TopicTrie.validate(topic)
+        logger.debug("%s(): Waiting for Subscriptions lock...", DxlUtils.func_name())
+        self._subscriptions_lock.acquire()
+        try:
+            if topic not in self._subscriptions:
+                self._subscriptions.add(topic)
+                if self.connected:
+                    return self._send_tracked_packet("subscription to " + topic,
+                                                     self._client.subscribe, topic)
+        finally:
+            logger.debug("%s(): Releasing Subscriptions lock.", DxlUtils.func_name())
+            self._subscriptions_lock.release()
+        return _completed_future()
+
+    def subscribe_topics(self, topics):
+        """
+        Subscribes to the specified topics on the DXL fabric. This has the same effect as invoking
+        :func:`subscribe` for each of the topics, but the subscriptions are sent to the broker in as
+        few packets as possible and the broker acknowledgements are awaited concurrently. This is
+        much faster than subscribing to a large number of topics one at a time.
+
+        :param topics: An iterable of the topics to subscribe to
+        """
+        topics = list(topics)
+        for topic in topics:
+            TopicTrie.validate(topic)
+        logger.debug("%s(): Waiting for Subscriptions lock...", DxlUtils.func_name())
+        self._subscriptions_lock.acquire()
+        try:
+            new_topics = []
+            for topic in topics:
+                if topic not in self._subscriptions:
+                    self._subscriptions.add(topic)
+                    new_topics.append(topic)
+            if new_topics and self.connected:
+                self._send_subscriptions(self._client, new_topics)
         finally:
             logger.debug("%s(): Releasing Subscriptions lock.", DxlUtils.func_name())
             self._subscriptions_lock.release()
 
+    def _send_subscriptions(self, client, topics):
+        """
+        Sends subscriptions for the specified topics (each packet containing up
+        to :attr:`_MAX_TOPICS_PER_SUBSCRIBE` topics), and then waits for the
+        acks of all of the packets.
+
+        :param client: The Paho MQTT client reference
+        :param topics: The list of topics to subscribe to
+        :raise WaitTimeoutException: if an ack packet is not received before a
+            timeout is reached.
+        """
+        packets = []
+        for index in range(0, len(topics), self._MAX_TOPICS_PER_SUBSCRIBE):
+            packet_topics = topics[index:index + self._MAX_TOPICS_PER_SUBSCRIBE]
+            description = "subscription to " + ", ".join(packet_topics)
+            packets.append((self._send_tracked_packet(
+                description, client.subscribe,
+                [(topic, 0) for topic in packet_topics]), description))
+        # Wait for each of the acks (even after a failure, so that no packet
+        # is still awaiting its ack when this returns)
+        error = None
+        for future, description in packets:
+            try:
+                self._wait_for_packet_ack(future, description)
+            except Exception as ex:  # pylint: disable=broad-except
+                if error is None:
+                    error = ex
+        if error is not None:
+            raise error
+
     def unsubscribe(self, topic):
         """
         Unsubscribes from the specified topic on the DXL fabric.
@@ -861,62 +1145,109 @@ class DxlClient(_BaseObject):
         try:
             if topic in self._subscriptions:
                 if self.connected:
-                    result, mid = self._client.unsubscribe(topic)
-                    self._wait_for_packet_ack(result, mid,
-                                              "unsubscription to " + topic)
+                    description = "unsubscription to " + topic
+                    self._wait_for_packet_ack(
+                        self._send_tracked_packet(description,
+                                                  self._client.unsubscribe, topic),
+                        description)
         finally:
             if topic in self._subscriptions:
                 self._subscriptions.remove(topic)
             logger.debug("%s(): Releasing Subscriptions lock.", DxlUtils.func_name())
             self._subscriptions_lock.release()
 
-    def _wait_for_packet_ack(self, result, mid, description):
+    def unsubscribe_async(self, topic):
+        """
+        Unsubscribes from the specified topic on the DXL fabric without waiting for the broker to acknowledge
+        the unsubscription. See the :func:`subscribe_async` method for more information on the returned future.
+
+        :param topic: The topic to unsubscribe from
+        :return: The :class:`dxlclient.future.DxlFuture` for the acknowledgement
+        """
+        logger.debug("%s(): Waiting for Subscriptions lock...", DxlUtils.func_name())
+        self._subscriptions_lock.acquire()
+        try:
+            if topic in self._subscriptions:
+                self._subscriptions.remove(topic)
+                if self.connected:
+                    return self._send_tracked_packet("unsubscription to " + topic,
+                                                     self._client.unsubscribe, topic)
+        finally:
+            logger.debug("%s(): Releasing Subscriptions lock.", DxlUtils.func_name())
+            self._subscriptions_lock.release()
+        return _completed_future()
+
+    def _wait_for_packet_ack(self, future, description):
         """
         Wait until an ack packet is delivered for an MQTT message or the broker
-        connection is dropped. This should only be called once for a specific
-        packet. If this function is called additional times for a specific
-        packet, the function will pause until the amount of time in
-        MAX_PACKET_ACK_WAIT is reached and then throw a WaitTimeoutException.
-        :param result: Result delivered by MQTT for the attempt to send the
-            original packet. If the Result is anything other than
-            MQTT_ERR_SUCCESS this function will assume that the original packet
-            was never sent and, therefore, that the function would not need to
-            wait for a corresponding ack packet.
-        :param mid: The message id of the MQTT packet which corresponds to the
-            ack packet.
+        connection is dropped.
+        :param future: The future for the ack packet (see
+            :func:`_send_tracked_packet`).
         :param description: Text string to include in the exception this
             method raises if a timeout occurs while waiting for the ACK packet.
         :raise WaitTimeoutException: if the ack packet is not received before
             a timeout is reached.
         """
-        with self._wait_packet_ack_condition:
-            if result == mqtt.MQTT_ERR_SUCCESS:
-                start = time.time()
-                try:
-                    time_remaining = self._MAX_PACKET_ACK_WAIT
-                    while mid not in self._acked_packets and \
-                            time_remaining > 0:
-                        self._wait_packet_ack_condition.wait(
-                            time_remaining)
-                        time_remaining = start - time.time() + \
-                                         self._MAX_PACKET_ACK_WAIT
-                    if mid not in self._acked_packets:
-                        raise WaitTimeoutException("Timeout waiting for " +
-                                                   description)
-                finally:
-                    if mid in self._acked_packets:
-                        self._acked_packets.remove(mid)
+        try:
+            future.result(self._MAX_PACKET_ACK_WAIT)
+        except (WaitTimeoutException, futures.TimeoutError):
+            raise WaitTimeoutException("Timeout waiting for " + description)
+
+    def _send_tracked_packet(self, description, send, *args):
+        """
+        Sends an MQTT packet, and returns a future which is completed when the
+        corresponding ack packet is delivered. The future fails with a
+        :class:`dxlclient.exceptions.WaitTimeoutException` if the ack packet is
+        not received within :attr:`_MAX_PACKET_ACK_WAIT` seconds.
+
+        The future is registered while the packet is being sent (with the lock
+        for the tracked packets held), so an ack which is received on the
+        network thread before the send returns waits for the registration.
+
+        :param description: Text string to include in the exception that the
+            future fails with if a timeout occurs while waiting for the ack
+            packet.
+        :param send: The function of the Paho MQTT client which sends the
+            packet (for example, ``subscribe``), returning the result and the
+            message id of the packet. If the result is anything other than
+            MQTT_ERR_SUCCESS the packet was never sent, and the returned future
+            is already complete.
+        :param args: The arguments to invoke the function with
+        :return: The :class:`dxlclient.future.DxlFuture`
+        """
+        with self._packet_acks_lock:
+            result, mid = send(*args)
+            if result != mqtt.MQTT_ERR_SUCCESS:
+                return _completed_future()
+            future = DxlFuture()
+            self._packet_acks[mid] = future
+        timeout = self._timing_wheel.schedule(
+            self._MAX_PACKET_ACK_WAIT, future.set_exception,
+            WaitTimeoutException("Timeout waiting for " + description))
+
+        def on_done(_):
+            """Stops tracking the packet once the ack is received or the wait
+            times out"""
+            timeout.cancel()
+            with self._packet_acks_lock:
+                if self._packet_acks.get(mid) is future:
+                    del self._packet_acks[mid]
+        future.add_done_callback(on_done)
+        return future
 
     def _on_packet_ack(self, mid):
         """
-        Callback invoked when a ack packet is received.
+        Callback invoked when a ack packet is received. Acks for packets which
+        are not tracked (such as late acks for packets whose wait has timed
+        out) are discarded.
 
         :param mid: The message id of the MQTT packet which corresponds to the
             ack packet.
         """
-        with self._wait_packet_ack_condition:
-            self._acked_packets.add(mid)
-            self._wait_packet_ack_condition.notify_all()
+        with self._packet_acks_lock:
+            future = self._packet_acks.pop(mid, None)
+        if future is not None:
+            future.set_result(None)
 
     @property
     def subscriptions(self):
@@ -933,7 +1264,7 @@ class DxlClient(_BaseObject):
             logger.debug("%s(): Releasing Subscriptions lock.", DxlUtils.func_name())
             self._subscriptions_lock.release()
 
-    def sync_request(self, request, timeout=_DEFAULT_WAIT):
+    def sync_request(self, request, timeout=_DEFAULT_WAIT, single_flight_key=None):
         """
         Sends a :class:`dxlclient.message.Request` message to a remote DXL service.
 
@@ -943,14 +1274,33 @@ class DxlClient(_BaseObject):
         :param timeout: The amount of time (in seconds) to wait for the :class:`dxlclient.message.Response`
             to the request. If the timeout is exceeded an exception will be raised. Defaults to ``3600``
             seconds (1 hour)
+        :param single_flight_key: An optional key identifying requests which are interchangeable. If a
+            request with the same key is already in flight, this request is not sent and the response to
+            the in-flight request is returned instead (see
+            :attr:`dxlclient.client_config.DxlClientConfig.single_flight_requests`).
+
+        If a send limit is configured for the destination topic of the request (see
+        :func:`dxlclient.client_config.DxlClientConfig.add_send_limit`), the time spent waiting for
+        the limit counts towards the timeout. A
+        :class:`dxlclient.exceptions.SendLimitExceededException` is raised if the request is rejected
+        by the limit.
+
+        The time at which the timeout expires is sent to the service as the deadline of the request
+        (see :mod:`dxlclient.deadline`).
+        """
+        self._check_sync_request_allowed()
+        return self._request_manager.sync_request(request, timeout, single_flight_key)
+
+    def _check_sync_request_allowed(self):
+        """
+        Raises an exception if the current thread is handling an incoming message (waiting for
+        responses on such a thread could deadlock the processing of incoming messages).
         """
-        if threading.currentThread().name.startswith(self._message_pool_prefix):
+        if getattr(self._message_thread_state, "handling_message", False):
             raise DxlException("Synchronous requests may not be invoked while handling an incoming message. " +
                                "The synchronous request must be made on a different thread.")
 
-        return self._request_manager.sync_request(request, timeout)
-
-    def async_request(self, request, response_callback=None):
+    def async_request(self, request, response_callback=None, timeout=None):
         """
         Sends a :class:`dxlclient.message.Request` message to a remote DXL service asynchronously.
         This method differs from :func:`sync_request` due to the fact that it returns to the caller
@@ -964,9 +1314,82 @@ class DxlClient(_BaseObject):
 
         :param request: The :class:`dxlclient.message.Request` message to send to a remote DXL service
         :param response_callback: An optional :class:`dxlclient.callbacks.ResponseCallback` that will be invoked
-            when the corresponding :class:`dxlclient.message.Response` message is received by the client.
+            when the corresponding :class:`dxlclient.message.Response` message is received by the client. A plain
+            function (or coroutine function) which accepts the response may also be specified.
+        :param timeout: An optional amount of time (in seconds) after which the request expires if no
+            :class:`dxlclient.message.Response` has been received. The callback then receives a
+            :class:`dxlclient.message.ErrorResponse` with the
+            :attr:`dxlclient.message.ErrorResponse.TIMEOUT_ERROR_CODE` error code, and a response which
+            arrives later is discarded. By default the request never expires.
+
+        If a send limit is configured for the destination topic of the request (see
+        :func:`dxlclient.client_config.DxlClientConfig.add_send_limit`), the request may be delayed,
+        queued or rejected with a :class:`dxlclient.exceptions.SendLimitExceededException`. A request
+        which expires while it is queued is not sent.
+
+        If a timeout is specified, the time at which it expires is sent to the service as the deadline
+        of the request (see :mod:`dxlclient.deadline`).
         """
-        return self._request_manager.async_request(request, response_callback)
+        return self._request_manager.async_request(request, response_callback, timeout)
+
+    def request_future(self, request, timeout=None):
+        """
+        Sends a :class:`dxlclient.message.Request` message to a remote DXL service asynchronously, and
+        returns a :class:`dxlclient.future.DxlFuture` for its :class:`dxlclient.message.Response`. Like
+        :func:`async_request`, this method returns immediately.
+
+        The following example sends two requests concurrently and waits for both responses:
+
+        .. code-block:: python
+
+            first = client.request_future(Request("/mycompany/myservice/first"), timeout=10)
+            second = client.request_future(Request("/mycompany/myservice/second"), timeout=10)
+            print(first.result().payload, second.result().payload)
+
+        :param request: The :class:`dxlclient.message.Request` message to send to a remote DXL service
+        :param timeout: An optional amount of time (in seconds) after which the request expires if no
+            :class:`dxlclient.message.Response` has been received, failing the future with a
+            :class:`dxlclient.exceptions.WaitTimeoutException`. By default the request never expires.
+        :return: The :class:`dxlclient.future.DxlFuture` which is completed with the
+            :class:`dxlclient.message.Response` (or :class:`dxlclient.message.ErrorResponse`)
+        """
+        return self._request_manager.request_future(request, timeout)
+
+    def gather(self, requests, mode=GATHER_ALL, timeout=_DEFAULT_WAIT, quorum=None):
+        """
+        Sends several :class:`dxlclient.message.Request` messages to remote DXL services concurrently
+        and waits (on the current thread only) for their :class:`dxlclient.message.Response` messages.
+        The mode determines how many responses are waited for:
+
+        - :attr:`GATHER_ALL`: the responses to all of the requests
+        - :attr:`GATHER_FIRST`: the first response to be received
+        - :attr:`GATHER_QUORUM`: ``quorum`` responses (by default, a majority of the requests)
+
+        Responses which are received after this method returns are discarded. Like :func:`sync_request`,
+        this method may not be invoked while handling an incoming message.
+
+        :param requests: The :class:`dxlclient.message.Request` messages to send
+        :param mode: The gather mode (see above). Defaults to :attr:`GATHER_ALL`
+        :param timeout: The amount of time (in seconds) to wait for the responses. If the required
+            responses are not received in time a :class:`dxlclient.exceptions.WaitTimeoutException` is
+            raised. Defaults to ``3600`` seconds (1 hour)
+        :param quorum: The number of responses to wait for in the :attr:`GATHER_QUORUM` mode
+        :return: A list containing the response to each of the requests (in the order of the requests),
+            or ``None`` for the requests which have not received a response
+        """
+        self._check_sync_request_allowed()
+        requests = list(requests)
+        if mode == self.GATHER_ALL:
+            required = len(requests)
+        elif mode == self.GATHER_FIRST:
+            required = min(1, len(requests))
+        elif mode == self.GATHER_QUORUM:
+            required = len(requests) // 2 + 1 if quorum is None else quorum
+            if required < 0 or required > len(requests):
+                raise ValueError("Invalid quorum: " + str(quorum))
+        else:
+            raise ValueError("Unknown gather mode: " + str(mode))
+        return self._request_manager.gather(requests, required, timeout)
 
     def _get_async_callback_count(self):
         """
@@ -975,6 +1398,14 @@ class DxlClient(_BaseObject):
         """
         return self._request_manager._get_async_callback_count()
 
+    def _cancel_async_request(self, message_id):
+        """
+        Abandons an asynchronous request whose response is no longer needed (its
+        callback is not invoked)
+        :param message_id: The request message identifier
+        """
+        self._request_manager._abandon_async_request(message_id)
+
     def _publish_message(self, channel, payload, qos):
         """
         Publishes the specified message
@@ -1020,13 +1451,22 @@ class DxlClient(_BaseObject):
         See module :mod:`dxlclient.message` for more information on message types, how they are delivered to
         remote clients, etc.
 
+        If a send limit is configured for the topic of the event (see
+        :func:`dxlclient.client_config.DxlClientConfig.add_send_limit`), the event may be delayed,
+        queued or rejected with a :class:`dxlclient.exceptions.SendLimitExceededException`.
+
         :param event: The :class:`dxlclient.message.Event` to send
         """
         if event is None or not isinstance(event, Event):
             raise ValueError("Invalid or unspecified event object")
-        self._publish_message(event.destination_topic, event._to_bytes(), self._qos)
+        limiter = self._send_limiters.get(event.destination_topic)
+        if limiter is None:
+            self._publish_message(event.destination_topic, event._to_bytes(), self._qos)
+        else:
+            limiter.submit(False, self._publish_message, event.destination_topic,
+                           event._to_bytes(), self._qos)
 
-    def add_request_callback(self, topic, request_callback):
+    def add_request_callback(self, topic, request_callback, executor=None):
         """
         Adds a :class:`dxlclient.callbacks.RequestCallback` to the client for the specified topic.
         The callback will be invoked when :class:`dxlclient.message.Request` messages are received by the client
@@ -1040,9 +1480,35 @@ class DxlClient(_BaseObject):
         :param topic: The topic to receive :class:`dxlclient.message.Request` messages on. A topic of ``None`` indicates
             that the callback should receive :class:`dxlclient.message.Request` messages for all topics (no filtering).
         :param request_callback: The :class:`dxlclient.callbacks.RequestCallback` to be invoked when a
-            :class:`dxlclient.message.Request` message is received on the specified topic
-        """
-        self._request_callbacks.add_callback(("" if topic is None else topic), request_callback)
+            :class:`dxlclient.message.Request` message is received on the specified topic. A plain function
+            (or coroutine function) which accepts the request may also be specified.
+        :param executor: Optional name of the executor (see
+            :func:`dxlclient.client_config.DxlClientConfig.add_incoming_message_executor`) that the
+            callback should be invoked by. By default the callback is invoked by the default executor.
+        """
+        self._validate_executor_name(executor)
+        self._request_callbacks.add_callback(("" if topic is None else topic), request_callback,
+                                             executor)
+
+    def add_request_callbacks(self, callbacks_by_topic, executor=None):
+        """
+        Adds a set of :class:`dxlclient.callbacks.RequestCallback` instances (or plain functions) to the
+        client, specified as a dictionary of callbacks by topic. This has the same effect as invoking
+        :func:`add_request_callback` for each of the topics, but the registrations are updated once for
+        all of the callbacks.
+
+        :param callbacks_by_topic: Dictionary containing the callbacks by topic. A topic of ``None``
+            indicates that the callback should receive :class:`dxlclient.message.Request` messages for all
+            topics (no filtering).
+        :param executor: Optional name of the executor (see
+            :func:`dxlclient.client_config.DxlClientConfig.add_incoming_message_executor`) that the
+            callbacks should be invoked by. By default the callbacks are invoked by the default executor.
+        """
+        self._validate_executor_name(executor)
+        self._request_callbacks.add_callbacks(
+            [("" if topic is None else topic, callback)
+             for topic, callback in iter_dict_items(callbacks_by_topic)],
+            executor)
 
     def remove_request_callback(self, topic, request_callback):
         """
@@ -1055,7 +1521,7 @@ class DxlClient(_BaseObject):
         """
         self._request_callbacks.remove_callback(("" if topic is None else topic), request_callback)
 
-    def add_response_callback(self, topic, response_callback):
+    def add_response_callback(self, topic, response_callback, executor=None):
         """
         Adds a :class:`dxlclient.callbacks.ResponseCallback` to the client for the specified topic.
         The callback will be invoked when :class:`dxlclient.message.Response` messages are received by the client
@@ -1070,8 +1536,13 @@ class DxlClient(_BaseObject):
             that the callback should receive :class:`dxlclient.message.Request` messages for all topics (no filtering).
         :param request_callback: The :class:`dxlclient.callbacks.RequestCallback` to be invoked when a
             :class:`dxlclient.message.Request` message is received on the specified topic
+        :param executor: Optional name of the executor (see
+            :func:`dxlclient.client_config.DxlClientConfig.add_incoming_message_executor`) that the
+            callback should be invoked by. By default the callback is invoked by the default executor.
         """
-        self._response_callbacks.add_callback(("" if topic is None else topic), response_callback)
+        self._validate_executor_name(executor)
+        self._response_callbacks.add_callback(("" if topic is None else topic), response_callback,
+                                              executor)
 
     def remove_response_callback(self, topic, response_callback):
         """
@@ -1084,7 +1555,7 @@ class DxlClient(_BaseObject):
         """
         self._response_callbacks.remove_callback(("" if topic is None else topic), response_callback)
 
-    def add_event_callback(self, topic, event_callback, subscribe_to_topic=True):
+    def add_event_callback(self, topic, event_callback, subscribe_to_topic=True, executor=None):
         """
         Adds a :class:`dxlclient.callbacks.EventCallback` to the client for the specified topic.
         The callback will be invoked when :class:`dxlclient.message.Event` messages are received by the client
@@ -1094,15 +1565,48 @@ class DxlClient(_BaseObject):
         :param topic: The topic to receive :class:`dxlclient.message.Event` messages on. A topic of ``None`` indicates
             that the callback should receive :class:`dxlclient.message.Event` messages for all topics (no filtering).
         :param event_callback: The :class:`dxlclient.callbacks.EventCallback` to be invoked when a
-            :class:`dxlclient.message.Event` message is received on the specified topic
+            :class:`dxlclient.message.Event` message is received on the specified topic. A plain function
+            (or coroutine function) which accepts the event may also be specified.
         :param subscribe_to_topic: Optional parameter to indicate if the client should subscribe
             (:func:`dxlclient.client.DxlClient.subscribe`) to the topic.
             By default the client will subscribe to the topic. Specify ``False`` to prevent subscribing to the topic.
+        :param executor: Optional name of the executor (see
+            :func:`dxlclient.client_config.DxlClientConfig.add_incoming_message_executor`) that the
+            callback should be invoked by. By default the callback is invoked by the default executor.
         """
-        self._event_callbacks.add_callback(("" if topic is None else topic), event_callback)
+        self._validate_executor_name(executor)
+        self._event_callbacks.add_callback(("" if topic is None else topic), event_callback,
+                                           executor)
         if subscribe_to_topic is True and topic is not None:
             self.subscribe(topic)
 
+    def add_event_callbacks(self, callbacks_by_topic, subscribe_to_topics=True, executor=None):
+        """
+        Adds a set of :class:`dxlclient.callbacks.EventCallback` instances (or plain functions) to the
+        client, specified as a dictionary of callbacks by topic. This has the same effect as invoking
+        :func:`add_event_callback` for each of the topics, but the registrations are updated once for all
+        of the callbacks and the topics are subscribed to via :func:`subscribe_topics`.
+
+        :param callbacks_by_topic: Dictionary containing the callbacks by topic. A topic of ``None``
+            indicates that the callback should receive :class:`dxlclient.message.Event` messages for all
+            topics (no filtering).
+        :param subscribe_to_topics: Optional parameter to indicate if the client should subscribe
+            (:func:`dxlclient.client.DxlClient.subscribe_topics`) to the topics.
+            By default the client will subscribe to the topics. Specify ``False`` to prevent subscribing to
+            the topics.
+        :param executor: Optional name of the executor (see
+            :func:`dxlclient.client_config.DxlClientConfig.add_incoming_message_executor`) that the
+            callbacks should be invoked by. By default the callbacks are invoked by the default executor.
+        """
+        self._validate_executor_name(executor)
+        self._event_callbacks.add_callbacks(
+            [("" if topic is None else topic, callback)
+             for topic, callback in iter_dict_items(callbacks_by_topic)],
+            executor)
+        if subscribe_to_topics is True:
+            self.subscribe_topics(
+                [topic for topic in callbacks_by_topic if topic is not None])
+
     def remove_event_callback(self, topic, event_callback, unsubscribe_from_topic=True):
         """
         Removes a :class:`dxlclient.callbacks.EventCallback` from the client for the specified topic. This method
@@ -1119,34 +1623,345 @@ class DxlClient(_BaseObject):
         if unsubscribe_from_topic is True and topic is not None:
             self.unsubscribe(topic)
 
-    def _fire_request(self, request):
+    def _validate_executor_name(self, executor):
+        """
+        Validates that the specified executor name refers to a named executor
+        of the client.
+
+        :param executor: The executor name (``None`` for the default executor)
+        """
+        if executor is not None and executor not in self._named_executors:
+            raise ValueError("Unknown incoming message executor: " + str(executor))
+
+    def _get_executor(self, executor):
+        """
+        Returns the executor with the specified name.
+
+        :param executor: The executor name (``None`` for the default executor)
+        :return: The executor
+        """
+        if executor is None:
+            return self._thread_pool
+        return self._named_executors[executor]
+
+    def _fire_request(self, request, executor=None):
         """
         Fires the specified {@link Request} to {@link RequestCallback} listeners currently
         registered with the client.
 
         :param request: The {@link Request} to fire
+        :param executor: The name of the executor firing the request
         """
-        self._request_callbacks.fire_message(request)
+        self._fire_message(self._request_callbacks, request, executor)
 
-    def _fire_response(self, response):
+    def _fire_response(self, response, executor=None, ignored_callback=None):
         """
         Fires the specified {@link Response} to {@link ResponseCallback} listeners currently
         registered with the client.
 
         :param response: The {@link Response} to fire
+        :param executor: The name of the executor firing the response
+        :param ignored_callback: An optional listener which has already received the response
         """
-        self._response_callbacks.fire_message(response)
+        self._fire_message(self._response_callbacks, response, executor, ignored_callback)
 
-    def _fire_event(self, event):
+    def _fire_event(self, event, executor=None):
         """
         Fires the specified {@link Event} to {@link EventCallback} listeners currently
         registered with the client.
 
         :param event: The {@link Event} to fire
+        :param executor: The name of the executor firing the event
+        """
+        self._fire_message(self._event_callbacks, event, executor)
+
+    def _fire_message(self, callbacks, message, executor, ignored_callback=None):
+        """
+        Fires the specified message to the listeners of the specified callback manager
+        which were registered with the specified executor. When parallel fan-out is
+        enabled (see :attr:`dxlclient.client_config.DxlClientConfig.parallel_callback_fan_out`),
+        all but the first listener are invoked via separate executor tasks.
+
+        :param callbacks: The callback manager
+        :param message: The message to fire
+        :param executor: The name of the executor firing the message
+        :param ignored_callback: An optional listener which is not notified
+        """
+        if not self._parallel_callback_fan_out:
+            callbacks.fire_message(message, executor, ignored_callback)
+            return
+
+        topic = message.destination_topic
+        dispatchers = callbacks.get_dispatchers(topic, executor)
+        if ignored_callback is not None:
+            dispatchers = [(callback, dispatcher) for callback, dispatcher in dispatchers
+                           if callback is not ignored_callback]
+        inline_dispatchers = list(dispatchers[:1])
+        if len(dispatchers) > 1:
+            message_executor = self._get_executor(executor)
+            for callback, dispatcher in dispatchers[1:]:
+                # Invoke the callback on the current thread rather than
+                # blocking it (and possibly every other thread of the
+                # executor) when the executor's queue is full
+                if not message_executor.try_add_task(
+                        self._run_message_task, topic, callbacks.fire_callback,
+                        callback, dispatcher, message):
+                    inline_dispatchers.append((callback, dispatcher))
+        for callback, dispatcher in inline_dispatchers:
+            callbacks.fire_callback(callback, dispatcher, message)
+
+    @property
+    def dropped_message_counts(self):
+        """
+        A ``dict`` containing the number of incoming messages that were discarded
+        without being dispatched because no registered callback (or pending
+        request, in the case of :class:`dxlclient.message.Response` messages)
+        could receive them. The dictionary is keyed by the numeric message type
+        (for example, :attr:`dxlclient.message.Message.MESSAGE_TYPE_EVENT`).
+
+        Typical causes are responses to requests which have already timed out
+        and events which were still in flight when their topic was unsubscribed.
+        """
+        return self._dropped_message_counts.copy()
+
+    @property
+    def coalesced_request_count(self):
+        """
+        The number of synchronous requests which were not sent because an identical request was in
+        flight (see :attr:`dxlclient.client_config.DxlClientConfig.single_flight_requests`)
         """
-        self._event_callbacks.fire_message(event)
+        return self._request_manager.coalesced_request_count
 
-    def _handle_message(self, channel, payload):
+    @property
+    def response_cache_hit_counts(self):
+        """
+        A ``dict`` containing the number of requests which received a cached response (and were
+        therefore not sent), keyed by the topic of each response cache (see
+        :func:`dxlclient.client_config.DxlClientConfig.add_response_cache`)
+        """
+        return dict((topic, cache.hit_count) for topic, cache in
+                    iter_dict_items(self._request_manager.response_caches))
+
+    def clear_response_caches(self):
+        """
+        Discards all of the cached responses (see
+        :func:`dxlclient.client_config.DxlClientConfig.add_response_cache`)
+        """
+        for cache in self._request_manager.response_caches.values():
+            cache.clear()
+
+    @property
+    def expired_service_request_count(self):
+        """
+        The number of requests to the services registered by the client which were dropped
+        (without being dispatched to the callbacks of the services) because their deadline had
+        passed (see :mod:`dxlclient.deadline`)
+        """
+        return self._service_manager.expired_request_count
+
+    @property
+    def hedge_count(self):
+        """
+        The number of hedges (copies of slow requests) which have been sent (see
+        :func:`dxlclient.client_config.DxlClientConfig.add_request_hedging`)
+        """
+        return self._request_manager.hedge_count
+
+    @property
+    def hedge_win_count(self):
+        """
+        The number of hedged requests whose first response was received for a hedge rather than
+        for the original request (see
+        :func:`dxlclient.client_config.DxlClientConfig.add_request_hedging`)
+        """
+        return self._request_manager.hedge_win_count
+
+    @property
+    def send_limit_statistics(self):
+        """
+        A ``dict`` containing the statistics of the send limits (see
+        :func:`dxlclient.client_config.DxlClientConfig.add_send_limit`), keyed by topic. Each
+        value is a ``dict`` containing the current number of requests in flight (``in_flight``)
+        and of queued messages (``queued``), the number of messages which were delayed by the
+        limit (``wait_count``), the total time (in seconds) that they were delayed
+        (``wait_time``), and the number of messages which were rejected (``rejected_count``).
+        """
+        return self._send_limiters.get_statistics()
+
+    @property
+    def expired_request_count(self):
+        """
+        The number of asynchronous requests which were sent with a timeout (see :func:`async_request`)
+        and expired without receiving a response
+        """
+        return self._request_manager.expired_request_count
+
+    @property
+    def incoming_message_queued_bytes(self):
+        """
+        The total size (in bytes) of the payloads of the incoming messages which are
+        currently queued for processing by the default executor (see
+        :attr:`dxlclient.client_config.DxlClientConfig.incoming_message_queue_max_bytes`).
+        ``None`` if the default executor was provided via
+        :attr:`dxlclient.client_config.DxlClientConfig.incoming_message_executor`.
+        """
+        return self._thread_pool.queued_bytes if self._owns_thread_pool else None
+
+    @property
+    def incoming_message_peak_queued_bytes(self):
+        """
+        The highest total size (in bytes) of the payloads of the incoming messages which
+        have been queued for processing by the default executor at the same time.
+        ``None`` if the default executor was provided via
+        :attr:`dxlclient.client_config.DxlClientConfig.incoming_message_executor`.
+        """
+        return self._thread_pool.peak_queued_bytes if self._owns_thread_pool else None
+
+    def _dispatch_message(self, channel, payload):
+        """
+        Dispatches an incoming message for processing. This is invoked on the
+        MQTT network thread, so only the leading members of the message are
+        decoded to determine how it should be routed:
+
+        - Responses to pending synchronous requests are decoded and handed
+          directly to the waiting thread (bypassing the message thread pool).
+        - Messages which could not be received by any registered callback (or
+          pending request) are counted and discarded.
+        - All other messages are queued to the message thread pool. A message
+          is queued once to each named executor (see
+          :func:`dxlclient.client_config.DxlClientConfig.add_incoming_message_executor`)
+          that has a callback which would receive it.
+
+        :param channel: The channel that the message arrived on
+        :param payload: The message received from the channel (as bytes)
+        """
+        try:
+            message_type, request_message_id = \
+                Message._peek_routing_info(payload)
+        except Exception: # pylint: disable=broad-except
+            # Let the message processing report the malformed message
+            self._add_message_task(None, channel, len(payload),
+                                   self._handle_message, channel, payload)
+            return
+
+        if message_type == Message.MESSAGE_TYPE_EVENT:
+            executors = self._event_callbacks.get_executors(channel)
+        elif message_type == Message.MESSAGE_TYPE_REQUEST:
+            executors = self._request_callbacks.get_executors(channel)
+        elif message_type in (Message.MESSAGE_TYPE_RESPONSE,
+                              Message.MESSAGE_TYPE_ERROR):
+            request_manager = self._request_manager
+            executors = self._response_callbacks.get_executors(
+                channel, ignored_callback=request_manager)
+            if request_manager and \
+                    request_manager.is_sync_waiting(request_message_id):
+                response = self._decode_message(channel, payload)
+                request_manager.on_response(response)
+                # Other response callbacks still receive the response via the
+                # message executors (without decoding it a second time, or
+                # delivering it to the request manager again)
+                for executor in executors:
+                    self._add_message_task(executor, channel, len(payload),
+                                           self._fire_response, response,
+                                           executor, request_manager)
+                return
+            if request_manager and \
+                    request_manager.is_pending(request_message_id):
+                # The request manager is registered with the default executor
+                executors.add(None)
+        else:
+            executors = set([None])
+
+        if executors:
+            for executor in executors:
+                self._add_message_task(executor, channel, len(payload),
+                                       self._handle_message, channel, payload,
+                                       executor)
+        else:
+            self._dropped_message_counts[message_type] += 1
+            logger.debug("Discarding unroutable message (type %s) for topic %s",
+                         message_type, channel)
+
+    def _add_message_task(self, executor, channel, size, func, *args):
+        """
+        Queues a task which handles an incoming message to the specified
+        executor. This is invoked on the MQTT network thread, which the
+        watchdog (if enabled) monitors while the task is being queued.
+
+        :param executor: The executor name (``None`` for the default executor)
+        :param channel: The channel that the message arrived on
+        :param size: The size of the message (in bytes)
+        :param func: The function to invoke
+        :param args: The arguments to invoke the function with
+        """
+        watchdog = self._watchdog
+        if watchdog:
+            previous = watchdog.activity_started(
+                "Queueing of incoming message to executor " +
+                (executor or "(default)"), channel)
+            try:
+                self._get_executor(executor).add_sized_task(
+                    size, self._run_message_task, channel, func, *args)
+            finally:
+                watchdog.activity_finished(previous)
+        else:
+            self._get_executor(executor).add_sized_task(
+                size, self._run_message_task, channel, func, *args)
+
+    def _add_local_task(self, func, *args):
+        """
+        Queues a task which is generated by the client itself (for example, the
+        delivery of a timeout error response) to the default executor. The
+        task is run on the current thread instead if the executor cannot
+        accept it without blocking.
+
+        :param func: The function to invoke
+        :param args: The arguments to invoke the function with
+        """
+        if not self._get_executor(None).try_add_task(
+                self._run_message_task, None, func, *args):
+            self._run_message_task(None, func, *args)
+
+    def _run_message_task(self, channel, func, *args):
+        """
+        Runs a task which handles an incoming message (invoked by the message
+        executor). While the task runs, the current thread is marked as
+        handling an incoming message so that :func:`sync_request` can detect
+        (and reject) re-entrant use, and the task is monitored by the
+        watchdog (if enabled).
+
+        :param channel: The channel that the message arrived on
+        :param func: The function to invoke
+        :param args: The arguments to invoke the function with
+        """
+        state = self._message_thread_state
+        handling_message = getattr(state, "handling_message", False)
+        state.handling_message = True
+        watchdog = self._watchdog
+        previous = watchdog.activity_started(
+            "Processing of incoming message", channel) if watchdog else None
+        try:
+            func(*args)
+        finally:
+            if watchdog:
+                watchdog.activity_finished(previous)
+            state.handling_message = handling_message
+
+    @staticmethod
+    def _decode_message(channel, payload):
+        """
+        Converts the bytes of an incoming message into the appropriate message
+        type instance (request, response, event, etc.).
+
+        :param channel: The channel that the message arrived on
+        :param payload: The message received from the channel (as bytes)
+        :return: The message
+        """
+        message = Message._from_bytes(payload)
+        message.destination_topic = channel
+        return message
+
+    def _handle_message(self, channel, payload, executor=None):
         """
         Processes an incoming message. The bytes from the message are converted into the appropriate
         message type instance (request, response, event, etc.) and then the corresponding registered
@@ -1154,16 +1969,17 @@ class DxlClient(_BaseObject):
 
         :param channel: The channel that the message arrived on
         :param payload: The message received from the channel (as bytes)
+        :param executor: The name of the executor processing the message. Only the callbacks
+            registered with this executor are notified (``None`` for the default executor).
         """
-        message = Message._from_bytes(payload)
-        message.destination_topic = channel
+        message = self._decode_message(channel, payload)
 
         if isinstance(message, Event):
-            self._fire_event(message)
+            self._fire_event(message, executor)
         elif isinstance(message, Request):
-            self._fire_request(message)
+            self._fire_request(message, executor)
         elif isinstance(message, (Response, ErrorResponse)):
-            self._fire_response(message)
+            self._fire_response(message, executor)
         else:
             raise ValueError("Unknown message type")
 
@@ -16,8 +16,11 @@ import threading
 import socket
 from configobj import ConfigObj
 
-from dxlclient import _BaseObject, DxlUtils
+from dxlclient import _BaseObject
+from dxlclient._dxl_utils import DxlUtils
 from dxlclient.broker import Broker
+from dxlclient.callbacks import MessageCallback
+from dxlclient import _limiter
 from dxlclient._uuid_generator import UuidGenerator
 from dxlclient.exceptions import BrokerListError, InvalidProxyConfigurationError
 
@@ -128,6 +131,13 @@ class DxlClientConfig(_BaseObject):
             dxl_client.connect()
     """
 
+    #: Send limit policy (see :func:`add_send_limit`): the sending thread waits for the limit
+    SEND_LIMIT_BLOCK = _limiter.POLICY_BLOCK
+    #: Send limit policy (see :func:`add_send_limit`): messages are rejected at the limit
+    SEND_LIMIT_FAIL = _limiter.POLICY_FAIL
+    #: Send limit policy (see :func:`add_send_limit`): messages are queued at the limit
+    SEND_LIMIT_QUEUE = _limiter.POLICY_QUEUE
+
     # Config file keys
     _CERTS_SECTION = u"Certs"
     _BROKER_CERT_CHAIN_SETTING = u"BrokerCertChain"
@@ -247,6 +257,16 @@ class DxlClientConfig(_BaseObject):
         self._queue = None
         self._incoming_message_queue_size = None
         self._incoming_message_thread_pool_size = None
+        self._incoming_message_queue_max_bytes = None
+        self._incoming_message_executor = None
+        self._named_incoming_message_executors = None
+        self._slow_callback_threshold = None
+        self._parallel_callback_fan_out = None
+        self._callback_class_instances = None
+        self._single_flight_requests = None
+        self._response_caches = None
+        self._send_limits = None
+        self._request_hedging = None
         self._init_common()
 
     def _create_required_sections(self):
@@ -320,6 +340,29 @@ class DxlClientConfig(_BaseObject):
         self._incoming_message_queue_size = 1000
         # The incoming thread pool size
         self._incoming_message_thread_pool_size = 1
+        # The maximum total payload size of the queued incoming messages (None
+        # for no limit)
+        self._incoming_message_queue_max_bytes = None
+        # The executor for incoming messages (None creates a thread pool per
+        # client)
+        self._incoming_message_executor = None
+        # Named executors (bulkheads) for incoming messages, keyed by name
+        self._named_incoming_message_executors = OrderedDict()
+        # The time (in seconds) after which incoming message processing is
+        # reported as slow (None disables the watchdog)
+        self._slow_callback_threshold = None
+        # Whether the callbacks for a message are invoked concurrently
+        self._parallel_callback_fan_out = False
+        # How callbacks registered as classes are instantiated
+        self._callback_class_instances = MessageCallback.INSTANCE_PER_MESSAGE
+        # Whether concurrent identical synchronous requests share a request
+        self._single_flight_requests = False
+        # Response cache settings, keyed by request topic
+        self._response_caches = OrderedDict()
+        # Send limit settings, keyed by topic
+        self._send_limits = OrderedDict()
+        # Request hedging settings, keyed by request topic
+        self._request_hedging = OrderedDict()
         # Default proxy settings for rdns and proxy type
         self._proxy_type = self._DEFAULT_PROXY_TYPE
         self._proxy_rdns = self._DEFAULT_PROXY_RDNS
@@ -580,6 +623,382 @@ class DxlClientConfig(_BaseObject):
     def incoming_message_thread_pool_size(self, incoming_message_thread_pool_size):
         self._incoming_message_thread_pool_size = incoming_message_thread_pool_size
 
+    @property
+    def incoming_message_queue_max_bytes(self):
+        """
+        The maximum total size (in bytes) of the payloads of the incoming messages which
+        are queued for processing. When the limit is reached, the receipt of further
+        messages blocks until enough queued messages have been processed (like
+        :attr:`incoming_message_queue_size`, which limits the number of queued messages).
+        A message which by itself exceeds the limit is queued once the queue is empty.
+
+        This allows the memory used by queued messages to be bounded regardless of the
+        size of the individual messages. Note that messages which are currently being
+        processed (at most one per thread) are not included.
+
+        Defaults to ``None`` (no limit)
+        """
+        return self._incoming_message_queue_max_bytes
+
+    @incoming_message_queue_max_bytes.setter
+    def incoming_message_queue_max_bytes(self, incoming_message_queue_max_bytes):
+        self._incoming_message_queue_max_bytes = incoming_message_queue_max_bytes
+
+    @property
+    def incoming_message_executor(self):
+        """
+        The executor used to process incoming messages. This may be a
+        :class:`dxlclient.executor.MessageExecutor` instance or an object providing a
+        ``submit(fn, *args, **kwargs)`` method, such as a ``concurrent.futures`` executor
+        (see :mod:`dxlclient.executor`). Executors specified via this property are not
+        shut down when the client is destroyed, so a single executor may be shared by
+        several clients.
+
+        When set, :attr:`incoming_message_queue_size`,
+        :attr:`incoming_message_queue_max_bytes` and
+        :attr:`incoming_message_thread_pool_size` are not used.
+
+        Defaults to ``None`` (each client creates its own pool of threads)
+        """
+        return self._incoming_message_executor
+
+    @incoming_message_executor.setter
+    def incoming_message_executor(self, incoming_message_executor):
+        self._incoming_message_executor = incoming_message_executor
+
+    @property
+    def named_incoming_message_executors(self):
+        """
+        A ``dict`` containing the named executors for incoming messages which have been
+        added via :func:`add_incoming_message_executor`. Each value is a ``dict`` with the
+        ``thread_pool_size``, ``queue_size``, ``queue_max_bytes``, ``discard_when_full``
+        and ``executor`` settings for the executor.
+        """
+        return OrderedDict(
+            (name, settings.copy()) for name, settings in
+            self._named_incoming_message_executors.items())
+
+    def add_incoming_message_executor(self, name, thread_pool_size=1,
+                                      queue_size=1000, discard_when_full=False,
+                                      executor=None, queue_max_bytes=None):
+        """
+        Adds a named executor (bulkhead) for processing incoming messages. Callbacks can be
+        associated with the executor when they are registered with the client, for example:
+
+        .. code-block:: python
+
+            config.add_incoming_message_executor("telemetry", thread_pool_size=2,
+                                                 queue_size=100, discard_when_full=True)
+
+            with DxlClient(config) as client:
+                client.add_event_callback("/telemetry/#", MyEventCallback(),
+                                          executor="telemetry")
+
+        Messages for callbacks which are associated with a named executor are processed
+        by the threads of that executor only. A slow or flooded family of topics therefore
+        does not occupy the threads (or queue) which process messages for the other
+        callbacks registered with the client.
+
+        :param name: The name of the executor
+        :param thread_pool_size: The number of threads for the executor
+        :param queue_size: The queue size for the executor
+        :param discard_when_full: Whether messages for the executor should be discarded
+            (rather than blocking the receipt of all incoming messages) when its queue is
+            full
+        :param executor: An optional executor to use rather than creating a pool of threads.
+            See :attr:`incoming_message_executor` for the supported types. When specified,
+            the remaining settings are not used.
+        :param queue_max_bytes: The maximum total size (in bytes) of the payloads of the
+            messages queued for the executor (see :attr:`incoming_message_queue_max_bytes`)
+        """
+        if not name:
+            raise ValueError("Missing executor name")
+        self._named_incoming_message_executors[name] = {
+            "thread_pool_size": thread_pool_size,
+            "queue_size": queue_size,
+            "discard_when_full": discard_when_full,
+            "queue_max_bytes": queue_max_bytes,
+            "executor": executor
+        }
+
+    @property
+    def callback_class_instances(self):
+        """
+        How callbacks which are registered as classes (rather than as instances) are
+        instantiated:
+
+        - :attr:`dxlclient.callbacks.MessageCallback.INSTANCE_PER_MESSAGE`: A new instance
+          of the class is created for each message
+        - :attr:`dxlclient.callbacks.MessageCallback.INSTANCE_SHARED`: A single instance of
+          the class is created when the callback is registered, and receives all messages.
+          The callback must be safe to use from multiple threads.
+        - :attr:`dxlclient.callbacks.MessageCallback.INSTANCE_PER_THREAD`: An instance of
+          the class is created for each thread which processes messages for the callback
+
+        Defaults to :attr:`dxlclient.callbacks.MessageCallback.INSTANCE_PER_MESSAGE`
+        """
+        return self._callback_class_instances
+
+    @callback_class_instances.setter
+    def callback_class_instances(self, callback_class_instances):
+        if callback_class_instances not in (MessageCallback.INSTANCE_PER_MESSAGE,
+                                            MessageCallback.INSTANCE_SHARED,
+                                            MessageCallback.INSTANCE_PER_THREAD):
+            raise ValueError("Unknown callback class instance strategy: " +
+                             str(callback_class_instances))
+        self._callback_class_instances = callback_class_instances
+
+    @property
+    def parallel_callback_fan_out(self):
+        """
+        Whether the callbacks which receive the same incoming message are invoked
+        concurrently. By default the callbacks for a message are invoked one after the
+        other by a single thread, so the time taken to process the message is the sum of
+        the time taken by each callback. When enabled, all but the first callback are
+        scheduled as separate tasks on the executor which is processing the message.
+
+        The callbacks receive the same message instance, which they must not modify.
+        Callbacks are invoked by the current thread when the executor's queue is full.
+
+        Defaults to ``False``
+        """
+        return self._parallel_callback_fan_out
+
+    @parallel_callback_fan_out.setter
+    def parallel_callback_fan_out(self, parallel_callback_fan_out):
+        self._parallel_callback_fan_out = parallel_callback_fan_out
+
+    @property
+    def single_flight_requests(self):
+        """
+        Whether concurrent identical synchronous requests
+        (:func:`dxlclient.client.DxlClient.sync_request`) share a single request. When enabled,
+        a request which has the same destination topic, service identifier and payload as a
+        request which is in flight is not sent; the caller receives the response to the
+        in-flight request instead. This greatly reduces the load on services when many threads
+        ask the same question at the same time.
+
+        The callers receive the same response instance, which they must not modify. A caller
+        which shares a request is bound by the timeout of the caller which sent it. Requests
+        can also be shared selectively by specifying a ``single_flight_key`` when invoking
+        :func:`dxlclient.client.DxlClient.sync_request`.
+
+        Defaults to ``False``
+        """
+        return self._single_flight_requests
+
+    @single_flight_requests.setter
+    def single_flight_requests(self, single_flight_requests):
+        self._single_flight_requests = single_flight_requests
+
+    @property
+    def response_caches(self):
+        """
+        A ``dict`` containing the response caches which have been added via
+        :func:`add_response_cache`, keyed by request topic. Each value is a ``dict`` with the
+        ``ttl``, ``max_entries``, ``max_bytes``, ``key_function`` and ``invalidation_topics``
+        settings for the cache.
+        """
+        return OrderedDict(
+            (topic, settings.copy()) for topic, settings in
+            self._response_caches.items())
+
+    def add_response_cache(self, topic, ttl, max_entries=1000, max_bytes=None,
+                           key_function=None, invalidation_topics=None):
+        """
+        Adds a cache of the responses to the requests which are sent to the specified topic,
+        for services whose responses change infrequently (reputation and configuration
+        lookups, for example):
+
+        .. code-block:: python
+
+            config.add_response_cache("/mycompany/reputation/file", ttl=300,
+                                      invalidation_topics=["/mycompany/reputation/changed"])
+
+        While a response is cached, identical requests
+        (:func:`dxlclient.client.DxlClient.sync_request` and
+        :func:`dxlclient.client.DxlClient.async_request`) receive the cached response without
+        being sent to the fabric. By default requests are identical when they have the same
+        destination topic, service identifier and payload. Error responses are never cached.
+
+        The callers receive the same response instance, which they must not modify.
+
+        :param topic: The request topic (wildcards are not supported)
+        :param ttl: The time (in seconds) that a response remains in the cache
+        :param max_entries: The maximum number of responses in the cache. The least recently
+            used responses are evicted when the cache is full.
+        :param max_bytes: The maximum total size (in bytes) of the payloads of the responses
+            in the cache (``None`` for no limit)
+        :param key_function: An optional function which returns the cache key (a hashable
+            value) for a :class:`dxlclient.message.Request`
+        :param invalidation_topics: An optional list of event topics. All of the responses in
+            the cache are discarded when an event is received on one of these topics.
+        """
+        if not topic:
+            raise ValueError("Missing topic")
+        if ttl <= 0:
+            raise ValueError("The time-to-live must be greater than 0")
+        if max_entries < 1:
+            raise ValueError("The maximum number of entries must be at least 1")
+        self._response_caches[topic] = {
+            "ttl": ttl,
+            "max_entries": max_entries,
+            "max_bytes": max_bytes,
+            "key_function": key_function,
+            "invalidation_topics": list(invalidation_topics or [])
+        }
+
+    @property
+    def send_limits(self):
+        """
+        A ``dict`` containing the send limits which have been added via :func:`add_send_limit`,
+        keyed by topic. Each value is a ``dict`` with the ``max_in_flight``, ``rate``,
+        ``burst``, ``policy``, ``max_wait`` and ``max_queued`` settings for the limit.
+        """
+        return OrderedDict(
+            (topic, settings.copy()) for topic, settings in
+            self._send_limits.items())
+
+    def add_send_limit(self, topic, max_in_flight=None, rate=None, burst=None,
+                       policy=SEND_LIMIT_BLOCK, max_wait=None, max_queued=None):
+        """
+        Limits the number of requests in flight and the rate at which requests and events are
+        sent to the specified topic, so that a burst of messages does not flood a service:
+
+        .. code-block:: python
+
+            config.add_send_limit("/mycompany/reputation/#", max_in_flight=50, rate=200,
+                                  policy=DxlClientConfig.SEND_LIMIT_QUEUE)
+
+        The limit applies to :func:`dxlclient.client.DxlClient.sync_request`,
+        :func:`dxlclient.client.DxlClient.async_request` (and the methods which are based on
+        it) and :func:`dxlclient.client.DxlClient.send_event`. A request is in flight until its
+        response is received, it expires, or (for synchronous requests) the wait for its
+        response ends. An asynchronous request which never receives a response occupies its
+        slot indefinitely, so asynchronous requests to limited topics should be sent with a
+        timeout.
+
+        When the limit has been reached, the policy determines what happens to a message:
+
+        - :attr:`SEND_LIMIT_BLOCK`: The sending thread waits (up to ``max_wait`` seconds)
+        - :attr:`SEND_LIMIT_FAIL`: The message is rejected immediately
+        - :attr:`SEND_LIMIT_QUEUE`: Asynchronous requests and events are queued (up to
+          ``max_queued`` messages), and sent by the threads of the client once the limit
+          allows. Synchronous requests wait as with :attr:`SEND_LIMIT_BLOCK`.
+
+        A rejected message raises a :class:`dxlclient.exceptions.SendLimitExceededException`.
+        See :attr:`dxlclient.client.DxlClient.send_limit_statistics` for the wait times and the
+        number of rejected messages.
+
+        :param topic: The topic, which may be a wildcard (for example, ``/mycompany/#`` or
+            ``/mycompany/+/lookup``). A limit for a specific topic takes precedence over the
+            limits for wildcards, which are matched from the most specific to the least.
+        :param max_in_flight: The maximum number of requests in flight (``None`` for no limit)
+        :param rate: The maximum number of messages sent per second (``None`` for no limit)
+        :param burst: The number of messages which may be sent at once after a quiet period
+            (``None`` to use ``rate``)
+        :param policy: :attr:`SEND_LIMIT_BLOCK` (the default), :attr:`SEND_LIMIT_FAIL` or
+            :attr:`SEND_LIMIT_QUEUE`
+        :param max_wait: The maximum time (in seconds) that a sending thread waits for the
+            limit (``None`` to wait indefinitely, or up to the timeout of a synchronous
+            request)
+        :param max_queued: The maximum number of queued messages (``None`` for no limit)
+        """
+        # pylint: disable=too-many-arguments
+        if not topic:
+            raise ValueError("Missing topic")
+        if max_in_flight is None and not rate:
+            raise ValueError("Either max_in_flight or rate must be specified")
+        if policy not in (self.SEND_LIMIT_BLOCK, self.SEND_LIMIT_FAIL,
+                          self.SEND_LIMIT_QUEUE):
+            raise ValueError("Unknown send limit policy: " + str(policy))
+        self._send_limits[topic] = {
+            "max_in_flight": max_in_flight,
+            "rate": rate,
+            "burst": burst,
+            "policy": policy,
+            "max_wait": max_wait,
+            "max_queued": max_queued
+        }
+
+    @property
+    def request_hedging(self):
+        """
+        A ``dict`` containing the request hedging policies which have been added via
+        :func:`add_request_hedging`, keyed by request topic. Each value is a ``dict`` with the
+        ``percentile``, ``initial_delay``, ``min_delay``, ``max_hedges`` and ``service_ids``
+        settings for the policy.
+        """
+        return OrderedDict(
+            (topic, settings.copy()) for topic, settings in
+            self._request_hedging.items())
+
+    def add_request_hedging(self, topic, percentile=95, initial_delay=1.0,
+                            min_delay=0, max_hedges=1, service_ids=None):
+        """
+        Hedges the requests which are sent to the specified topic. If no response to a request
+        has been received after a delay (by default the 95th percentile of the recent response
+        times on the topic), a copy of the request (a hedge) is sent. The first response to
+        either copy is delivered, and the later responses are dropped. This reduces the
+        latency caused by occasional slow service instances:
+
+        .. code-block:: python
+
+            config.add_request_hedging("/mycompany/reputation/file", percentile=95,
+                                       service_ids=["<instance 1>", "<instance 2>"])
+
+        Hedging applies to :func:`dxlclient.client.DxlClient.sync_request` and
+        :func:`dxlclient.client.DxlClient.async_request` (and the methods which are based on
+        it). It must only be used for idempotent requests, because the service may receive
+        (and respond to) several copies of a request. See
+        :attr:`dxlclient.client.DxlClient.hedge_count` for the number of hedges sent.
+
+        :param topic: The request topic (wildcards are not supported)
+        :param percentile: The percentile of the response times (of the last 100 responses on
+            the topic) after which a hedge is sent
+        :param initial_delay: The delay (in seconds) after which a hedge is sent until 10
+            responses have been received on the topic
+        :param min_delay: The minimum delay (in seconds) after which a hedge is sent
+        :param max_hedges: The maximum number of hedges sent for a request. Each hedge is sent
+            after a further delay.
+        :param service_ids: An optional list of the identifiers of the service instances (see
+            :attr:`dxlclient.message.Request.service_id`) which register the topic. Each hedge
+            is sent to an instance which has not been sent a copy of the request yet.
+        """
+        # pylint: disable=too-many-arguments
+        if not topic:
+            raise ValueError("Missing topic")
+        if not 0 < percentile <= 100:
+            raise ValueError("The percentile must be greater than 0 and at most 100")
+        if max_hedges < 1:
+            raise ValueError("The maximum number of hedges must be at least 1")
+        self._request_hedging[topic] = {
+            "percentile": percentile,
+            "initial_delay": initial_delay,
+            "min_delay": min_delay,
+            "max_hedges": max_hedges,
+            "service_ids": service_ids
+        }
+
+    @property
+    def slow_callback_threshold(self):
+        """
+        The time (in seconds) after which the processing of an incoming message by a
+        callback is considered slow. When set, a watchdog thread logs a warning (including
+        the topic, the callback, and a snapshot of the stack of the thread running it) for
+        each callback which exceeds this time. The watchdog also reports when all of the
+        threads of an incoming message thread pool are busy while its queue grows, and when
+        the thread receiving messages from the fabric is blocked queueing a message for
+        longer than this time (because the queue is full).
+
+        Defaults to ``None`` (the watchdog is disabled)
+        """
+        return self._slow_callback_threshold
+
+    @slow_callback_threshold.setter
+    def slow_callback_threshold(self, slow_callback_threshold):
+        self._slow_callback_threshold = slow_callback_threshold
+
     @property
     def connect_retries(self):
         """
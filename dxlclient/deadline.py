@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2018 McAfee LLC - All Rights Reserved.
+################################################################################
+
+"""
+Request deadlines.
+
+When a :class:`dxlclient.message.Request` is sent with a timeout (see
+:func:`dxlclient.client.DxlClient.sync_request` and
+:func:`dxlclient.client.DxlClient.async_request`), the client stamps the absolute time at
+which the invoker stops waiting for the response into the
+:attr:`dxlclient.message.Message.other_fields` of the request (see :data:`DEADLINE_FIELD`).
+
+A service drops the requests whose deadline has passed before they are dispatched to its
+callbacks (see :attr:`dxlclient.client.DxlClient.expired_service_request_count`). While a
+callback is handling a request, the remaining time is available via
+:func:`get_remaining_time`, and the requests which the callback sends (on the same thread)
+inherit the deadline:
+
+.. code-block:: python
+
+    from dxlclient import deadline
+
+    class MyRequestCallback(RequestCallback):
+        def on_request(self, request):
+            remaining = deadline.get_remaining_time()
+            if remaining is not None and remaining < 0.5:
+                # Not enough time left to do the work
+                ...
+
+Deadlines are wall-clock times, so the clocks of the invoking and the servicing hosts should
+be synchronized.
+"""
+
+from __future__ import absolute_import
+import threading
+import time
+
+__all__ = ["DEADLINE_FIELD", "get_deadline", "get_remaining_time"]
+
+#: The name of the field (in :attr:`dxlclient.message.Message.other_fields`) which contains the
+#: deadline of a request: the time (in seconds since the epoch) after which the invoker no longer
+#: waits for its response.
+DEADLINE_FIELD = "dxl.deadline"
+
+# The deadline of the request which is being handled by the current thread
+_current = threading.local()
+
+
+def get_deadline(request):
+    """
+    Returns the deadline of the specified request.
+
+    :param request: The :class:`dxlclient.message.Request`
+    :return: The deadline (in seconds since the epoch), or ``None`` if the request does not
+        have a deadline
+    """
+    value = request.other_fields.get(DEADLINE_FIELD)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def get_remaining_time(request=None):
+    """
+    Returns the time remaining until the deadline of the specified request or, if no request
+    is specified, of the request which is being handled by the current thread.
+
+    :param request: An optional :class:`dxlclient.message.Request`
+    :return: The remaining time (in seconds, negative if the deadline has passed), or ``None``
+        if the request does not have a deadline
+    """
+    deadline = get_deadline(request) if request is not None \
+        else getattr(_current, "deadline", None)
+    return None if deadline is None else deadline - time.time()
+
+
+def _stamp_deadline(request, timeout):
+    """
+    Stamps the deadline into a request which is about to be sent: the earliest of the
+    deadline which is already set on the request, the deadline of the request which is being
+    handled by the current thread (if any), and the deadline implied by the timeout.
+
+    :param request: The :class:`dxlclient.message.Request`
+    :param timeout: The time (in seconds) that the invoker waits for the response (``None``
+        if the invoker waits indefinitely)
+    """
+    deadlines = [deadline for deadline in
+                 (get_deadline(request), getattr(_current, "deadline", None),
+                  None if timeout is None else time.time() + timeout)
+                 if deadline is not None]
+    if deadlines:
+        request.other_fields[DEADLINE_FIELD] = repr(min(deadlines))
+
+
+def _is_expired(request):
+    """
+    Returns whether the deadline of the specified request has passed.
+
+    :param request: The :class:`dxlclient.message.Request`
+    :return: True if the request has a deadline which has passed; False otherwise
+    """
+    deadline = get_deadline(request)
+    return deadline is not None and deadline <= time.time()
+
+
+class _HandlingDeadline(object):
+    """
+    Context manager which makes the deadline of a request the deadline of the current thread
+    while the request is handled.
+    """
+
+    def __init__(self, request):
+        self._deadline = get_deadline(request)
+        self._previous = None
+
+    def __enter__(self):
+        self._previous = getattr(_current, "deadline", None)
+        _current.deadline = self._deadline
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _current.deadline = self._previous
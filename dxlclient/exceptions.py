@@ -40,3 +40,11 @@ class NoBrokerSpecifiedError(Exception):
     """
      Exception raised when no brokers are specified
     """
+
+
+class SendLimitExceededException(DxlException):
+    """
+    Exception that is raised when a message is not sent because the send limit
+    for its topic has been reached (see
+    :func:`dxlclient.client_config.DxlClientConfig.add_send_limit`)
+    """
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2018 McAfee LLC - All Rights Reserved.
+################################################################################
+
+"""
+Classes used to execute the processing of incoming DXL messages (decoding messages and
+invoking the registered callbacks).
+
+By default each :class:`dxlclient.client.DxlClient` creates its own pool of threads for
+processing incoming messages (see
+:attr:`dxlclient.client_config.DxlClientConfig.incoming_message_thread_pool_size`). An
+alternate executor can be specified via the
+:attr:`dxlclient.client_config.DxlClientConfig.incoming_message_executor` property. This
+allows, for example, several clients to share an application-wide pool of threads.
+
+The following example shares a ``concurrent.futures`` thread pool between two clients:
+
+.. code-block:: python
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    from dxlclient.client import DxlClient
+
+    executor = ThreadPoolExecutor(max_workers=8)
+    config.incoming_message_executor = executor
+
+    with DxlClient(config) as client1, DxlClient(config) as client2:
+        ...
+
+    executor.shutdown()
+
+Objects which provide a ``submit(fn, *args, **kwargs)`` method (such as ``concurrent.futures``
+executors) are automatically wrapped in a :class:`FuturesMessageExecutor`. Other schedulers
+(for example, a gevent pool) can be used by deriving from :class:`MessageExecutor`.
+
+**NOTE:** Executors which are provided via the client configuration are not shut down when
+the client is destroyed. Their lifecycle is managed by the application.
+"""
+
+from __future__ import absolute_import
+import logging
+import threading
+
+from dxlclient import _BaseObject
+
+__all__ = ["MessageExecutor", "FuturesMessageExecutor"]
+
+logger = logging.getLogger(__name__)
+
+
+class MessageExecutor(_BaseObject):
+    """
+    Base class for executors which run the tasks used to process incoming DXL messages.
+
+    Concrete implementations must implement the :func:`add_task` method.
+    """
+
+    def add_task(self, func, *args, **kwargs):
+        """
+        Schedules the specified task for execution. This method is invoked on the thread
+        which receives messages from the DXL fabric; implementations may block when they
+        are at capacity, which applies back-pressure to the fabric connection.
+
+        :param func: The function to invoke
+        :param args: The positional arguments to invoke the function with
+        :param kwargs: The keyword arguments to invoke the function with
+        """
+        raise NotImplementedError("Must be implemented in a child class.")
+
+    def add_sized_task(self, size, func, *args, **kwargs):  # pylint: disable=unused-argument
+        """
+        Schedules the specified task, which processes a message of the specified size,
+        for execution. Executors which limit the memory used by queued messages can
+        override this method. The default implementation ignores the size and invokes
+        :func:`add_task`.
+
+        :param size: The size of the message (in bytes)
+        :param func: The function to invoke
+        :param args: The positional arguments to invoke the function with
+        :param kwargs: The keyword arguments to invoke the function with
+        """
+        self.add_task(func, *args, **kwargs)
+
+    def try_add_task(self, func, *args, **kwargs):
+        """
+        Schedules the specified task for execution if this can be done without blocking.
+        This is used by tasks which schedule further tasks on the same executor (which
+        could otherwise deadlock when the executor is at capacity). The default
+        implementation invokes :func:`add_task`.
+
+        :param func: The function to invoke
+        :param args: The positional arguments to invoke the function with
+        :param kwargs: The keyword arguments to invoke the function with
+        :return: True if the task was scheduled; False otherwise
+        """
+        self.add_task(func, *args, **kwargs)
+        return True
+
+    def wait_completion(self):
+        """
+        Waits for all of the tasks which have been scheduled to complete. The default
+        implementation returns immediately.
+        """
+        pass
+
+    def shutdown(self, wait_complete=True):
+        """
+        Shuts down the executor (releases resources). This is only invoked for executors
+        which are created by the client itself. The default implementation does nothing.
+
+        :param wait_complete: Whether to wait for scheduled tasks to complete
+        """
+        pass
+
+
+class FuturesMessageExecutor(MessageExecutor):
+    """
+    Adapts an object which provides a ``submit(fn, *args, **kwargs)`` method (for example,
+    a ``concurrent.futures.ThreadPoolExecutor``) to the :class:`MessageExecutor` interface.
+
+    Only tasks which were scheduled through this adapter are considered by
+    :func:`wait_completion`, so several clients may safely share the same underlying
+    executor (each through its own adapter).
+    """
+
+    def __init__(self, executor):
+        """
+        Constructor parameters:
+
+        :param executor: The underlying executor (must provide a ``submit`` method)
+        """
+        super(FuturesMessageExecutor, self).__init__()
+        if not callable(getattr(executor, "submit", None)):
+            raise ValueError("Executor must provide a submit method")
+        self._executor = executor
+        # The number of tasks which have been submitted but not yet completed
+        self._pending_count = 0
+        self._pending_condition = threading.Condition()
+
+    @property
+    def executor(self):
+        """
+        The underlying executor
+        """
+        return self._executor
+
+    def _run_task(self, func, args, kwargs):
+        """
+        Runs the specified task and tracks its completion.
+        """
+        try:
+            func(*args, **kwargs)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Error in message executor task")
+        finally:
+            with self._pending_condition:
+                self._pending_count -= 1
+                if not self._pending_count:
+                    self._pending_condition.notify_all()
+
+    def add_task(self, func, *args, **kwargs):
+        with self._pending_condition:
+            self._pending_count += 1
+        try:
+            self._executor.submit(self._run_task, func, args, kwargs)
+        except Exception:
+            with self._pending_condition:
+                self._pending_count -= 1
+                if not self._pending_count:
+                    self._pending_condition.notify_all()
+            raise
+
+    def wait_completion(self):
+        with self._pending_condition:
+            while self._pending_count:
+                self._pending_condition.wait()
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2018 McAfee LLC - All Rights Reserved.
+################################################################################
+
+"""
+Contains the :class:`DxlFuture` class, which represents the result of an
+asynchronous DXL operation (for example, the broker acknowledging a
+subscription requested via :func:`dxlclient.client.DxlClient.subscribe_async`).
+
+:class:`DxlFuture` is a ``concurrent.futures.Future`` (provided on Python 2 by
+the ``futures`` package), so it can be consumed by ``concurrent.futures.wait``,
+``concurrent.futures.as_completed`` and ``asyncio.wrap_future``:
+
+.. code-block:: python
+
+    future = client.subscribe_async("/testeventtopic")
+    ...
+    future.result()  # Raises a WaitTimeoutException if the ack never arrived
+"""
+
+from __future__ import absolute_import
+from concurrent import futures
+import threading
+
+__all__ = ["DxlFuture"]
+
+
+class DxlFuture(futures.Future):
+    """
+    The result of an asynchronous DXL operation. The operation completes the
+    future via :func:`set_result` or :func:`set_exception`; consumers wait for
+    it via :func:`result` or :func:`exception`, or are notified via
+    :func:`add_done_callback`.
+
+    The operation is running from the moment that the future is created. DXL
+    operations cannot be cancelled once they have been started, so
+    :func:`cancel` always returns ``False``. Waiting via :func:`result` or
+    :func:`exception` raises a ``concurrent.futures.TimeoutError`` if the
+    operation does not complete in time.
+    """
+
+    def __init__(self):
+        super(DxlFuture, self).__init__()
+        self.set_running_or_notify_cancel()
+        self._completing = False
+        self._completing_lock = threading.Lock()
+
+    def _claim(self):
+        """
+        Claims the right to complete the future.
+
+        :return: True if the future was claimed; False if it had already been
+            completed
+        """
+        with self._completing_lock:
+            if self._completing:
+                return False
+            self._completing = True
+            return True
+
+    def set_result(self, result):
+        """
+        Completes the operation with the specified result. This is invoked by
+        the operation itself. Once the future is complete, subsequent calls
+        are ignored.
+
+        :param result: The result
+        :return: True if the future was completed; False if it had already
+            been completed
+        """
+        if not self._claim():
+            return False
+        super(DxlFuture, self).set_result(result)
+        return True
+
+    def set_exception(self, exception):
+        """
+        Completes the operation with the specified exception. This is invoked
+        by the operation itself. Once the future is complete, subsequent calls
+        are ignored.
+
+        :param exception: The exception
+        :return: True if the future was completed; False if it had already
+            been completed
+        """
+        if not self._claim():
+            return False
+        super(DxlFuture, self).set_exception(exception)
+        return True
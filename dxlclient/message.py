@@ -380,6 +380,36 @@ class Message(ABCMeta('ABC', (_BaseObject,), {'__slots__': ()})): # compatible m
 
         raise DxlException("Unknown message type: " + message_type)
 
+    @staticmethod
+    def _peek_routing_info(raw):
+        """
+        Reads only the leading members of the specified array of bytes which
+        are needed to route the message, without constructing a concrete
+        message instance.
+
+        :param raw: {@code list} of bytes.
+        :returns: A tuple containing the numeric message type and, for
+            response messages, the identifier of the request message that the
+            response is for (``None`` for other message types).
+        """
+        buf = BytesIO(raw)
+        buf.seek(0)
+        unpacker = msgpack.Unpacker(buf)
+        next(unpacker) # version
+        message_type = next(unpacker)
+
+        request_message_id = None
+        if message_type in (Message.MESSAGE_TYPE_RESPONSE,
+                            Message.MESSAGE_TYPE_ERROR):
+            # Skip the version 0 members which precede the request message
+            # identifier: message id, source client id, source broker id,
+            # broker ids, client ids, and payload.
+            for _ in range(6):
+                unpacker.skip()
+            request_message_id = Message._unpack_next_unicode_string(unpacker)
+
+        return message_type, request_message_id
+
     @staticmethod
     def _decode_to_unicode_string(obj):
         return None if obj is None else obj.decode('utf8')
@@ -595,8 +625,16 @@ class ErrorResponse(Response):
     :class:`Request` messages. The error response may indicate the inability to locate a service to handle the
     request or an internal error within the service itself. Error response messages are sent using the
     :func:`dxlclient.client.DxlClient.send_response` method of a client instance.
+
+    The client itself delivers an error response with the :attr:`TIMEOUT_ERROR_CODE` error code to the
+    callback of an asynchronous request which has not received a response within its timeout (see
+    :func:`dxlclient.client.DxlClient.async_request`).
     """
 
+    # The error code of the error responses which are generated by the client when
+    # no response to an asynchronous request is received in time
+    TIMEOUT_ERROR_CODE = 0x80000002
+
     def __init__(self, request, error_code=0, error_message=""):
         """
         Constructor parameters:
@@ -15,6 +15,7 @@ from dxlclient import _BaseObject
 from dxlclient._callback_manager import _RequestCallbackManager
 from dxlclient._uuid_generator import UuidGenerator
 from dxlclient.callbacks import RequestCallback
+from dxlclient.deadline import _HandlingDeadline, _is_expired
 from dxlclient.exceptions import DxlException
 from dxlclient.message import Message, Request, ErrorResponse
 
@@ -215,7 +216,8 @@ class ServiceRegistrationInfo(_BaseObject):
 
         :param topic:  The topic for the service to respond to
         :param callback: The :class:`dxlclient.callbacks.RequestCallback` that will be invoked when a
-            :class:`dxlclient.message.Request` message is received
+            :class:`dxlclient.message.Request` message is received. A plain function (or coroutine function)
+            which accepts the request may also be specified.
         """
         # TODO: use dictionary get method
         try:
@@ -357,9 +359,10 @@ class _ServiceRegistrationHandler(_BaseObject):
         if not service_ref:
             raise DxlException("Service no longer valid")
 
-        for channel, callbacks in iter_dict_items(service_ref._callbacks_by_topic):
-            for callback in callbacks:
-                self.request_callbacks.add_callback(channel, callback)
+        self.request_callbacks.add_callbacks(
+            (channel, callback)
+            for channel, callbacks in iter_dict_items(service_ref._callbacks_by_topic)
+            for callback in callbacks)
 
     def __del__(self):
         """destructor"""
@@ -565,6 +568,18 @@ class _ServiceManager(RequestCallback):
         self.services = {}
 
         self.lock = RLock()
+        # The number of requests which were dropped because their deadline
+        # had passed before they were dispatched
+        self._expired_request_count = 0
+        self._expired_request_count_lock = RLock()
+
+    @property
+    def expired_request_count(self):
+        """
+        The number of requests which were dropped because their deadline (see
+        :mod:`dxlclient.deadline`) had passed before they were dispatched
+        """
+        return self._expired_request_count
 
     def destroy(self):
         """Destroys the service manager (releases resources)"""
@@ -599,9 +614,9 @@ class _ServiceManager(RequestCallback):
             services[service_reg_info._service_id] = service_handler
 
             # Subscribe channels
-            for channel in service_reg_info.topics:
-                self.__client.subscribe(channel)
-                self.__client.add_request_callback(channel, self)
+            self.__client.subscribe_topics(service_reg_info.topics)
+            self.__client.add_request_callbacks(
+                dict((channel, self) for channel in service_reg_info.topics))
 
             if self.__client.connected:
                 service_handler.start_timer()
@@ -660,24 +675,34 @@ class _ServiceManager(RequestCallback):
         :param request: The request.
         :return: None.
         """
+        # The invoker no longer waits for the response to a request whose
+        # deadline has passed, so it is not worth handling
+        if _is_expired(request):
+            with self._expired_request_count_lock:
+                self._expired_request_count += 1
+            logger.debug("Dropping request %s, its deadline has passed",
+                         request.message_id)
+            return
+
         # Store the current value of self.services in a local variable before
         # accessing its contents. This should ensure that if
         # self.callbacks_by_channel is reassigned after the lock is released
         # that no concurrent modification errors are encountered.
         services = self.services
         service_instance_id = request.service_id
-        if not service_instance_id:
-            for service_id in services:
-                self._on_request(services[service_id], request)
-        else:
-            service_registration_handler = services.get(service_instance_id)
-            if service_registration_handler:
-                self._on_request(service_registration_handler, request)
+        with _HandlingDeadline(request):
+            if not service_instance_id:
+                for service_id in services:
+                    self._on_request(services[service_id], request)
             else:
-                logger.warning(
-                    "No service with GUID %s registered. Ignoring request.",
-                    service_instance_id)
-                self.send_service_not_found_error_message(request)
+                service_registration_handler = services.get(service_instance_id)
+                if service_registration_handler:
+                    self._on_request(service_registration_handler, request)
+                else:
+                    logger.warning(
+                        "No service with GUID %s registered. Ignoring request.",
+                        service_instance_id)
+                    self.send_service_not_found_error_message(request)
 
     def send_service_not_found_error_message(self, request):
         """
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2018 McAfee LLC - All Rights Reserved.
+################################################################################
+
+"""
+Test cases for the asyncio facade (AsyncDxlClient)
+"""
+
+# Run with python -m unittest dxlclient.test.test_aio
+
+from __future__ import absolute_import
+import sys
+import threading
+import unittest
+
+from mock import Mock
+
+from dxlclient import Event, Request, Response, ErrorResponse, WaitTimeoutException
+
+if sys.version_info >= (3, 5):
+    import asyncio
+    from dxlclient.aio import AsyncDxlClient
+
+# pylint: disable=missing-docstring
+
+
+@unittest.skipIf(sys.version_info < (3, 5), "asyncio facade requires Python 3.5 or later")
+class AsyncDxlClientTest(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.client = Mock()
+        self.aio_client = AsyncDxlClient(self.client, self.loop)
+
+    def tearDown(self):
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+    def respond_from_thread(self, response):
+        callback = self.client.async_request.call_args[0][1]
+        thread = threading.Thread(target=callback, args=[response])
+        thread.start()
+        return thread
+
+    def test_request_is_completed_from_another_thread(self):
+        request = Request("/test")
+        future = self.aio_client.request(request, 10)
+        self.assertEqual(10, self.client.async_request.call_args[0][2])
+        response = Response(request)
+        thread = self.respond_from_thread(response)
+        self.assertIs(response, self.loop.run_until_complete(future))
+        thread.join()
+
+    def test_request_timeout_fails_future(self):
+        request = Request("/test")
+        future = self.aio_client.request(request, 10)
+        thread = self.respond_from_thread(
+            ErrorResponse(request, ErrorResponse.TIMEOUT_ERROR_CODE))
+        with self.assertRaises(WaitTimeoutException):
+            self.loop.run_until_complete(future)
+        thread.join()
+
+    def test_cancelled_request_is_abandoned(self):
+        request = Request("/test")
+        future = self.aio_client.request(request)
+        future.cancel()
+        self.loop.run_until_complete(asyncio.sleep(0))
+        self.client._cancel_async_request.assert_called_once_with(request.message_id)
+
+    def test_completed_request_is_not_abandoned(self):
+        request = Request("/test")
+        future = self.aio_client.request(request)
+        thread = self.respond_from_thread(Response(request))
+        self.loop.run_until_complete(future)
+        thread.join()
+        self.assertFalse(self.client._cancel_async_request.called)
+
+    def test_events_are_discarded_when_queue_is_full(self):
+        stream = self.aio_client.events("/test", queue_size=2)
+        callback = self.client.add_event_callback.call_args[0][1]
+        events = [Event("/test") for _ in range(3)]
+        for event in events:
+            callback(event)
+        self.loop.run_until_complete(asyncio.sleep(0))
+        self.assertEqual(1, stream.discarded_count)
+        self.assertIs(events[0], self.loop.run_until_complete(stream.__anext__()))
+        self.assertIs(events[1], self.loop.run_until_complete(stream.__anext__()))
+        stream.close()
+        with self.assertRaises(StopAsyncIteration):
+            self.loop.run_until_complete(stream.__anext__())
+
+    def test_events_are_iterated(self):
+        stream = self.aio_client.events("/test/#")
+        topic, callback, subscribe = self.client.add_event_callback.call_args[0]
+        self.assertEqual(("/test/#", True), (topic, subscribe))
+        events = [Event("/test/" + str(index)) for index in range(3)]
+        threads = [threading.Thread(target=callback, args=[event]) for event in events]
+        for thread in threads:
+            thread.start()
+
+        received = [self.loop.run_until_complete(stream.__anext__())
+                    for _ in range(len(events))]
+        stream.close()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(event.destination_topic for event in events),
+                         sorted(event.destination_topic for event in received))
+        self.client.remove_event_callback.assert_called_once_with("/test/#", callback, True)
+        with self.assertRaises(StopAsyncIteration):
+            self.loop.run_until_complete(stream.__anext__())
+
+    def test_coroutine_callback_runs_on_loop(self):
+        handled = []
+        namespace = {"handled": handled}
+        exec("async def on_request(request):\n    handled.append(request)\n", namespace)
+        on_request = namespace["on_request"]
+
+        callback = self.aio_client.coroutine_callback(on_request)
+        request = Request("/test")
+        thread = threading.Thread(target=callback, args=[request])
+        thread.start()
+        thread.join()
+        self.loop.run_until_complete(asyncio.sleep(0.01))
+        self.assertEqual([request], handled)
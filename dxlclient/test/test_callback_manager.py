@@ -10,11 +10,20 @@ Test cases for the CallbackManager class
 # Run with python -m unittest dxlclient.test.test_callback_manager
 
 from __future__ import absolute_import
+import gc
+import sys
+import threading
 import unittest
 
+from mock import Mock
+
 from dxlclient import callbacks
+from dxlclient.message import Event
 import dxlclient._callback_manager as callback_manager
 
+if sys.version_info >= (3, 5):
+    import asyncio
+
 # pylint: disable=missing-docstring
 
 
@@ -198,3 +207,162 @@ class CallbackManagerTest(unittest.TestCase):
             cbm.add_callback("/test", callback)
         self.assertEqual(None, cbm.callbacks_by_channel.get("/test"))
         self.assertEqual(0, len(cbm.callbacks_by_channel))
+
+    def test_event_callback_manager_fires_by_executor(self):
+        cbm = callback_manager._EventCallbackManager()
+        default_callback = MockEventCallback()
+        default_callback.on_event = Mock()
+        telemetry_callback = MockEventCallback()
+        telemetry_callback.on_event = Mock()
+        cbm.add_callback("/test/#", telemetry_callback, "telemetry")
+        cbm.add_callback("/test/event", default_callback)
+        self.assertEqual(set([None, "telemetry"]),
+                         cbm.get_executors("/test/event"))
+        self.assertEqual(set(["telemetry"]), cbm.get_executors("/test/other"))
+        self.assertEqual(set(), cbm.get_executors("/other"))
+
+        event = Event("/test/event")
+        cbm.fire_message(event, "telemetry")
+        self.assertEqual(0, default_callback.on_event.call_count)
+        telemetry_callback.on_event.assert_called_once_with(event)
+        cbm.fire_message(event)
+        default_callback.on_event.assert_called_once_with(event)
+        self.assertEqual(1, telemetry_callback.on_event.call_count)
+
+        cbm.remove_callback("/test/#", telemetry_callback)
+        self.assertEqual({}, cbm.executors_by_channel)
+        self.assertEqual(set([None]), cbm.get_executors("/test/event"))
+
+    def test_callback_manager_caches_dispatch_tables(self):
+        cbm = callback_manager._EventCallbackManager()
+        first_callback = MockEventCallback()
+        second_callback = MockEventCallback()
+        cbm.add_callback("/test/#", first_callback)
+        dispatchers = cbm.get_dispatchers("/test/event")
+        self.assertEqual((first_callback,),
+                         tuple(callback for callback, _ in dispatchers))
+        self.assertIs(dispatchers, cbm.get_dispatchers("/test/event"))
+        self.assertEqual(1, len(cbm.dispatch_tables))
+
+        # Registration changes invalidate the cached tables
+        cbm.add_callback("/test/event", second_callback)
+        self.assertEqual(0, len(cbm.dispatch_tables))
+        self.assertEqual((second_callback, first_callback),
+                         tuple(callback for callback, _
+                               in cbm.get_dispatchers("/test/event")))
+        cbm.remove_callback("/test/#", first_callback)
+        self.assertEqual((second_callback,),
+                         tuple(callback for callback, _
+                               in cbm.get_dispatchers("/test/event")))
+
+    def test_callback_manager_dispatch_table_cache_is_bounded(self):
+        cbm = callback_manager._EventCallbackManager()
+        cbm.add_callback("/test/#", MockEventCallback())
+        for index in range(callback_manager._DISPATCH_TABLE_CACHE_SIZE + 10):
+            cbm.has_callbacks("/test/" + str(index))
+        self.assertEqual(callback_manager._DISPATCH_TABLE_CACHE_SIZE,
+                         len(cbm.dispatch_tables))
+        # The least recently used tables are evicted
+        self.assertIsNone(cbm.dispatch_tables.get("/test/0"))
+
+    def test_event_callback_manager_class_callback_instances(self):
+        instances = []
+
+        class CountingEventCallback(callbacks.EventCallback):
+            def __init__(self):
+                super(CountingEventCallback, self).__init__()
+                instances.append(self)
+
+            def on_event(self, event):
+                pass
+
+        event = Event("/test")
+        for strategy, expected_count in (
+                (callbacks.MessageCallback.INSTANCE_PER_MESSAGE, 2),
+                (callbacks.MessageCallback.INSTANCE_SHARED, 1),
+                (callbacks.MessageCallback.INSTANCE_PER_THREAD, 1)):
+            del instances[:]
+            cbm = callback_manager._EventCallbackManager()
+            cbm.class_callback_instances = strategy
+            cbm.add_callback("/test", CountingEventCallback)
+            cbm.fire_message(event)
+            cbm.fire_message(event)
+            self.assertEqual(expected_count, len(instances), strategy)
+
+        cbm = callback_manager._EventCallbackManager()
+        cbm.class_callback_instances = "unknown"
+        with self.assertRaises(ValueError):
+            cbm.add_callback("/test", CountingEventCallback)
+
+    def test_event_callback_manager_with_function_callback(self):
+        cbm = callback_manager._EventCallbackManager()
+        callback = Mock()
+        cbm.add_callback("/test", callback)
+        self.assertEqual([callback], cbm.callbacks_by_channel.get("/test"))
+        event = Event("/test")
+        cbm.fire_message(event)
+        callback.assert_called_once_with(event)
+        cbm.remove_callback("/test", callback)
+        self.assertEqual(0, len(cbm.callbacks_by_channel))
+        with self.assertRaises(ValueError):
+            cbm.add_callback("/test", "not a callback")
+
+    @unittest.skipIf(sys.version_info < (3, 5),
+                     "Coroutines require Python 3.5 or later")
+    def test_event_callback_manager_with_coroutine_callback(self):
+        events = []
+        namespace = {"events": events}
+        exec("async def on_event(event):\n    events.append(event)\n",
+             namespace)
+        cbm = callback_manager._EventCallbackManager()
+        cbm.add_callback("/test", namespace["on_event"])
+        event = Event("/test")
+        cbm.fire_message(event)
+        self.assertEqual([event], events)
+
+    @unittest.skipIf(sys.version_info < (3, 5),
+                     "Coroutines require Python 3.5 or later")
+    def test_coroutine_event_loop_is_closed_when_thread_exits(self):
+        loops = []
+        namespace = {"asyncio": asyncio, "loops": loops}
+        exec("async def on_event(event):\n"
+             "    loops.append(asyncio.get_event_loop())\n", namespace)
+        fire = callback_manager._resolve_function(namespace["on_event"])
+        thread = threading.Thread(target=fire, args=[Event("/test")])
+        thread.start()
+        thread.join()
+        gc.collect()
+        self.assertTrue(loops[0].is_closed())
+
+    def test_event_callback_manager_add_callbacks(self):
+        cbm = callback_manager._EventCallbackManager()
+        first_callback = MockEventCallback()
+        second_callback = MockEventCallback()
+        self.assertEqual(3, cbm.add_callbacks(
+            [("/test/#", first_callback), ("/test/event", first_callback),
+             ("/test/event", second_callback),
+             ("/test/event", first_callback)], "telemetry"))
+        self.assertEqual([first_callback, second_callback],
+                         cbm.callbacks_by_channel["/test/event"])
+        self.assertTrue(cbm.wildcarding_enabled)
+        self.assertEqual(set(["telemetry"]), cbm.get_executors("/test/other"))
+        self.assertEqual(0, cbm.add_callbacks([("/test/#", first_callback)]))
+
+        # Nothing is added if any of the callbacks is invalid
+        with self.assertRaises(ValueError):
+            cbm.add_callbacks([("/other", first_callback),
+                               ("/other", MockRequestCallback())])
+        self.assertNotIn("/other", cbm.callbacks_by_channel)
+
+    def test_event_callback_manager_removes_bound_method_callback(self):
+        class Receiver(object):
+            def on_event(self, event):
+                pass
+
+        receiver = Receiver()
+        cbm = callback_manager._EventCallbackManager()
+        cbm.add_callback("/test", receiver.on_event)
+        # Bound methods are created on each attribute access
+        cbm.remove_callback("/test", receiver.on_event)
+        self.assertEqual({}, cbm.callbacks_by_channel)
+        self.assertEqual({}, cbm.dispatchers_by_channel)
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2018 McAfee LLC - All Rights Reserved.
+################################################################################
+
+"""
+Test cases for request deadlines
+"""
+
+# Run with python -m unittest dxlclient.test.test_deadline
+
+from __future__ import absolute_import
+import unittest
+
+from mock import patch
+
+from dxlclient import Request
+from dxlclient import deadline
+from dxlclient.deadline import DEADLINE_FIELD, _HandlingDeadline, _is_expired, \
+    _stamp_deadline
+
+# pylint: disable=missing-docstring, protected-access
+
+
+@patch("dxlclient.deadline.time.time", return_value=1000.0)
+class DeadlineTest(unittest.TestCase):
+
+    def test_stamp_deadline_from_timeout(self, _):
+        request = Request("/test")
+        _stamp_deadline(request, 5)
+        self.assertEqual(1005.0, deadline.get_deadline(request))
+        self.assertEqual(5.0, deadline.get_remaining_time(request))
+
+    def test_no_deadline_without_timeout(self, _):
+        request = Request("/test")
+        _stamp_deadline(request, None)
+        self.assertNotIn(DEADLINE_FIELD, request.other_fields)
+        self.assertIsNone(deadline.get_deadline(request))
+        self.assertIsNone(deadline.get_remaining_time(request))
+        self.assertIsNone(deadline.get_remaining_time())
+        self.assertFalse(_is_expired(request))
+
+    def test_nested_request_inherits_earlier_deadline(self, _):
+        incoming = Request("/test")
+        incoming.other_fields[DEADLINE_FIELD] = "1002.5"
+        with _HandlingDeadline(incoming):
+            self.assertEqual(2.5, deadline.get_remaining_time())
+            nested = Request("/nested")
+            _stamp_deadline(nested, 60)
+            self.assertEqual(1002.5, deadline.get_deadline(nested))
+            nested = Request("/nested")
+            _stamp_deadline(nested, 1)
+            self.assertEqual(1001.0, deadline.get_deadline(nested))
+        self.assertIsNone(deadline.get_remaining_time())
+
+    def test_expired(self, _):
+        request = Request("/test")
+        request.other_fields[DEADLINE_FIELD] = "999.0"
+        self.assertTrue(_is_expired(request))
+        request.other_fields[DEADLINE_FIELD] = "invalid"
+        self.assertFalse(_is_expired(request))
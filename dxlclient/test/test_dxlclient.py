@@ -10,6 +10,7 @@ Test cases for the DxlClient class
 # Run with python -m unittest dxlclient.test.test_dxlclient
 
 from __future__ import absolute_import
+from concurrent.futures import ThreadPoolExecutor
 import io
 from textwrap import dedent
 import time
@@ -20,14 +21,16 @@ import unittest
 import pahoproxy.client as mqtt
 from nose.plugins.attrib import attr
 from parameterized import parameterized
-from mock import Mock, patch
+from mock import Mock, call, patch
 
 import dxlclient._global_settings
+import dxlclient.deadline
 from dxlclient import Request
 from dxlclient import Response
 from dxlclient import Event
 from dxlclient import ErrorResponse
 from dxlclient import DxlClient
+from dxlclient.client import _on_connect_run
 from dxlclient import DxlClientConfig
 from dxlclient import Broker
 from dxlclient import UuidGenerator
@@ -112,6 +115,23 @@ class DxlClientConfigTest(unittest.TestCase):
                           cert_file=cert_file, broker_ca_bundle=get_ca_bundle_pem(), private_key=get_dxl_private_key(),
                           brokers=[])
 
+    def test_config_add_send_limit_options(self):
+        config = DxlClientConfig(broker_ca_bundle=get_ca_bundle_pem(),
+                                 cert_file=get_cert_file_pem(),
+                                 private_key=get_dxl_private_key(), brokers=[])
+        config.add_send_limit("/topic/#", max_in_flight=10,
+                              policy=DxlClientConfig.SEND_LIMIT_QUEUE, max_queued=5)
+        settings = config.send_limits["/topic/#"]
+        self.assertEqual(DxlClientConfig.SEND_LIMIT_QUEUE, settings["policy"])
+        self.assertEqual(5, settings["max_queued"])
+        self.assertIsNone(settings["max_wait"])
+        with self.assertRaises(TypeError):
+            config.add_send_limit("/topic", rate=10, max_queue=5)  # pylint: disable=unexpected-keyword-arg
+        with self.assertRaises(ValueError):
+            config.add_send_limit("/topic", rate=10, policy="drop")
+        with self.assertRaises(ValueError):
+            config.add_send_limit("/topic")
+
     def test_get_fastest_broker_gets_the_fastest(self):
         semaphore = threading.Semaphore(0)
         # Mock brokers connect speed
@@ -409,6 +429,73 @@ class DxlClientTest(unittest.TestCase):
         self.assertEqual(len(self.client.subscriptions), 2)
         self.assertEqual(self.client._client.subscribe.call_count, 1)
 
+    def test_client_subscribe_topics_batches_subscriptions(self):
+        self.client._client.subscribe = Mock(
+            side_effect=[(mqtt.MQTT_ERR_SUCCESS, 2), (mqtt.MQTT_ERR_SUCCESS, 3)])
+        self.client._connected = Mock(return_value=True)
+        self.client._wait_for_packet_ack = Mock(return_value=None)
+
+        with patch.object(DxlClient, '_MAX_TOPICS_PER_SUBSCRIBE', 2):
+            self.client.subscribe_topics(["/topic1", "/topic2", "/topic3",
+                                          "/topic1"])
+        self.assertEqual(
+            [call([("/topic1", 0), ("/topic2", 0)]), call([("/topic3", 0)])],
+            self.client._client.subscribe.call_args_list)
+        self.assertEqual(2, self.client._wait_for_packet_ack.call_count)
+        for topic in ("/topic1", "/topic2", "/topic3"):
+            self.assertIn(topic, self.client.subscriptions)
+
+        # Topics which are already subscribed to are not sent again
+        self.client.subscribe_topics(["/topic2"])
+        self.assertEqual(2, self.client._client.subscribe.call_count)
+
+    def test_client_resubscribes_in_batches_on_connect(self):
+        self.client.subscribe_topics(["/topic1", "/topic2", "/topic3"])
+        mqtt_client = Mock()
+        mqtt_client.subscribe = Mock(
+            side_effect=[(mqtt.MQTT_ERR_SUCCESS, 2), (mqtt.MQTT_ERR_SUCCESS, 3)])
+        self.client._wait_for_packet_ack = Mock(return_value=None)
+        self.client._service_manager = Mock()
+
+        with patch.object(DxlClient, '_MAX_TOPICS_PER_SUBSCRIBE', 2):
+            _on_connect_run(mqtt_client, self.client, 0)
+        subscribed = [topic for packet_call in mqtt_client.subscribe.call_args_list
+                      for topic, _ in packet_call[0][0]]
+        self.assertEqual(sorted(self.client.subscriptions), sorted(subscribed))
+        self.assertEqual(2, mqtt_client.subscribe.call_count)
+        self.assertEqual(2, self.client._wait_for_packet_ack.call_count)
+        self.client._service_manager.on_connect.assert_called_once_with()
+
+    def test_client_add_event_callbacks_subscribes_to_topics(self):
+        self.client.subscribe_topics = Mock()
+        first_callback = Mock()
+        second_callback = Mock()
+        self.client.add_event_callbacks({"/topic1": first_callback,
+                                         "/topic2": second_callback,
+                                         None: first_callback})
+        self.assertEqual(
+            ["/topic1", "/topic2"],
+            sorted(self.client.subscribe_topics.call_args[0][0]))
+        event = Event("/topic1")
+        self.client._fire_event(event)
+        self.assertEqual(2, first_callback.call_count)
+        self.assertEqual(0, second_callback.call_count)
+
+    def test_client_response_cache_invalidated_by_event(self):
+        self.config.add_response_cache("/service", ttl=60,
+                                       invalidation_topics=["/changed"])
+        client = DxlClient(self.config)
+        try:
+            self.assertIn("/changed", client.subscriptions)
+            cache = client._request_manager.response_caches["/service"]
+            request = Request("/service")
+            cache.put(cache.get_key(request), Response(request=request))
+            self.assertEqual({"/service": 0}, client.response_cache_hit_counts)
+            client._fire_event(Event("/changed"))
+            self.assertEqual(0, len(cache))
+        finally:
+            client.destroy()
+
     def test_client_handle_message_with_event_calls_event_callback(self):
         event_callback = EventCallback()
         event_callback.on_event = Mock()
@@ -454,6 +541,166 @@ class DxlClientTest(unittest.TestCase):
         # callback was unregistered
         self.assertEqual(callback.on_response.call_count, 1)
 
+    @patch.object(dxlclient._thread_pool.ThreadPool, "add_sized_task")
+    def test_client_on_message_drops_event_without_callback(self, add_task):
+        msg = Mock(topic=self.test_channel,
+                   payload=Event(destination_topic=self.test_channel)._to_bytes())
+        dxlclient.client._on_message(None, self.client, msg)
+        self.assertEqual(add_task.call_count, 0)
+        self.assertEqual(
+            self.client.dropped_message_counts[Event.MESSAGE_TYPE_EVENT], 1)
+
+        event_callback = EventCallback()
+        event_callback.on_event = Mock()
+        self.client.add_event_callback("/test/#", event_callback)
+        dxlclient.client._on_message(None, self.client, msg)
+        self.assertEqual(add_task.call_count, 1)
+        self.assertEqual(
+            self.client.dropped_message_counts[Event.MESSAGE_TYPE_EVENT], 1)
+
+    @patch.object(dxlclient._thread_pool.ThreadPool, "add_sized_task")
+    def test_client_on_message_drops_response_for_unknown_request(self, add_task):
+        request = Request(destination_topic=self.test_channel)
+        msg = Mock(topic=self.test_channel,
+                   payload=ErrorResponse(request=request)._to_bytes())
+        dxlclient.client._on_message(None, self.client, msg)
+        self.assertEqual(add_task.call_count, 0)
+        self.assertEqual(
+            self.client.dropped_message_counts[Event.MESSAGE_TYPE_ERROR], 1)
+
+        self.client._request_manager.add_current_request(request.message_id)
+        dxlclient.client._on_message(None, self.client, msg)
+        self.assertEqual(add_task.call_count, 1)
+
+    @patch.object(dxlclient._thread_pool.ThreadPool, "add_sized_task")
+    def test_client_on_message_delivers_sync_response_inline(self, add_task):
+        request_manager = self.client._request_manager
+        request = Request(destination_topic=self.test_channel)
+        request_manager.register_wait_for_response(request)
+        msg = Mock(topic=self.test_channel,
+                   payload=Response(request=request)._to_bytes())
+        dxlclient.client._on_message(None, self.client, msg)
+        # The response is handed to the waiter without using the thread pool
+        self.assertEqual(add_task.call_count, 0)
+        self.assertTrue(
+            request_manager.sync_waiters[request.message_id].done())
+        request_manager.unregister_wait_for_response(request)
+
+        # Other response callbacks still receive the response
+        request = Request(destination_topic=self.test_channel)
+        request_manager.register_wait_for_response(request)
+        callback = ResponseCallback()
+        callback.on_response = Mock()
+        self.client.add_response_callback(self.test_channel, callback)
+        msg.payload = Response(request=request)._to_bytes()
+        dxlclient.client._on_message(None, self.client, msg)
+        self.assertEqual(add_task.call_count, 1)
+        self.assertTrue(
+            request_manager.sync_waiters[request.message_id].done())
+        request_manager.unregister_wait_for_response(request)
+
+        # The queued task does not deliver the response to the request
+        # manager a second time
+        request_dispatcher = Mock()
+        with patch.object(self.client._response_callbacks, "get_dispatchers",
+                          return_value=((request_manager, request_dispatcher),
+                                        (callback, callback.on_response))):
+            task_args = add_task.call_args[0]
+            task_args[1](*task_args[2:])
+        self.assertEqual(callback.on_response.call_count, 1)
+        self.assertFalse(request_dispatcher.called)
+
+    def test_client_uses_configured_executor_and_guards_sync_request(self):
+        executor = ThreadPoolExecutor(max_workers=2)
+        self.config.incoming_message_executor = executor
+        errors = []
+
+        def on_event(event):
+            try:
+                client.sync_request(Request(destination_topic=self.test_channel))
+            except DxlException as ex:
+                errors.append(ex)
+
+        event_callback = EventCallback()
+        event_callback.on_event = Mock(side_effect=on_event)
+        with DxlClient(self.config) as client:
+            self.assertIsInstance(client._thread_pool,
+                                  dxlclient.FuturesMessageExecutor)
+            client.add_event_callback(self.test_channel, event_callback)
+            msg = Mock(topic=self.test_channel,
+                       payload=Event(destination_topic=self.test_channel)._to_bytes())
+            dxlclient.client._on_message(None, client, msg)
+            client._thread_pool.wait_completion()
+        self.assertEqual(event_callback.on_event.call_count, 1)
+        self.assertEqual(len(errors), 1)
+        # The shared executor is not shut down along with the client
+        executor.submit(lambda: None).result()
+        executor.shutdown()
+
+    def test_client_invokes_callbacks_on_named_executor(self):
+        self.config.add_incoming_message_executor("telemetry", thread_pool_size=1,
+                                                  queue_size=10)
+        thread_names = {}
+
+        def record_thread(name):
+            def on_event(_):
+                thread_names[name] = threading.current_thread().name
+            return on_event
+
+        default_callback = EventCallback()
+        default_callback.on_event = Mock(side_effect=record_thread("default"))
+        telemetry_callback = EventCallback()
+        telemetry_callback.on_event = Mock(
+            side_effect=record_thread("telemetry"))
+        with DxlClient(self.config) as client:
+            with self.assertRaises(ValueError):
+                client.add_event_callback(self.test_channel, EventCallback(),
+                                          executor="unknown")
+            client.add_event_callback(self.test_channel, default_callback)
+            client.add_event_callback(self.test_channel, telemetry_callback,
+                                      executor="telemetry")
+            msg = Mock(topic=self.test_channel,
+                       payload=Event(destination_topic=self.test_channel)._to_bytes())
+            dxlclient.client._on_message(None, client, msg)
+            client._thread_pool.wait_completion()
+            client._named_executors["telemetry"].wait_completion()
+        self.assertEqual(default_callback.on_event.call_count, 1)
+        self.assertEqual(telemetry_callback.on_event.call_count, 1)
+        self.assertIn("-telemetry-", thread_names["telemetry"])
+        self.assertNotIn("-telemetry-", thread_names["default"])
+
+    def test_client_fans_out_message_to_callbacks_in_parallel(self):
+        self.config.parallel_callback_fan_out = True
+        self.config.incoming_message_thread_pool_size = 2
+        first_started = threading.Event()
+        second_started = threading.Event()
+        received = []
+
+        def wait_for(started, other_started):
+            def on_event(event):
+                started.set()
+                # Only completes if the other callback runs concurrently
+                if other_started.wait(5):
+                    received.append(event)
+            return on_event
+
+        first_callback = EventCallback()
+        first_callback.on_event = Mock(
+            side_effect=wait_for(first_started, second_started))
+        second_callback = EventCallback()
+        second_callback.on_event = Mock(
+            side_effect=wait_for(second_started, first_started))
+        with DxlClient(self.config) as client:
+            client.add_event_callback(self.test_channel, first_callback)
+            client.add_event_callback("/test/#", second_callback)
+            msg = Mock(topic=self.test_channel,
+                       payload=Event(destination_topic=self.test_channel)._to_bytes())
+            dxlclient.client._on_message(None, client, msg)
+            client._thread_pool.wait_completion()
+            self.assertEqual(len(received), 2)
+            # Both callbacks receive the same message instance
+            self.assertIs(received[0], received[1])
+
     def test_client_remove_call_for_unregistered_callback_does_not_error(self):
         callback = EventCallback()
         callback.on_event = Mock()
@@ -506,6 +753,79 @@ class DxlClientTest(unittest.TestCase):
             with self.assertRaises(WaitTimeoutException):
                 self.client.subscribe(self.test_channel)
 
+    def test_client_gather_modes(self):
+        self.client._request_manager.gather = Mock(return_value=[])
+        requests = [Request(destination_topic=self.test_channel) for _ in range(5)]
+        for mode, quorum, required in ((DxlClient.GATHER_ALL, None, 5),
+                                       (DxlClient.GATHER_FIRST, None, 1),
+                                       (DxlClient.GATHER_QUORUM, None, 3),
+                                       (DxlClient.GATHER_QUORUM, 4, 4)):
+            self.client.gather(requests, mode, 10, quorum)
+            self.assertEqual(
+                call(requests, required, 10),
+                self.client._request_manager.gather.call_args)
+        with self.assertRaises(ValueError):
+            self.client.gather(requests, "unknown")
+        with self.assertRaises(ValueError):
+            self.client.gather(requests, DxlClient.GATHER_QUORUM, quorum=6)
+
+    def test_client_subscribe_async_returns_ack_future(self):
+        self.client._client.subscribe = Mock(
+            return_value=(mqtt.MQTT_ERR_SUCCESS, 2))
+        self.client._client.unsubscribe = Mock(
+            return_value=(mqtt.MQTT_ERR_SUCCESS, 3))
+        self.client._connected = Mock(return_value=True)
+
+        future = self.client.subscribe_async(self.test_channel)
+        self.assertFalse(future.done())
+        self.assertIn(self.test_channel, self.client.subscriptions)
+        self.client._on_packet_ack(2)
+        self.assertIsNone(future.result(0))
+        self.assertEqual({}, self.client._packet_acks)
+        # Already subscribed
+        self.assertTrue(self.client.subscribe_async(self.test_channel).done())
+
+        # The ack may be received (on the network thread) before the send of
+        # the packet returns
+        def unsubscribe(_):
+            ack_thread = threading.Thread(target=self.client._on_packet_ack,
+                                          args=[3])
+            ack_thread.start()
+            ack_thread.join(0.05)
+            return mqtt.MQTT_ERR_SUCCESS, 3
+        self.client._client.unsubscribe = Mock(side_effect=unsubscribe)
+        future = self.client.unsubscribe_async(self.test_channel)
+        self.assertIsNone(future.result(5))
+        self.assertNotIn(self.test_channel, self.client.subscriptions)
+        self.assertEqual({}, self.client._packet_acks)
+
+    def test_client_discards_unclaimed_packet_acks(self):
+        self.client._client.subscribe = Mock(
+            return_value=(mqtt.MQTT_ERR_SUCCESS, 2))
+        self.client._connected = Mock(return_value=True)
+        with patch.object(DxlClient, '_MAX_PACKET_ACK_WAIT', 0.01):
+            future = self.client.subscribe_async(self.test_channel)
+        self.assertIsInstance(future.exception(5), WaitTimeoutException)
+
+        # A late ack is discarded
+        self.client._on_packet_ack(2)
+        self.assertEqual({}, self.client._packet_acks)
+
+        # A later packet which reuses the message id waits for its own ack
+        future = self.client.subscribe_async(self.test_channel + "2")
+        self.assertFalse(future.done())
+        self.client._on_packet_ack(2)
+        self.assertTrue(future.done())
+
+    def test_client_subscribe_async_no_ack_fails_future(self):
+        self.client._client.subscribe = Mock(
+            return_value=(mqtt.MQTT_ERR_SUCCESS, 2))
+        self.client._connected = Mock(return_value=True)
+        with patch.object(DxlClient, '_MAX_PACKET_ACK_WAIT', 0.01):
+            future = self.client.subscribe_async(self.test_channel)
+        self.assertIsInstance(future.exception(5), WaitTimeoutException)
+        self.assertEqual({}, self.client._packet_acks)
+
     def test_client_unsubscribe_no_ack_raises_timeout(self):
         self.client._client.subscribe = Mock(
             return_value=(mqtt.MQTT_ERR_SUCCESS, 2))
@@ -548,6 +868,34 @@ class DxlClientTest(unittest.TestCase):
         self.assertEqual(expected_subscriptions_after_registration,
                          sorted(subscriptions_after_registration))
 
+    def test_client_service_drops_expired_requests_and_propagates_deadline(self):
+        channel = '/mcafee/service/unittest'
+        sent = []
+        self.client._send_request = sent.append
+
+        def on_request(request):
+            nested = Request("/nested")
+            self.client.async_request(nested)
+
+        service_info = dxlclient.service.ServiceRegistrationInfo(
+            service_type='/mcafee/service/unittest', client=self.client)
+        service_info.add_topic(channel, on_request)
+        self.client._service_manager.add_service(service_info)
+
+        expired = Request(channel)
+        expired.other_fields[dxlclient.deadline.DEADLINE_FIELD] = repr(time.time() - 1)
+        self.client._service_manager.on_request(expired)
+        self.assertEqual(1, self.client.expired_service_request_count)
+        self.assertEqual([], sent)
+
+        request = Request(channel)
+        request_deadline = time.time() + 60
+        request.other_fields[dxlclient.deadline.DEADLINE_FIELD] = repr(request_deadline)
+        self.client._service_manager.on_request(request)
+        self.assertEqual(1, len(sent))
+        self.assertEqual(request_deadline, dxlclient.deadline.get_deadline(sent[0]))
+        self.assertEqual(1, self.client.expired_service_request_count)
+
     def test_client_wont_register_the_same_service_twice(self):
         service_info = dxlclient.service.ServiceRegistrationInfo(
             service_type='/mcafee/service/unittest', client=self.client)
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2018 McAfee LLC - All Rights Reserved.
+################################################################################
+
+"""
+Test cases for the DxlFuture class
+"""
+
+# Run with python -m unittest dxlclient.test.test_future
+
+from __future__ import absolute_import
+from concurrent import futures
+import sys
+import threading
+import unittest
+
+from mock import Mock
+
+from dxlclient import DxlFuture
+
+if sys.version_info >= (3, 5):
+    import asyncio
+
+# pylint: disable=missing-docstring
+
+
+class DxlFutureTest(unittest.TestCase):
+
+    def test_result_is_delivered_to_waiters_and_callbacks(self):
+        future = DxlFuture()
+        callback = Mock()
+        future.add_done_callback(callback)
+        self.assertFalse(future.done())
+        self.assertTrue(future.running())
+        with self.assertRaises(futures.TimeoutError):
+            future.result(0.01)
+
+        threading.Timer(0.01, future.set_result, ["value"]).start()
+        self.assertEqual("value", future.result(5))
+        self.assertTrue(future.done())
+        self.assertIsNone(future.exception())
+        callback.assert_called_once_with(future)
+        # The future can only be completed once
+        self.assertFalse(future.set_exception(ValueError()))
+        self.assertEqual("value", future.result())
+
+        # Callbacks added after completion are invoked immediately
+        late_callback = Mock()
+        future.add_done_callback(late_callback)
+        late_callback.assert_called_once_with(future)
+
+    def test_exception_is_raised_by_result(self):
+        future = DxlFuture()
+        error = ValueError("failed")
+        self.assertTrue(future.set_exception(error))
+        self.assertIs(error, future.exception())
+        with self.assertRaises(ValueError):
+            future.result()
+        self.assertFalse(future.cancel())
+        self.assertFalse(future.cancelled())
+
+    def test_future_can_be_waited_for_via_concurrent_futures(self):
+        first = DxlFuture()
+        second = DxlFuture()
+        threading.Timer(0.01, second.set_result, ["second"]).start()
+        done, not_done = futures.wait([first, second], 5,
+                                      return_when=futures.FIRST_COMPLETED)
+        self.assertEqual(set([second]), done)
+        self.assertEqual(set([first]), not_done)
+
+        first.set_exception(ValueError())
+        self.assertEqual(set([first, second]),
+                         set(futures.as_completed([first, second], 5)))
+
+    @unittest.skipIf(sys.version_info < (3, 5), "asyncio requires Python 3.5 or later")
+    def test_future_can_be_awaited_via_asyncio(self):
+        future = DxlFuture()
+        loop = asyncio.new_event_loop()
+        try:
+            threading.Timer(0.01, future.set_result, ["value"]).start()
+            self.assertEqual("value", loop.run_until_complete(
+                asyncio.wrap_future(future, loop=loop)))
+        finally:
+            loop.close()
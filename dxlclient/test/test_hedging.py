@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2018 McAfee LLC - All Rights Reserved.
+################################################################################
+
+"""
+Test cases for the HedgingPolicy and HedgedRequest classes
+"""
+
+# Run with python -m unittest dxlclient.test.test_hedging
+
+from __future__ import absolute_import
+import unittest
+
+from dxlclient import Request
+from dxlclient._hedging import HedgingPolicy, HedgedRequest
+
+# pylint: disable=missing-docstring
+
+
+def _policy(**settings):
+    policy_settings = {"percentile": 90, "initial_delay": 2.0, "min_delay": 0.05,
+                       "max_hedges": 1, "service_ids": None}
+    policy_settings.update(settings)
+    return HedgingPolicy(policy_settings)
+
+
+class HedgingPolicyTest(unittest.TestCase):
+
+    def test_delay_is_percentile_of_recent_latencies(self):
+        policy = _policy()
+        for latency in range(1, 10):
+            policy.record_latency(latency / 10.0)
+        self.assertEqual(2.0, policy.get_delay())
+        policy.record_latency(1.0)
+        self.assertEqual(0.9, policy.get_delay())
+
+    def test_delay_is_at_least_min_delay(self):
+        policy = _policy()
+        for _ in range(HedgingPolicy.MIN_SAMPLES):
+            policy.record_latency(0.001)
+        self.assertEqual(0.05, policy.get_delay())
+
+    def test_create_hedge_picks_unused_service(self):
+        policy = _policy(service_ids=["a", "b"])
+        request = Request("/test")
+        request.payload = b"payload"
+        request.other_fields = {"key": "value"}
+        request.service_id = "a"
+        hedged_request = HedgedRequest(policy, request, None)
+        hedge = policy.create_hedge(request, hedged_request.service_ids)
+        self.assertNotEqual(request.message_id, hedge.message_id)
+        self.assertEqual("/test", hedge.destination_topic)
+        self.assertEqual(b"payload", hedge.payload)
+        self.assertEqual({"key": "value"}, hedge.other_fields)
+        self.assertEqual("b", hedge.service_id)
+        hedged_request.add_hedge(hedge)
+        self.assertEqual(1, hedged_request.hedge_count)
+        # Every service has been sent a copy
+        self.assertEqual("a", policy.create_hedge(request, hedged_request.service_ids).service_id)
+
+    def test_complete_only_once(self):
+        hedged_request = HedgedRequest(_policy(), Request("/test"), None)
+        self.assertTrue(hedged_request.complete())
+        self.assertFalse(hedged_request.complete())
+        self.assertTrue(hedged_request.done)
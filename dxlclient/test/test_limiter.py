@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2018 McAfee LLC - All Rights Reserved.
+################################################################################
+
+"""
+Test cases for the SendLimiter and SendLimiters classes
+"""
+
+# Run with python -m unittest dxlclient.test.test_limiter
+
+from __future__ import absolute_import
+import threading
+import unittest
+
+from mock import Mock, patch
+
+from dxlclient._limiter import SendLimiter, SendLimiters, \
+    POLICY_BLOCK, POLICY_FAIL, POLICY_QUEUE
+from dxlclient.exceptions import SendLimitExceededException
+
+# pylint: disable=missing-docstring, protected-access
+
+
+class SendLimiterTest(unittest.TestCase):
+
+    def test_fail_policy_rejects_when_in_flight_limit_reached(self):
+        limiter = SendLimiter(dict(max_in_flight=2, policy=POLICY_FAIL))
+        limiter.acquire()
+        limiter.acquire()
+        with self.assertRaises(SendLimitExceededException):
+            limiter.acquire()
+        # Events do not occupy in-flight slots
+        limiter.acquire(in_flight=False)
+        limiter.release()
+        limiter.acquire()
+        statistics = limiter.get_statistics()
+        self.assertEqual(2, statistics["in_flight"])
+        self.assertEqual(1, statistics["rejected_count"])
+
+    def test_token_bucket(self):
+        with patch("dxlclient._limiter.monotonic", return_value=100):
+            limiter = SendLimiter(dict(rate=2, burst=2, policy=POLICY_FAIL))
+            limiter.acquire(False)
+            limiter.acquire(False)
+            with self.assertRaises(SendLimitExceededException):
+                limiter.acquire(False)
+        with patch("dxlclient._limiter.monotonic", return_value=100.5):
+            limiter.acquire(False)
+            with self.assertRaises(SendLimitExceededException):
+                limiter.acquire(False)
+
+    def test_block_policy_waits_for_release(self):
+        limiter = SendLimiter(dict(max_in_flight=1, policy=POLICY_BLOCK))
+        limiter.acquire()
+        acquired = threading.Event()
+
+        def acquire():
+            limiter.acquire()
+            acquired.set()
+        thread = threading.Thread(target=acquire)
+        thread.start()
+        self.assertFalse(acquired.wait(0.05))
+        limiter.release()
+        self.assertTrue(acquired.wait(5))
+        thread.join()
+        self.assertEqual(1, limiter.get_statistics()["wait_count"])
+        self.assertGreater(limiter.get_statistics()["wait_time"], 0)
+
+    def test_block_policy_max_wait(self):
+        limiter = SendLimiter(dict(max_in_flight=1, policy=POLICY_BLOCK, max_wait=0.01))
+        limiter.acquire()
+        with self.assertRaises(SendLimitExceededException):
+            limiter.acquire()
+        self.assertEqual(1, limiter.get_statistics()["rejected_count"])
+
+    def test_queue_policy_sends_queued_messages_on_release(self):
+        limiter = SendLimiter(dict(max_in_flight=1, policy=POLICY_QUEUE, max_queued=1))
+        func = Mock()
+        limiter.submit(True, func, "first")
+        limiter.submit(True, func, "second")
+        with self.assertRaises(SendLimitExceededException):
+            limiter.submit(True, func, "third")
+        func.assert_called_once_with("first")
+        self.assertEqual(1, limiter.get_statistics()["queued"])
+        limiter.release()
+        func.assert_called_with("second")
+        self.assertEqual(0, limiter.get_statistics()["queued"])
+        self.assertEqual(1, limiter.get_statistics()["in_flight"])
+
+    def test_queue_policy_schedules_drain_when_out_of_tokens(self):
+        schedule = Mock()
+        limiter = SendLimiter(dict(rate=1, policy=POLICY_QUEUE), schedule=schedule)
+        func = Mock()
+        limiter.submit(False, func, "first")
+        limiter.submit(False, func, "second")
+        limiter.submit(False, func, "third")
+        self.assertEqual(1, func.call_count)
+        self.assertEqual(1, schedule.call_count)
+        limiter._tokens = 1
+        limiter._on_drain_timer()
+        func.assert_called_with("second")
+        self.assertEqual(2, schedule.call_count)
+
+
+    def test_queue_policy_hands_queued_messages_to_executor_on_release(self):
+        execute = Mock()
+        limiter = SendLimiter(dict(max_in_flight=1, policy=POLICY_QUEUE),
+                              execute=execute)
+        func = Mock()
+        limiter.submit(True, func, "first")
+        limiter.submit(True, func, "second")
+        limiter.release()
+        # The releasing thread does not send the queued message
+        func.assert_called_once_with("first")
+        execute.assert_called_once_with(limiter._drain)
+        limiter._drain()
+        func.assert_called_with("second")
+
+class SendLimitersTest(unittest.TestCase):
+
+    def test_get_prefers_specific_topics(self):
+        limiters = SendLimiters()
+        self.assertIsNone(limiters.get("/a/b"))
+        topic_limiter = Mock()
+        wildcard_limiter = Mock()
+        pattern_limiter = Mock()
+        limiters.add("/a/b", topic_limiter)
+        limiters.add("/a/#", wildcard_limiter)
+        limiters.add("/a/+/c", pattern_limiter)
+        self.assertIs(topic_limiter, limiters.get("/a/b"))
+        self.assertIs(pattern_limiter, limiters.get("/a/x/c"))
+        self.assertIs(wildcard_limiter, limiters.get("/a/x/d"))
+        self.assertIsNone(limiters.get("/b"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,14 +10,23 @@ Test cases for the RequestManager class
 # Run with python -m unittest dxlclient.test.test_request_manager
 
 from __future__ import absolute_import
+import threading
+import time
 import unittest
 
+from mock import Mock
+
 from dxlclient import exceptions
 from dxlclient.callbacks import ResponseCallback
 from dxlclient import RequestManager
 from dxlclient import Request
 from dxlclient import Response
 from dxlclient import UuidGenerator
+from dxlclient import ErrorResponse
+from dxlclient._hedging import HedgingPolicy
+from dxlclient._limiter import SendLimiter, SendLimiters, POLICY_FAIL
+from dxlclient._response_cache import ResponseCache
+from dxlclient._timing_wheel import TimingWheel
 
 # pylint: disable=missing-docstring
 
@@ -26,6 +35,7 @@ class MockDxlClient(object):
     def __init__(self):
         # The unique identifier of the client
         self.unique_id = UuidGenerator.generate_id_as_string()
+        self._timing_wheel = TimingWheel(tick=0.01)
 
     def add_response_callback(self, channel, response_callback):
         pass
@@ -33,6 +43,9 @@ class MockDxlClient(object):
     def _send_request(self, request):
         pass
 
+    def _add_local_task(self, func, *args):  # pylint: disable=no-self-use
+        func(*args)
+
 
 class MockResponseCallback(ResponseCallback):
     def on_response(self, response):
@@ -44,6 +57,9 @@ class RequestManagerTest(unittest.TestCase):
         self.client = MockDxlClient()
         self.request_manager = RequestManager(self.client)
 
+    def tearDown(self):
+        self.client._timing_wheel.stop()
+
     def test_current_request(self):
         uid = UuidGenerator.generate_id_as_string()
         self.request_manager.add_current_request(uid)
@@ -56,11 +72,11 @@ class RequestManagerTest(unittest.TestCase):
     def test_register_wait_for_response(self):
         request = Request(destination_topic="/test")
         self.request_manager.register_wait_for_response(request)
-        self.assertEqual(1, len(self.request_manager.sync_wait_message_ids))
-        self.assertTrue(request.message_id in self.request_manager.sync_wait_message_ids)
+        self.assertEqual(1, len(self.request_manager.sync_waiters))
+        self.assertTrue(self.request_manager.is_sync_waiting(request.message_id))
         self.request_manager.unregister_wait_for_response(request)
-        self.assertEqual(0, len(self.request_manager.sync_wait_message_ids))
-        self.assertFalse(request.message_id in self.request_manager.sync_wait_message_ids)
+        self.assertEqual(0, len(self.request_manager.sync_waiters))
+        self.assertFalse(self.request_manager.is_sync_waiting(request.message_id))
 
     def test_register_async_callback(self):
         request = Request(destination_topic="/test")
@@ -81,28 +97,40 @@ class RequestManagerTest(unittest.TestCase):
         request = Request(destination_topic="/test")
         self.request_manager.register_wait_for_response(request)
 
-        self.assertEqual(1, len(self.request_manager.sync_wait_message_ids))
-        self.assertTrue(request.message_id in self.request_manager.sync_wait_message_ids)
+        self.assertEqual(1, len(self.request_manager.sync_waiters))
+        self.assertTrue(self.request_manager.is_sync_waiting(request.message_id))
 
         response = Response(request=request)
         self.request_manager.on_response(response)
 
-        self.assertEqual(0, len(self.request_manager.sync_wait_message_ids))
-        self.assertEqual(1, len(self.request_manager.sync_wait_message_responses))
-        self.assertTrue(request.message_id in self.request_manager.sync_wait_message_responses)
+        self.assertFalse(self.request_manager.is_sync_waiting(request.message_id))
+        self.assertTrue(self.request_manager.sync_waiters[request.message_id].done())
 
         result = self.request_manager.wait_for_response(request, 2)
 
         self.assertEqual(request.message_id, result.request_message_id)
 
+    def test_on_response_only_completes_its_waiter(self):
+        first_request = Request(destination_topic="/test")
+        second_request = Request(destination_topic="/test")
+        self.request_manager.register_wait_for_response(first_request)
+        self.request_manager.register_wait_for_response(second_request)
+
+        self.request_manager.on_response(Response(request=second_request))
+
+        self.assertTrue(self.request_manager.is_sync_waiting(first_request.message_id))
+        result = self.request_manager.wait_for_response(second_request, 0)
+        self.assertEqual(second_request.message_id, result.request_message_id)
+        with self.assertRaises(exceptions.WaitTimeoutException):
+            self.request_manager.wait_for_response(first_request, 0.01)
+
     def test_sync_request(self):
         request = Request(destination_topic="/test")
 
         with self.assertRaises(exceptions.WaitTimeoutException):
             self.request_manager.sync_request(request, 2)
 
-        self.assertEqual(0, len(self.request_manager.sync_wait_message_ids))
-        self.assertEqual(0, len(self.request_manager.sync_wait_message_responses))
+        self.assertEqual(0, len(self.request_manager.sync_waiters))
 
     def test_async_request(self):
         request = Request(destination_topic="/test")
@@ -120,8 +148,7 @@ class RequestManagerTest(unittest.TestCase):
 
         self.request_manager.async_request(request, callback)
 
-        self.assertEqual(0, len(self.request_manager.sync_wait_message_ids))
-        self.assertEqual(0, len(self.request_manager.sync_wait_message_responses))
+        self.assertEqual(0, len(self.request_manager.sync_waiters))
         self.assertTrue(request.message_id in self.request_manager.callback_map)
 
         response = Response(request=request)
@@ -130,6 +157,331 @@ class RequestManagerTest(unittest.TestCase):
         self.assertIsNotNone(callback.response)
         self.assertEqual(request.message_id, callback.response.request_message_id)
 
-        self.assertEqual(0, len(self.request_manager.sync_wait_message_ids))
-        self.assertEqual(0, len(self.request_manager.sync_wait_message_responses))
+        self.assertEqual(0, len(self.request_manager.sync_waiters))
         self.assertFalse(request.message_id in self.request_manager.callback_map)
+
+    def test_async_request_with_function_callback(self):
+        request = Request(destination_topic="/test")
+        responses = []
+
+        self.request_manager.async_request(request, responses.append)
+        self.assertTrue(request.message_id in self.request_manager.callback_map)
+
+        response = Response(request=request)
+        self.request_manager.on_response(response)
+
+        self.assertEqual([response], responses)
+        self.assertFalse(request.message_id in self.request_manager.callback_map)
+
+    def test_async_request_send_failure_removes_callback(self):
+        request = Request(destination_topic="/test")
+        self.client._send_request = Mock(side_effect=exceptions.DxlException("failed"))
+
+        with self.assertRaises(exceptions.DxlException):
+            self.request_manager.async_request(request, MockResponseCallback())
+
+        self.assertEqual(0, self.request_manager._get_async_callback_count())
+        self.assertEqual(0, self.request_manager.get_current_request_queue_size())
+
+    def test_async_request_expires_after_timeout(self):
+        request = Request(destination_topic="/test")
+        responses = []
+        expired = threading.Event()
+
+        def on_response(response):
+            responses.append(response)
+            expired.set()
+
+        self.request_manager.async_request(request, on_response, 0.02)
+        self.assertTrue(expired.wait(5))
+        self.assertIsInstance(responses[0], ErrorResponse)
+        self.assertEqual(ErrorResponse.TIMEOUT_ERROR_CODE, responses[0].error_code)
+        self.assertEqual(request.message_id, responses[0].request_message_id)
+        self.assertEqual(1, self.request_manager.expired_request_count)
+        self.assertEqual(0, self.request_manager._get_async_callback_count())
+        self.assertEqual(0, self.request_manager.get_current_request_queue_size())
+
+        # A late response is not delivered
+        self.request_manager.on_response(Response(request=request))
+        self.assertEqual(1, len(responses))
+
+    def test_async_request_response_after_timeout_elapsed_is_not_expired(self):
+        request = Request(destination_topic="/test")
+        responses = []
+        tasks = []
+        queued = threading.Event()
+
+        def add_local_task(func, *args):
+            tasks.append((func, args))
+            queued.set()
+        self.client._add_local_task = add_local_task
+
+        self.request_manager.async_request(request, responses.append, 0.02)
+        self.assertTrue(queued.wait(5))
+        # The response is received before the timeout error response is delivered
+        response = Response(request=request)
+        self.request_manager.on_response(response)
+        for func, args in tasks:
+            func(*args)
+        self.assertEqual([response], responses)
+        self.assertEqual(0, self.request_manager.expired_request_count)
+        self.assertEqual(0, self.request_manager.get_current_request_queue_size())
+
+    def test_async_request_response_cancels_timeout(self):
+        request = Request(destination_topic="/test")
+        callback = Mock()
+        self.request_manager.async_request(request, callback, 60)
+        self.assertEqual(1, self.client._timing_wheel.pending_count)
+
+        response = Response(request=request)
+        self.request_manager.on_response(response)
+
+        callback.assert_called_once_with(response)
+        self.assertEqual(0, self.client._timing_wheel.pending_count)
+        self.assertEqual({}, self.request_manager.request_timeouts)
+        self.assertEqual(0, self.request_manager.expired_request_count)
+
+    def test_request_future(self):
+        request = Request(destination_topic="/test")
+        future = self.request_manager.request_future(request)
+        self.assertFalse(future.done())
+        response = Response(request=request)
+        self.request_manager.on_response(response)
+        self.assertIs(response, future.result(0))
+
+        future = self.request_manager.request_future(Request(destination_topic="/test"), 0.02)
+        self.assertIsInstance(future.exception(5), exceptions.WaitTimeoutException)
+
+    def test_gather(self):
+        requests = [Request(destination_topic="/test" + str(index)) for index in range(3)]
+        answered = set(["/test0", "/test2"])
+
+        def send_request(request):
+            if request.destination_topic in answered:
+                self.request_manager.on_response(Response(request=request))
+        self.client._send_request = send_request
+
+        responses = self.request_manager.gather(requests, 2, 5)
+        self.assertEqual([requests[0].message_id, None, requests[2].message_id],
+                         [response.request_message_id if response else None
+                          for response in responses])
+
+        with self.assertRaises(exceptions.WaitTimeoutException):
+            self.request_manager.gather(requests, 3, 0.02)
+
+    def test_gather_abandons_unanswered_requests(self):
+        requests = [Request(destination_topic="/test" + str(index)) for index in range(3)]
+        self.client._send_request = Mock()
+
+        def respond(request):
+            self.request_manager.on_response(Response(request=request))
+
+        # First response wins, without a timeout
+        threading.Timer(0.01, respond, [requests[1]]).start()
+        responses = self.request_manager.gather(requests, 1)
+        self.assertEqual([None, requests[1].message_id, None],
+                         [response.request_message_id if response else None
+                          for response in responses])
+        self.assertEqual(0, self.request_manager._get_async_callback_count())
+        self.assertEqual(0, self.request_manager.get_current_request_queue_size())
+
+        # Quorum which times out
+        requests = [Request(destination_topic="/test" + str(index)) for index in range(3)]
+        threading.Timer(0.01, respond, [requests[0]]).start()
+        with self.assertRaises(exceptions.WaitTimeoutException):
+            self.request_manager.gather(requests, 2, 0.2)
+        self.assertEqual(0, self.request_manager._get_async_callback_count())
+        self.assertEqual(0, self.request_manager.get_current_request_queue_size())
+        self.assertEqual(0, len(self.request_manager.request_timeouts))
+
+    def test_single_flight_sync_requests_share_response(self):
+        self.request_manager.single_flight = True
+        sent = []
+        self.client._send_request = sent.append
+        results = []
+
+        def request_thread():
+            request = Request(destination_topic="/test")
+            request.payload = b"question"
+            results.append(self.request_manager.sync_request(request, 5))
+
+        threads = [threading.Thread(target=request_thread) for _ in range(3)]
+        threads[0].start()
+        while not sent:
+            time.sleep(0.001)
+        for thread in threads[1:]:
+            thread.start()
+        while self.request_manager.coalesced_request_count < 2:
+            time.sleep(0.001)
+
+        response = Response(request=sent[0])
+        self.request_manager.on_response(response)
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(1, len(sent))
+        self.assertEqual([response] * 3, results)
+        self.assertEqual({}, self.request_manager._flights)
+
+        # Different payloads are not shared
+        other = Request(destination_topic="/test")
+        other.payload = b"other question"
+        self.assertNotEqual(self.request_manager.get_single_flight_key(sent[0]),
+                            self.request_manager.get_single_flight_key(other))
+
+    def test_response_cache(self):
+        cache = ResponseCache(60, 10, self.request_manager.get_single_flight_key)
+        self.request_manager.response_caches["/test"] = cache
+        sent = []
+
+        def send_request(request):
+            sent.append(request)
+            self.request_manager.on_response(Response(request=request))
+        self.client._send_request = send_request
+
+        response = self.request_manager.sync_request(Request(destination_topic="/test"), 5)
+        self.assertIs(response, self.request_manager.sync_request(
+            Request(destination_topic="/test"), 5))
+        responses = []
+        self.request_manager.async_request(Request(destination_topic="/test"), responses.append)
+        self.assertEqual([response], responses)
+        self.assertEqual(1, len(sent))
+        self.assertEqual(2, cache.hit_count)
+
+        # Requests to other topics are not cached
+        self.request_manager.sync_request(Request(destination_topic="/other"), 5)
+        self.request_manager.sync_request(Request(destination_topic="/other"), 5)
+        self.assertEqual(3, len(sent))
+
+        # Asynchronous responses are cached
+        cache.clear()
+        self.request_manager.async_request(Request(destination_topic="/test"), None)
+        self.assertEqual(4, len(sent))
+        self.request_manager.sync_request(Request(destination_topic="/test"), 5)
+        self.assertEqual(4, len(sent))
+
+    def test_response_cache_does_not_store_error_responses(self):
+        cache = ResponseCache(60, 10, self.request_manager.get_single_flight_key)
+        self.request_manager.response_caches["/test"] = cache
+        sent = []
+
+        def send_request(request):
+            sent.append(request)
+            self.request_manager.on_response(ErrorResponse(request=request, error_code=1))
+        self.client._send_request = send_request
+
+        self.request_manager.sync_request(Request(destination_topic="/test"), 5)
+        self.request_manager.async_request(Request(destination_topic="/test"), Mock())
+        self.assertEqual(2, len(sent))
+        self.assertEqual(0, len(cache))
+
+    def test_response_cache_ignores_responses_after_invalidation(self):
+        cache = ResponseCache(60, 10, self.request_manager.get_single_flight_key)
+        self.request_manager.response_caches["/test"] = cache
+        request = Request(destination_topic="/test")
+        self.request_manager.async_request(request, Mock())
+        cache.invalidate(Mock())
+        self.request_manager.on_response(Response(request=request))
+        self.assertEqual(0, len(cache))
+
+    def test_send_limit_releases_in_flight_slot_on_response(self):
+        limiters = SendLimiters()
+        limiter = SendLimiter(dict(max_in_flight=1, policy=POLICY_FAIL))
+        limiters.add("/test/#", limiter)
+        self.request_manager.limiters = limiters
+
+        first = Request(destination_topic="/test/a")
+        self.request_manager.async_request(first, Mock())
+        with self.assertRaises(exceptions.SendLimitExceededException):
+            self.request_manager.async_request(Request(destination_topic="/test/b"), Mock())
+        self.assertEqual(1, self.request_manager._get_async_callback_count())
+        self.assertEqual(1, self.request_manager.get_current_request_queue_size())
+
+        self.request_manager.on_response(Response(request=first))
+        self.assertEqual(0, limiter.in_flight)
+        self.request_manager.async_request(Request(destination_topic="/test/b"), Mock())
+        self.assertEqual(1, limiter.in_flight)
+        # Other topics are not limited
+        self.request_manager.async_request(Request(destination_topic="/other"), Mock())
+
+    def test_send_limit_released_when_queued_request_expires(self):
+        limiter = SendLimiter(dict(max_in_flight=1, policy=POLICY_FAIL))
+        self.client._send_request = Mock()
+        request_manager = self.request_manager
+
+        # Expired before the permit was acquired
+        request = Request(destination_topic="/test")
+        limiter.acquire()
+        request_manager._send_limited_request(request, limiter)
+        self.assertEqual(0, limiter.in_flight)
+        self.assertFalse(self.client._send_request.called)
+
+        class ExpiringRequests(set):
+            # The request expires (on another thread) just after it is checked
+            def __contains__(self, message_id):
+                current = set.__contains__(self, message_id)
+                request_manager.remove_current_request(message_id)
+                request_manager._release_limit(message_id)
+                return current
+
+        request = Request(destination_topic="/test")
+        limiter.acquire()
+        request_manager.current_request_message_ids = ExpiringRequests([request.message_id])
+        request_manager._send_limited_request(request, limiter)
+        self.assertEqual(0, limiter.in_flight)
+        self.assertEqual({}, request_manager.limited_requests)
+
+    def _add_hedging_policy(self):
+        self.request_manager.hedging_policies["/test"] = HedgingPolicy(
+            {"percentile": 95, "initial_delay": 0.02, "min_delay": 0, "max_hedges": 1,
+             "service_ids": ["first", "second"]})
+
+    def test_hedged_request_first_response_wins(self):
+        self._add_hedging_policy()
+        sent = []
+        self.client._send_request = sent.append
+        responses = []
+        request = Request(destination_topic="/test")
+        request.service_id = "first"
+
+        self.request_manager.async_request(request, responses.append)
+        deadline = time.time() + 5
+        while len(sent) < 2 and time.time() < deadline:
+            time.sleep(0.001)
+        self.assertEqual(2, len(sent))
+        hedge = sent[1]
+        self.assertEqual("second", hedge.service_id)
+        self.assertEqual(1, self.request_manager.hedge_count)
+
+        response = Response(request=hedge)
+        self.request_manager.on_response(response)
+        self.assertEqual([response], responses)
+        self.assertEqual(1, self.request_manager.hedge_win_count)
+        # The late response to the original request is dropped
+        self.assertFalse(self.request_manager.is_pending(request.message_id))
+        self.request_manager.on_response(Response(request=request))
+        self.assertEqual([response], responses)
+        self.assertEqual(0, self.request_manager._get_async_callback_count())
+        self.assertEqual(0, self.request_manager.get_current_request_queue_size())
+
+    def test_hedged_request_no_hedge_for_fast_response(self):
+        self._add_hedging_policy()
+        sent = []
+
+        def send_request(request):
+            sent.append(request)
+            self.request_manager.on_response(Response(request=request))
+        self.client._send_request = send_request
+
+        response = self.request_manager.sync_request(Request(destination_topic="/test"), 5)
+        self.assertEqual(sent[0].message_id, response.request_message_id)
+        time.sleep(0.1)
+        self.assertEqual(1, len(sent))
+        self.assertEqual(0, self.request_manager.hedge_count)
+
+    def test_hedged_sync_request_timeout_abandons_copies(self):
+        self._add_hedging_policy()
+        with self.assertRaises(exceptions.WaitTimeoutException):
+            self.request_manager.sync_request(Request(destination_topic="/test"), 0.1)
+        self.assertEqual(0, self.request_manager._get_async_callback_count())
+        self.assertEqual(0, self.request_manager.get_current_request_queue_size())
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2018 McAfee LLC - All Rights Reserved.
+################################################################################
+
+"""
+Test cases for the ResponseCache class
+"""
+
+# Run with python -m unittest dxlclient.test.test_response_cache
+
+from __future__ import absolute_import
+import unittest
+
+from mock import Mock, patch
+
+from dxlclient import Request, Response
+from dxlclient._response_cache import ResponseCache
+
+# pylint: disable=missing-docstring
+
+
+def _response(payload):
+    response = Response(request=Request(destination_topic="/test"))
+    response.payload = payload
+    return response
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def test_responses_expire_after_ttl(self):
+        cache = ResponseCache(10, 5, Mock())
+        response = _response(b"value")
+        with patch("dxlclient._response_cache.monotonic", return_value=100):
+            cache.put("key", response)
+            self.assertIs(response, cache.get("key"))
+        with patch("dxlclient._response_cache.monotonic", return_value=110):
+            self.assertIsNone(cache.get("key"))
+        self.assertEqual(0, len(cache))
+        self.assertEqual(1, cache.hit_count)
+        self.assertEqual(1, cache.miss_count)
+
+    def test_least_recently_used_responses_are_evicted(self):
+        cache = ResponseCache(60, 2, Mock())
+        cache.put("a", _response(b"a"))
+        cache.put("b", _response(b"b"))
+        cache.get("a")
+        cache.put("c", _response(b"c"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_max_bytes(self):
+        cache = ResponseCache(60, 10, Mock(), max_bytes=10)
+        cache.put("a", _response(b"12345"))
+        cache.put("b", _response(b"12345"))
+        cache.put("c", _response(b"1"))
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(2, len(cache))
+        # Responses which exceed the limit on their own are not cached
+        cache.put("d", _response(b"12345678901"))
+        self.assertIsNone(cache.get("d"))
+        self.assertEqual(2, len(cache))
+
+    def test_invalidation(self):
+        cache = ResponseCache(60, 10, Mock())
+        generation = cache.generation
+        cache.put("a", _response(b"a"), generation)
+        cache.invalidate(Mock())
+        self.assertEqual(0, len(cache))
+        # Responses to requests sent before the invalidation are not stored
+        cache.put("a", _response(b"a"), generation)
+        self.assertEqual(0, len(cache))
+        cache.put("a", _response(b"a"), cache.generation)
+        self.assertEqual(1, len(cache))
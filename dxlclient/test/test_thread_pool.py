@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2018 McAfee LLC - All Rights Reserved.
+################################################################################
+
+"""
+Test cases for the ThreadPool class
+"""
+
+# Run with python -m unittest dxlclient.test.test_thread_pool
+
+from __future__ import absolute_import
+import threading
+import time
+import unittest
+
+from dxlclient._thread_pool import ThreadPool
+
+# pylint: disable=missing-docstring
+
+
+class ThreadPoolTest(unittest.TestCase):
+
+    def test_queued_bytes_limit_blocks_until_space_is_available(self):
+        pool = ThreadPool(queue_size=10, num_threads=1, thread_prefix="Test",
+                          max_queued_bytes=100)
+        release = threading.Event()
+        try:
+            # Occupy the worker so that subsequent tasks remain queued
+            pool.add_sized_task(60, release.wait, 5)
+            while pool.busy_thread_count != 1:
+                time.sleep(0.01)
+            self.assertEqual(0, pool.queued_bytes)
+            pool.add_sized_task(60, lambda: None)
+            self.assertEqual(60, pool.queued_bytes)
+
+            added = threading.Event()
+
+            def add_task():
+                pool.add_sized_task(60, lambda: None)
+                added.set()
+
+            thread = threading.Thread(target=add_task)
+            thread.start()
+            self.assertFalse(added.wait(0.1))
+            release.set()
+            self.assertTrue(added.wait(5))
+            thread.join()
+            pool.wait_completion()
+            self.assertEqual(0, pool.queued_bytes)
+            self.assertEqual(60, pool.peak_queued_bytes)
+        finally:
+            release.set()
+            pool.shutdown()
+
+    def test_queued_bytes_limit_discards_when_full(self):
+        pool = ThreadPool(queue_size=10, num_threads=1, thread_prefix="Test",
+                          discard_when_full=True, max_queued_bytes=100)
+        release = threading.Event()
+        try:
+            pool.add_sized_task(10, release.wait, 5)
+            while pool.busy_thread_count != 1:
+                time.sleep(0.01)
+            # A task which exceeds the limit is queued when the queue is empty
+            pool.add_sized_task(150, lambda: None)
+            pool.add_sized_task(10, lambda: None)
+            self.assertEqual(150, pool.queued_bytes)
+            self.assertEqual(1, pool.discarded_task_count)
+        finally:
+            release.set()
+            pool.shutdown()
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2018 McAfee LLC - All Rights Reserved.
+################################################################################
+
+"""
+Test cases for the TimingWheel class
+"""
+
+# Run with python -m unittest dxlclient.test.test_timing_wheel
+
+from __future__ import absolute_import
+import threading
+import time
+import unittest
+
+from mock import Mock
+
+from dxlclient._compat import monotonic
+from dxlclient._timing_wheel import TimingWheel
+
+# pylint: disable=missing-docstring, protected-access
+
+
+class TimingWheelTest(unittest.TestCase):
+
+    def test_timeouts_expire_after_their_delay(self):
+        wheel = TimingWheel(tick=1, bucket_count=4)
+        short_func = Mock()
+        long_func = Mock()
+        wheel._thread = Mock()  # Advance the wheel manually
+        wheel.schedule(2, short_func, "short")
+        # Expires after more than one revolution of the wheel
+        wheel.schedule(6, long_func, "long")
+        self.assertEqual(2, wheel.pending_count)
+
+        for timeout in wheel._advance():
+            timeout.func(*timeout.args)
+        self.assertEqual(0, short_func.call_count)
+        for _ in range(5):
+            for timeout in wheel._advance():
+                timeout.func(*timeout.args)
+            if short_func.called:
+                break
+        short_func.assert_called_once_with("short")
+        self.assertEqual(0, long_func.call_count)
+        for _ in range(4):
+            for timeout in wheel._advance():
+                timeout.func(*timeout.args)
+        long_func.assert_called_once_with("long")
+        self.assertEqual(0, wheel.pending_count)
+
+    def test_timeouts_do_not_expire_before_their_delay(self):
+        wheel = TimingWheel(tick=0.5)
+        try:
+            # Start the thread, so that the next timeout is scheduled part
+            # way through a tick
+            wheel.schedule(60, Mock())
+            time.sleep(0.3)
+            for delay in (0.5, 0.2):
+                expired = threading.Event()
+                start = monotonic()
+                wheel.schedule(delay, expired.set)
+                self.assertTrue(expired.wait(5))
+                elapsed = monotonic() - start
+                self.assertGreaterEqual(elapsed, delay)
+                # Up to one tick late (with some leeway for the scheduler)
+                self.assertLess(elapsed, delay + 0.5 + 0.2)
+        finally:
+            wheel.stop()
+
+    def test_cancelled_timeout_does_not_expire(self):
+        wheel = TimingWheel(tick=1, bucket_count=4)
+        wheel._thread = Mock()
+        func = Mock()
+        wheel.schedule(1, func).cancel()
+        self.assertEqual(0, wheel.pending_count)
+        self.assertEqual([], wheel._advance())
+
+    def test_thread_runs_expired_timeouts(self):
+        wheel = TimingWheel(tick=0.01)
+        expired = threading.Event()
+        try:
+            wheel.schedule(0.02, expired.set)
+            self.assertTrue(expired.wait(5))
+        finally:
+            wheel.stop()
+        with self.assertRaises(RuntimeError):
+            wheel.schedule(1, Mock())
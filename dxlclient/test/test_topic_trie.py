@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2018 McAfee LLC - All Rights Reserved.
+################################################################################
+
+"""
+Test cases for the TopicTrie class
+"""
+
+# Run with python -m unittest dxlclient.test.test_topic_trie
+
+from __future__ import absolute_import
+import unittest
+
+from dxlclient._dxl_utils import DxlUtils
+from dxlclient._topic_trie import TopicTrie
+
+# pylint: disable=missing-docstring
+
+
+class TopicTrieTest(unittest.TestCase):
+    WILDCARDS = ["#", "/#", "/a/#", "/a/b/#", "a/#", "//#", "/a/b/c/#"]
+    TOPICS = ["", "/", "#", "/#", "a", "a/b", "/a", "/a/", "/a/b", "/a/b/",
+              "/a/b/c", "/a/b/c/d", "/a/x/c", "//x", "/a/b/#", "a/#", "/x"]
+
+    def test_get_wildcards_matches_wildcard_generator(self):
+        trie = TopicTrie()
+        for wildcard in self.WILDCARDS:
+            trie = trie.add(wildcard)
+        for topic in self.TOPICS:
+            expected = [wildcard for wildcard in DxlUtils._get_wildcards(topic)
+                        if wildcard in self.WILDCARDS]
+            self.assertEqual(expected, trie.get_wildcards(topic), topic)
+
+    def test_add_and_remove_do_not_modify_trie(self):
+        empty = TopicTrie()
+        trie = empty.add("/a/b/#")
+        self.assertTrue(empty.is_empty())
+        self.assertEqual([], empty.get_wildcards("/a/b/c"))
+        trie_with_parent = trie.add("/a/#")
+        self.assertEqual(["/a/b/#"], trie.get_wildcards("/a/b/c"))
+        self.assertEqual(["/a/b/#", "/a/#"],
+                         trie_with_parent.get_wildcards("/a/b/c"))
+
+        trie_without_child = trie_with_parent.remove("/a/b/#")
+        self.assertEqual(["/a/#"], trie_without_child.get_wildcards("/a/b/c"))
+        self.assertEqual(["/a/b/#", "/a/#"],
+                         trie_with_parent.get_wildcards("/a/b/c"))
+        self.assertTrue(trie_without_child.remove("/a/#").is_empty())
+        self.assertIs(trie, trie.remove("/x/#"))
+
+    def test_get_wildcards_with_single_level_wildcards(self):
+        trie = TopicTrie()
+        for wildcard in ["/a/+/c", "/+/b/c", "/a/+/#", "/+/+", "+", "/a/#",
+                         "/a/b/+"]:
+            trie = trie.add(wildcard)
+        self.assertEqual(["/a/b/+", "/a/+/c", "/+/b/c", "/a/+/#", "/a/#"],
+                         trie.get_wildcards("/a/b/c"))
+        self.assertEqual(["/+/+", "/a/#"], trie.get_wildcards("/a/x"))
+        self.assertEqual(["/a/+/#", "/a/#"], trie.get_wildcards("/a/x/y/z"))
+        self.assertEqual(["+"], trie.get_wildcards("a"))
+        self.assertEqual([], trie.get_wildcards("a/b"))
+
+        trie = trie.remove("/a/+/c").remove("/a/+/#")
+        self.assertEqual(["/a/b/+", "/+/b/c", "/a/#"],
+                         trie.get_wildcards("/a/b/c"))
+        # Removing the multi-level wildcard keeps the single-level one
+        self.assertEqual(["/a/b/+", "/a/#"], trie.get_wildcards("/a/b/d"))
+
+    def test_add_rejects_non_wildcard(self):
+        with self.assertRaises(ValueError):
+            TopicTrie().add("/a/b")
+        self.assertFalse(TopicTrie.is_wildcard("/a#"))
+        self.assertTrue(TopicTrie.is_wildcard("/a/#"))
+        self.assertTrue(TopicTrie.is_wildcard("/a/+/b"))
+        TopicTrie.validate("/a/+/b/#")
+        with self.assertRaises(ValueError):
+            TopicTrie.validate("/a/b+/c")
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Copyright (c) 2018 McAfee LLC - All Rights Reserved.
+################################################################################
+
+"""
+Test cases for the _Watchdog class
+"""
+
+# Run with python -m unittest dxlclient.test.test_watchdog
+
+from __future__ import absolute_import
+import threading
+import time
+import unittest
+
+from mock import Mock, patch
+
+from dxlclient import _watchdog
+from dxlclient._watchdog import _Watchdog
+
+# pylint: disable=missing-docstring
+
+
+class WatchdogTest(unittest.TestCase):
+
+    def test_slow_activity_is_reported_with_stack(self):
+        watchdog = _Watchdog(0.01)
+        started = threading.Event()
+        release = threading.Event()
+        callback = Mock()
+
+        def slow_callback_body():
+            release.wait(5)
+
+        def run():
+            previous = watchdog.activity_started("Processing", "/test/topic")
+            watchdog.callback_started(callback)
+            started.set()
+            slow_callback_body()
+            watchdog.activity_finished(previous)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        try:
+            started.wait(5)
+            time.sleep(0.05)
+            with patch.object(_watchdog.logger, "warning") as warning:
+                watchdog.check()
+                # Each activity is only reported once
+                watchdog.check()
+            self.assertEqual(1, warning.call_count)
+            message = warning.call_args[0][0] % warning.call_args[0][1:]
+            self.assertIn("/test/topic", message)
+            self.assertIn(repr(callback), message)
+            self.assertIn("slow_callback_body", message)
+        finally:
+            release.set()
+            thread.join()
+        self.assertEqual({}, watchdog._activities)
+
+    def test_stalled_pool_is_reported(self):
+        watchdog = _Watchdog(10)
+        pool = Mock(thread_count=2, busy_thread_count=2, queued_task_count=1)
+        watchdog.add_pool("telemetry", pool)
+        with patch.object(_watchdog.logger, "warning") as warning:
+            watchdog.check()
+            pool.queued_task_count = 5
+            watchdog.check()
+            self.assertEqual(1, warning.call_count)
+            self.assertIn("telemetry", warning.call_args[0])
+            pool.busy_thread_count = 1
+            watchdog.check()
+            self.assertEqual(2, warning.call_count)
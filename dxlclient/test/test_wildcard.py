@@ -309,3 +309,27 @@ class WildcardTest(unittest.TestCase):
                                        req)
             # Check that callback was called
             self.assertEqual(self.req_callback.on_request.call_count, 1)
+
+    def test_messages_are_fired_for_single_level_wildcards(self):
+        with DxlClient(self.config) as dxl_client:
+            dxl_client.add_request_callback("/this/+/has/wildcard",
+                                            self.req_callback)
+            self.assertTrue(dxl_client._request_callbacks.wildcarding_enabled)
+            for topic in ["/this/channel/has/wildcard",
+                          "/this/channel/has/wildcard/not",
+                          "/this/channel/too/has/wildcard"]:
+                req = Request(destination_topic=topic)._to_bytes()
+                dxl_client._handle_message(topic, req)
+            # Only the topic with a single level in place of "+" matches
+            self.assertEqual(self.req_callback.on_request.call_count, 1)
+            dxl_client.remove_request_callback("/this/+/has/wildcard",
+                                               self.req_callback)
+            self.assertFalse(dxl_client._request_callbacks.wildcarding_enabled)
+
+    def test_invalid_single_level_wildcard_is_rejected(self):
+        with DxlClient(self.config) as dxl_client:
+            with self.assertRaises(ValueError):
+                dxl_client.add_request_callback("/this/chan+/has/wildcard",
+                                                self.req_callback)
+            with self.assertRaises(ValueError):
+                dxl_client.subscribe("/this/chan+/has/wildcard")
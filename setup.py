@@ -97,6 +97,7 @@ setup(
     install_requires=[
         "asn1crypto",
         "configobj",
+        'futures; python_version == "2.7"',
         "msgpack>=0.5",
         "oscrypto",
         "requests",